@@ -0,0 +1,1134 @@
+"""Bridge benchmarks against the stand-in peer (BlackboxPeer.py).
+
+Usage: python BlackboxBench.py <bench> [options]
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+from BlackboxBridge import (
+    CommandBridge,
+    CommandPipeline,
+    PRIO_BULK,
+    PRIO_STATE,
+    JournalReader,
+    JournalWriter,
+    SocketTransport,
+    StateBlockReader,
+    StateBlockWriter,
+    TailReader,
+    gather,
+    parse_ack_line,
+)
+from BlackboxCodec import WorldFrameDecoder, WorldFrameEncoder
+from BlackboxPeer import StandInPeer
+from BlackboxRuntime import Runtime
+from BlackboxWorld import WorldColumns, WorldDeltaEncoder, WorldGrid, WorldModel
+
+
+def _pct(values, p: float) -> float:
+    if not values:
+        return 0.0
+    vals = sorted(values)
+    idx = min(len(vals) - 1, max(0, int(round((p / 100.0) * (len(vals) - 1)))))
+    return vals[idx]
+
+
+def _report(label: str, samples_ms):
+    if not samples_ms:
+        print(f"{label:<12} no samples")
+        return
+    print(
+        f"{label:<12} n={len(samples_ms):<5} "
+        f"mean={statistics.fmean(samples_ms):8.3f}ms "
+        f"p50={_pct(samples_ms, 50):8.3f}ms "
+        f"p99={_pct(samples_ms, 99):8.3f}ms"
+    )
+
+
+# ===== transport =====
+def _roundtrip_file(tmp: str, count: int, peer_poll_s: float) -> list:
+    peer = StandInPeer(tmp)
+    peer.serve_file(peer_poll_s)
+    reader = JournalReader(os.path.join(tmp, "bridge_ack.txt"))
+    bridge = CommandBridge(os.path.join(tmp, "bridge_cmd.txt"))
+    samples = []
+    try:
+        for _ in range(count):
+            t0 = time.perf_counter()
+            cmd_id = bridge.send("listplayers_gui")
+            want = str(cmd_id)
+            deadline = t0 + 2.0
+            while time.perf_counter() < deadline:
+                hit = False
+                for line in reader.read_new():
+                    parsed = parse_ack_line(line)
+                    if parsed and parsed[0] == want:
+                        hit = True
+                if hit:
+                    samples.append((time.perf_counter() - t0) * 1000.0)
+                    break
+                time.sleep(0.001)
+    finally:
+        peer.stop()
+    return samples
+
+
+def _roundtrip_socket(tmp: str, count: int) -> list:
+    peer = StandInPeer(tmp)
+    port = peer.serve_socket("127.0.0.1", 0)
+    transport = SocketTransport("127.0.0.1", port)
+    bridge = CommandBridge(os.path.join(tmp, "bridge_cmd.txt"), transport)
+    got = {}
+    ev = threading.Event()
+
+    def _on_line(line):
+        parsed = parse_ack_line(line)
+        if parsed:
+            got[parsed[0]] = time.perf_counter()
+            ev.set()
+
+    bridge.set_line_handler(_on_line)
+    bridge.open()
+    samples = []
+    try:
+        if not transport.wait_connected(2.0):
+            return samples
+        for _ in range(count):
+            ev.clear()
+            t0 = time.perf_counter()
+            want = str(bridge.send("listplayers_gui"))
+            deadline = t0 + 2.0
+            while want not in got and time.perf_counter() < deadline:
+                ev.wait(0.05)
+                ev.clear()
+            if want in got:
+                samples.append((got.pop(want) - t0) * 1000.0)
+    finally:
+        bridge.close()
+        peer.stop()
+    return samples
+
+
+def bench_transport(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        _report("file", _roundtrip_file(tmp, args.count, args.file_poll_ms / 1000.0))
+    with tempfile.TemporaryDirectory() as tmp:
+        _report("socket", _roundtrip_socket(tmp, args.count))
+
+
+# ===== journal =====
+def bench_journal(args):
+    """Writer bursts with small rotation; the reader must see every seq exactly once."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bridge_notice.txt")
+        writer = JournalWriter(path, epoch="1", max_bytes=args.rotate_bytes)
+        writer.append("NOTICE|prime")
+        reader = JournalReader(path)
+        seen = []
+        t0 = time.perf_counter()
+        for burst in range(args.bursts):
+            for i in range(args.burst_size):
+                writer.append(f"NOTICE|INFO|{burst}:{i}")
+            seen.extend(reader.read_new())
+        seen.extend(reader.read_new())
+        elapsed = time.perf_counter() - t0
+        expected = [f"NOTICE|INFO|{b}:{i}" for b in range(args.bursts) for i in range(args.burst_size)]
+        ok = seen == expected
+        print(
+            f"journal      records={len(expected)} delivered={len(seen)} "
+            f"recovered={reader.recovered} lost={reader.lost} "
+            f"exactly_once={'yes' if ok else 'NO'} rate={len(expected) / max(elapsed, 1e-9):,.0f}/s"
+        )
+
+
+# ===== tail =====
+def _world_payload(target_bytes: int) -> str:
+    rows = ["SELF,SELF,Self,0.0,0.0,0.0,0,"]
+    i = 1
+    size = len(rows[0])
+    while size < target_bytes:
+        row = f"ITEM,KEY,Keycard {i},{i * 1.5:.1f},{i * -2.25:.1f},{100.0 + i:.1f},{i},Uncollected"
+        rows.append(row)
+        size += len(row) + 1
+        i += 1
+    return "WORLD=" + ";".join(rows)
+
+
+def _time_call(fn, reps: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        fn()
+    return (time.perf_counter() - t0) * 1e6 / reps
+
+
+def bench_tail(args):
+    """Per-poll cost of the old read_text+splitlines vs TailReader as WORLD payloads grow."""
+    print(f"{'payload':>10} {'file':>10} | {'full read':>11} {'tail idle':>10} {'tail +1rec':>11}")
+    for kb in args.sizes_kb:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bridge_registry.txt")
+            writer = JournalWriter(path, epoch="1", max_bytes=1 << 40)
+            small = "NOTICE|INFO|tick"
+            writer.append(_world_payload(kb * 1024))
+            tail = TailReader(path)
+            tail.read_lines()
+
+            def _full():
+                data = Path(path).read_text(encoding="utf-8")
+                line = ""
+                for raw in data.splitlines():
+                    if raw.strip():
+                        line = raw.strip()
+                return line
+
+            full_us = _time_call(_full, args.reps)
+            idle_us = _time_call(tail.read_lines, args.reps * 10)
+
+            append_total = 0.0
+            for _ in range(args.reps):
+                writer.append(small)
+                t0 = time.perf_counter()
+                tail.read_lines()
+                append_total += time.perf_counter() - t0
+            append_us = append_total * 1e6 / args.reps
+            size_kb = os.path.getsize(path) / 1024.0
+        print(f"{kb:>8}KB {size_kb:>8.0f}KB | {full_us:>9.1f}us {idle_us:>8.1f}us {append_us:>9.1f}us")
+
+
+# ===== world stream =====
+def make_world_entries(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    tags = ("MONSTER", "KEYCARD", "DATA", "WEAPON", "MONEY", "PUZZLES", "BLACKBOX")
+    out = []
+    for i in range(1, count + 1):
+        tag = tags[i % len(tags)]
+        out.append({
+            "tag": tag,
+            "code": f"{tag[:2]}{i % 5}",
+            "name": f"{tag.title()} {i}",
+            "x": rng.uniform(-5000, 5000),
+            "y": rng.uniform(-5000, 5000),
+            "z": rng.uniform(0, 800),
+            "id": str(i),
+            "status": "Uncollected",
+        })
+    return out
+
+
+def bench_world(args):
+    """Registry bytes/s and overlay apply cost: full snapshots vs keyframe+delta stream."""
+    hz = 4.0
+    ticks = int(args.seconds * hz)
+    print(f"{'entries':>8} {'churn':>6} | {'snapshot B/s':>13} {'delta B/s':>11} | "
+          f"{'snap apply':>10} {'delta apply':>11}")
+    for count in args.counts:
+        for churn in args.churn:
+            rng = random.Random(count * 31 + churn)
+            entries = make_world_entries(count)
+            self_pos = {"x": 0.0, "y": 0.0, "z": 0.0}
+            enc = WorldDeltaEncoder(keyframe_interval_s=15.0)
+            snap_model = WorldModel()
+            delta_model = WorldModel()
+            snap_bytes = delta_bytes = 0
+            snap_t = delta_t = 0.0
+            for tick in range(ticks):
+                now = tick / hz
+                self_pos = {"x": self_pos["x"] + 1.5, "y": self_pos["y"], "z": self_pos["z"]}
+                for _ in range(churn):
+                    e = entries[rng.randrange(len(entries))]
+                    e["x"] += rng.uniform(-50, 50)
+                snap = enc.snapshot(entries, self_pos)
+                line = enc.emit(entries, self_pos, now)
+                snap_bytes += len(snap)
+                t0 = time.perf_counter()
+                snap_model.apply_line(snap)
+                snap_t += time.perf_counter() - t0
+                if line:
+                    delta_bytes += len(line)
+                    t0 = time.perf_counter()
+                    if not delta_model.apply_line(line):
+                        raise RuntimeError("delta stream out of sync")
+                    delta_t += time.perf_counter() - t0
+            if delta_model.entries != snap_model.entries:
+                raise RuntimeError("delta model diverged from snapshot model")
+            secs = ticks / hz
+            print(f"{count:>8} {churn:>6} | {snap_bytes / secs:>13,.0f} {delta_bytes / secs:>11,.0f} | "
+                  f"{snap_t * 1000 / ticks:>8.2f}ms {delta_t * 1000 / ticks:>9.3f}ms")
+
+
+# ===== world list =====
+def _legacy_world_refresh(widget, entries, self_pos, ids: list):
+    """The old ActionPanel._refresh_world_list: clear, sort, rebuild every item, re-find the selection.
+
+    Items go in with one addItems() call and ids live in `ids` rather than item data,
+    which is a little cheaper than the per-item addItem/setData the overlay used.
+    """
+    from BlackboxWorldView import category_order, entry_distance, entry_label
+
+    row = widget.currentRow()
+    selected_id = ids[row] if 0 <= row < len(ids) else None
+    rows = sorted(entries, key=lambda e: (category_order(e.get("tag")), str(e.get("name") or "").lower()))
+    widget.blockSignals(True)
+    widget.clear()
+    widget.addItems([entry_label(e, entry_distance(e, self_pos)) for e in rows])
+    ids[:] = [e.get("id") or "" for e in rows]
+    if selected_id:
+        for i, entry_id in enumerate(ids):
+            if entry_id == selected_id:
+                widget.setCurrentRow(i)
+                break
+    widget.blockSignals(False)
+
+
+def bench_worldlist(args):
+    """GUI-thread cost per registry update: QListWidget rebuild vs incremental model/proxy."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication, QListWidget
+    from BlackboxWorldView import WorldListModel, WorldListProxy, WorldListView
+
+    app = QApplication.instance() or QApplication([])
+    print(f"{args.updates} updates, {args.churn} entries moved per update; ms per update incl. repaint")
+    print(f"{'entries':>8} {'self':>8} | {'rebuild':>9} {'model':>9} {'signals':>8}")
+    for count in args.counts:
+        for walking in (False, True):
+            rng = random.Random(count)
+            entries = make_world_entries(count)
+            self_pos = {"x": 0.0, "y": 0.0, "z": 0.0}
+            enc = WorldDeltaEncoder(keyframe_interval_s=1e9)
+            world = WorldModel()
+            world.apply_line(enc.emit(entries, self_pos, 0.0))
+            widget = QListWidget()
+            view = WorldListView()
+            cols = WorldColumns(world) if WorldColumns.available() else None
+            if cols is not None:
+                cols.sync()
+            rows = WorldListModel(world, cols)
+            proxy = WorldListProxy()
+            proxy.setSourceModel(rows)
+            proxy.sort(0)
+            proxy.set_sort_mode(args.sort)
+            view.setModel(proxy)
+            for w in (widget, view):
+                w.resize(420, 480)
+                w.show()
+            rows.sync()
+            ids: list = []
+            _legacy_world_refresh(widget, world.entries_list(), world.self_pos, ids)
+            widget.setCurrentRow(count // 2)
+            view.setCurrentIndex(proxy.index(count // 2, 0))
+            app.processEvents()
+            legacy_t = model_t = 0.0
+            for _ in range(args.updates):
+                if walking:
+                    self_pos = {"x": self_pos["x"] + 1.5, "y": self_pos["y"], "z": self_pos["z"]}
+                for _ in range(args.churn):
+                    e = entries[rng.randrange(len(entries))]
+                    e["x"] += rng.uniform(-50, 50)
+                line = enc.emit(entries, self_pos, 1.0)
+                if not line or not world.apply_line(line):
+                    continue
+                t0 = time.perf_counter()
+                _legacy_world_refresh(widget, world.entries_list(), world.self_pos, ids)
+                widget.viewport().repaint()
+                legacy_t += time.perf_counter() - t0
+                t0 = time.perf_counter()
+                if cols is not None:
+                    cols.sync()
+                rows.sync()
+                view.viewport().repaint()
+                model_t += time.perf_counter() - t0
+            signals = rows.signals
+            for w in (widget, view):
+                w.close()
+                w.deleteLater()
+            app.processEvents()
+            print(f"{count:>8} {'walking' if walking else 'still':>8} | {legacy_t * 1000 / args.updates:>7.2f}ms "
+                  f"{model_t * 1000 / args.updates:>7.2f}ms {signals:>8}")
+
+
+def _legacy_selected_entry(entries: list, selected_id: str):
+    """The old _get_selected_world_entry: match the selected id against every entry."""
+    for entry in entries:
+        if str(entry.get("id") or "") == selected_id:
+            return entry
+    return None
+
+
+def bench_select(args):
+    """Selection lookup/restore per call: linear id scans vs the id->entry / id->row indexes."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+    from BlackboxWorldView import WorldListModel, WorldListProxy, WorldListView
+
+    app = QApplication.instance() or QApplication([])
+    print(f"{args.lookups} random selections; us per call")
+    print(f"{'entries':>8} | {'scan get':>9} {'scan restore':>13} | {'index get':>10} {'index restore':>14}")
+    for count in args.counts:
+        rng = random.Random(count)
+        entries = make_world_entries(count)
+        enc = WorldDeltaEncoder(keyframe_interval_s=1e9)
+        world = WorldModel()
+        world.apply_line(enc.emit(entries, {"x": 0.0, "y": 0.0, "z": 0.0}, 0.0))
+        rows = WorldListModel(world)
+        proxy = WorldListProxy()
+        proxy.setSourceModel(rows)
+        proxy.sort(0)
+        view = WorldListView()
+        view.setModel(proxy)
+        rows.sync()
+        app.processEvents()
+        listed = world.entries_list()
+        ids = [e.get("id") or "" for e in sorted(listed, key=lambda e: str(e.get("name") or "").lower())]
+        picks = [str(rng.randrange(1, count + 1)) for _ in range(args.lookups)]
+
+        t0 = time.perf_counter()
+        for entry_id in picks:
+            _legacy_selected_entry(listed, entry_id)
+        scan_get = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        for entry_id in picks:
+            for row_id in ids:
+                if row_id == entry_id:
+                    break
+        scan_restore = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for entry_id in picks:
+            idx = proxy.mapFromSource(rows.index(rows.row_of(entry_id)))
+            view.setCurrentIndex(idx)
+        index_restore = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        for _ in picks:
+            key = rows.key_at(proxy.mapToSource(view.currentIndex()).row())
+            world.entries.get(key)
+        index_get = time.perf_counter() - t0
+        view.close()
+        view.deleteLater()
+        app.processEvents()
+        n = max(1, args.lookups) / 1e6
+        print(f"{count:>8} | {scan_get / n:>7.1f}us {scan_restore / n:>11.1f}us | "
+              f"{index_get / n:>8.1f}us {index_restore / n:>12.1f}us")
+
+
+# ===== columnar world store =====
+def _python_world_pass(world: WorldModel):
+    """What the overlay did per update without WorldColumns: distance order."""
+    from BlackboxWorldView import entry_distance
+
+    self_pos = world.self_pos
+    entries = world.entries_list()
+    return sorted(entries, key=lambda e: (entry_distance(e, self_pos) is None,
+                                          entry_distance(e, self_pos) or 0.0))
+
+
+def _traced(fn):
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        out = fn()
+        return out, tracemalloc.get_traced_memory()[0] - base
+    finally:
+        tracemalloc.stop()
+
+
+def bench_columns(args):
+    """Bytes per entity and per-update latency: per-entry dicts vs the WorldColumns arrays."""
+    if not WorldColumns.available():
+        print("numpy is not installed; WorldColumns is unavailable")
+        return
+    print(f"{args.updates} updates, {args.churn} entries moved per update; ms per update (distance order)")
+    print(f"{'entries':>8} | {'dict B/ent':>10} {'cols B/ent':>10} {'arrays':>7} | {'self':>8} | "
+          f"{'python':>9} {'columns':>9} {'speedup':>8}")
+    for count in args.counts:
+        for walking in (False, True):
+            rng = random.Random(count)
+            entries = make_world_entries(count)
+            self_pos = {"x": 0.0, "y": 0.0, "z": 0.0}
+            enc = WorldDeltaEncoder(keyframe_interval_s=1e9)
+            line = enc.emit(entries, self_pos, 0.0)
+            world = WorldModel()
+            cols = WorldColumns(world, capacity=count)
+            _, dict_bytes = _traced(lambda: world.apply_line(line))
+            _, col_bytes = _traced(cols.sync)
+            py_t = col_t = 0.0
+            for _ in range(args.updates):
+                if walking:
+                    self_pos = {"x": self_pos["x"] + 1.5, "y": self_pos["y"], "z": self_pos["z"]}
+                for _ in range(args.churn):
+                    e = entries[rng.randrange(len(entries))]
+                    e["x"] += rng.uniform(-50, 50)
+                line = enc.emit(entries, self_pos, 1.0)
+                if not line or not world.apply_line(line):
+                    continue
+                t0 = time.perf_counter()
+                order = _python_world_pass(world)
+                py_t += time.perf_counter() - t0
+                t0 = time.perf_counter()
+                cols.sync()
+                col_order = cols.order_by_distance()
+                col_t += time.perf_counter() - t0
+                if len(col_order) != len(order):
+                    print("  mismatch between python and columnar results")
+            print(f"{count:>8} | {dict_bytes / count:>10.0f} {col_bytes / count:>10.0f} "
+                  f"{cols.nbytes() / cols.capacity:>7.0f} | {'walking' if walking else 'still':>8} | "
+                  f"{py_t * 1000 / args.updates:>7.2f}ms {col_t * 1000 / args.updates:>7.2f}ms "
+                  f"{py_t / max(col_t, 1e-9):>7.1f}x")
+
+
+# ===== spatial index =====
+def _scan_nearest(world: WorldModel, pos, tag: str, code: str | None):
+    from BlackboxWorldView import entry_distance
+
+    best = None
+    for key, entry in world.entries.items():
+        if entry.get("tag") != tag or (code is not None and str(entry.get("code")).upper() != code):
+            continue
+        if str(entry.get("status")).lower() == "collected":
+            continue
+        dist = entry_distance(entry, pos)
+        if dist is not None and (best is None or dist < best[0]):
+            best = (dist, key)
+    return best
+
+
+def bench_grid(args):
+    """Nearest / within-radius queries: full scan vs the WorldGrid index, plus its per-update sync cost."""
+    print(f"{args.queries} queries from random points; {args.updates} updates x {args.churn} moved entries")
+    print(f"{'entries':>8} | {'scan nn':>9} {'grid nn':>9} {'speedup':>8} | {'grid r<R':>9} {'hits':>6} | "
+          f"{'sync':>8} {'cells/q':>8}")
+    for count in args.counts:
+        rng = random.Random(count)
+        entries = make_world_entries(count)
+        self_pos = {"x": 0.0, "y": 0.0, "z": 0.0}
+        enc = WorldDeltaEncoder(keyframe_interval_s=1e9)
+        world = WorldModel()
+        world.apply_line(enc.emit(entries, self_pos, 0.0))
+        grid = WorldGrid(world)
+        grid.sync()
+        points = [{"x": rng.uniform(-5000, 5000), "y": rng.uniform(-5000, 5000), "z": rng.uniform(0, 800)}
+                  for _ in range(args.queries)]
+        codes = sorted({str(e["code"]).upper() for e in entries if e["tag"] == "WEAPON"})
+        asks = [(p, rng.choice(codes)) for p in points]
+        t0 = time.perf_counter()
+        want = [_scan_nearest(world, p, "WEAPON", code) for p, code in asks]
+        scan_t = time.perf_counter() - t0
+        grid.visited = 0
+        t0 = time.perf_counter()
+        got = [grid.nearest(p, 1, "WEAPON", code=code, uncollected=True) for p, code in asks]
+        grid_t = time.perf_counter() - t0
+        cells = grid.visited / max(1, len(asks))
+        if [round(w[0], 6) if w else None for w in want] != [round(g[0][0], 6) if g else None for g in got]:
+            print("  mismatch between scan and grid results")
+        t0 = time.perf_counter()
+        hits = sum(len(grid.within(p, args.radius, "MONSTER")) for p in points)
+        within_t = time.perf_counter() - t0
+        sync_t = 0.0
+        for _ in range(args.updates):
+            for _ in range(args.churn):
+                e = entries[rng.randrange(len(entries))]
+                e["x"] += rng.uniform(-3000, 3000)
+            line = enc.emit(entries, self_pos, 1.0)
+            if not line or not world.apply_line(line):
+                continue
+            t0 = time.perf_counter()
+            grid.sync()
+            sync_t += time.perf_counter() - t0
+        n = max(1, len(asks))
+        print(f"{count:>8} | {scan_t * 1000 / n:>7.3f}ms {grid_t * 1000 / n:>7.3f}ms {scan_t / max(grid_t, 1e-9):>7.1f}x | "
+              f"{within_t * 1000 / n:>7.3f}ms {hits / n:>6.1f} | {sync_t * 1000 / max(1, args.updates):>6.3f}ms "
+              f"{cells:>8.1f}")
+
+
+# ===== codec =====
+def bench_codec(args):
+    # Correctness (the round-trip corpus) is in tests/test_codec.py.
+    print(f"{'entries':>8} | {'text bytes':>10} {'bin bytes':>10} | {'text decode':>11} {'bin decode':>11}")
+    for count in args.counts:
+        entries = make_world_entries(count)
+        pos = {"x": 0.0, "y": 0.0, "z": 0.0}
+        text = WorldDeltaEncoder().keyframe(entries, pos)
+        frame = WorldFrameEncoder().keyframe(entries, pos)
+
+        def _text():
+            WorldModel().apply_line(text)
+
+        def _bin():
+            WorldModel().apply_frame(WorldFrameDecoder().decode(frame))
+
+        text_us = _time_call(_text, args.reps)
+        bin_us = _time_call(_bin, args.reps)
+        print(f"{count:>8} | {len(text):>10,} {len(frame):>10,} | "
+              f"{text_us / 1000:>9.2f}ms {bin_us / 1000:>9.2f}ms")
+
+
+# ===== pipelining =====
+PIPELINE_QUERIES = (
+    ("players", "listplayers_gui"),
+    ("tp", "tp_gui_state"),
+    ("puzzles", "puzzlestate"),
+    ("contracts", "contract_gui_state"),
+    ("weapon", "weapon_gui_state"),
+)
+
+
+def _pipeline_run(tmp: str, window: int, args) -> dict:
+    """Every panel asks for fresh state at --hz; staleness = request to applied ack."""
+    latency = {"contract_gui_state": args.slow_ms / 1000.0}
+    peer = StandInPeer(tmp, args.latency_ms / 1000.0, latency)
+    peer.serve_file(args.peer_poll_ms / 1000.0)
+    reader = JournalReader(os.path.join(tmp, "bridge_ack.txt"))
+    bridge = CommandBridge(os.path.join(tmp, "bridge_cmd.txt"))
+    pipe = CommandPipeline(bridge.call, window)
+    asked: dict[str, float] = {}
+    samples: dict[str, list] = {key: [] for key, _ in PIPELINE_QUERIES}
+
+    def _done(key):
+        def _handler(ok, msg):
+            t0 = asked.pop(key, None)
+            if ok and t0 is not None:
+                samples[key].append((time.perf_counter() - t0) * 1000.0)
+        return _handler
+
+    for key, name in PIPELINE_QUERIES:
+        pipe.register(key, name, _done(key), 5.0)
+    period = 1.0 / args.hz
+    next_round = time.perf_counter()
+    stop = next_round + args.seconds
+    try:
+        while time.perf_counter() < stop:
+            now = time.perf_counter()
+            if now >= next_round:
+                next_round += period
+                for key, _ in PIPELINE_QUERIES:
+                    asked.setdefault(key, now)
+                    pipe.request(key)
+            for line in reader.read_new():
+                parsed = parse_ack_line(line)
+                if parsed:
+                    bridge.resolve(*parsed)
+            bridge.expire()
+            time.sleep(0.002)
+    finally:
+        peer.stop()
+    return samples
+
+
+def bench_pipeline(args):
+    """Per-panel staleness with one query in flight vs a pipelined window, slow contracts."""
+    print(f"peer poll {args.peer_poll_ms:.0f}ms, contract_gui_state {args.slow_ms:.0f}ms, "
+          f"others {args.latency_ms:.0f}ms, {args.hz:g} refresh rounds/s")
+    for window in args.windows:
+        with tempfile.TemporaryDirectory() as tmp:
+            samples = _pipeline_run(tmp, window, args)
+        print(f"window {window}")
+        for key, _ in PIPELINE_QUERIES:
+            _report(f"  {key}", samples[key])
+
+
+# ===== priorities =====
+PRIORITY_QUERIES = (
+    ("players", "listplayers_gui", PRIO_STATE),
+    ("tp", "tp_gui_state", PRIO_STATE),
+    ("puzzles", "puzzlestate", PRIO_STATE),
+    ("contracts", "contract_gui_state", PRIO_STATE),
+    ("weapon", "weapon_gui_state", PRIO_BULK),
+)
+
+
+def _priority_run(tmp: str, prioritized: bool, args) -> tuple[list, list, CommandPipeline]:
+    latency = {name: args.query_ms / 1000.0 for _, name, _ in PRIORITY_QUERIES}
+    peer = StandInPeer(tmp, args.action_ms / 1000.0, latency, priority=prioritized)
+    peer.serve_file(args.peer_poll_ms / 1000.0)
+    reader = JournalReader(os.path.join(tmp, "bridge_ack.txt"))
+    bridge = CommandBridge(os.path.join(tmp, "bridge_cmd.txt"))
+    if prioritized:
+        pipe = CommandPipeline(bridge.call, args.window)
+    else:
+        # Old behaviour: one FIFO, no pacing, everything shares the window.
+        pipe = CommandPipeline(bridge.call, args.window, rates={})
+    for key, name, prio in PRIORITY_QUERIES:
+        pipe.register(key, name, None, 5.0, priority=prio if prioritized else PRIO_STATE)
+    actions: list = []
+    queries: list = []
+    rng = random.Random(3)
+    period = 1.0 / args.hz
+    next_round = next_action = time.perf_counter()
+    stop = next_round + args.seconds
+    try:
+        while time.perf_counter() < stop:
+            now = time.perf_counter()
+            if now >= next_round:
+                next_round += period
+                for key, _, _ in PRIORITY_QUERIES:
+                    pipe.request(key).add_done_callback(
+                        lambda f, t0=now: f.exception() is None and queries.append((time.perf_counter() - t0) * 1000.0))
+            if now >= next_action:
+                next_action = now + rng.uniform(0.5, 1.5) * args.action_every_ms / 1000.0
+                bridge.call("heal", "", 5.0).add_done_callback(
+                    lambda f, t0=now: f.exception() is None and actions.append((time.perf_counter() - t0) * 1000.0))
+            for line in reader.read_new():
+                parsed = parse_ack_line(line)
+                if parsed:
+                    bridge.resolve(*parsed)
+            bridge.expire()
+            pipe.pump()
+            time.sleep(0.002)
+    finally:
+        peer.stop()
+    return actions, queries, pipe
+
+
+def bench_priority(args):
+    """Interactive command latency while background state queries saturate the bridge."""
+    print(f"peer poll {args.peer_poll_ms:.0f}ms, queries {args.query_ms:.0f}ms each at {args.hz:g} rounds/s, "
+          f"actions {args.action_ms:.0f}ms every ~{args.action_every_ms:.0f}ms, window {args.window}")
+    for prioritized in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            actions, queries, pipe = _priority_run(tmp, prioritized, args)
+        label = "priority" if prioritized else "fifo"
+        print(f"{label}: {pipe.issued} queries issued, {pipe.coalesced} coalesced")
+        _report("  action", actions)
+        _report("  query", queries)
+
+
+# ===== batch frames =====
+def _batch_run(tmp: str, batched: bool, args) -> tuple[list, int, CommandPipeline]:
+    """Panel-open syncs: every query at once, sync time = first request to last answer."""
+    peer = StandInPeer(tmp, args.latency_ms / 1000.0)
+    peer.serve_file(args.peer_poll_ms / 1000.0)
+    reader = JournalReader(os.path.join(tmp, "bridge_ack.txt"))
+    bridge = CommandBridge(os.path.join(tmp, "bridge_cmd.txt"))
+    pipe = CommandPipeline(bridge.call, args.window, rates={},
+                           call_batch=bridge.call_batch if batched else None)
+    for key, name, prio in PRIORITY_QUERIES:
+        pipe.register(key, name, None, 5.0, priority=prio)
+    keys = [key for key, _, _ in PRIORITY_QUERIES]
+    samples = []
+    ack_lines = 0
+    try:
+        for _ in range(args.rounds):
+            t0 = time.perf_counter()
+            futures = pipe.request_many(keys)
+            deadline = t0 + 5.0
+            while not all(f.done() for f in futures) and time.perf_counter() < deadline:
+                for line in reader.read_new():
+                    parsed = parse_ack_line(line)
+                    if parsed:
+                        ack_lines += 1
+                        bridge.resolve(*parsed)
+                bridge.expire()
+                time.sleep(0.002)
+            if all(f.done() and f.exception() is None for f in futures):
+                samples.append((time.perf_counter() - t0) * 1000.0)
+    finally:
+        peer.stop()
+    return samples, ack_lines, pipe
+
+
+def bench_batch(args):
+    """Panel-open sync as separate command lines vs one batch frame with one combined ack."""
+    print(f"peer poll {args.peer_poll_ms:.0f}ms, {len(PRIORITY_QUERIES)} queries per sync, "
+          f"{args.latency_ms:.0f}ms each, window {args.window}")
+    for batched in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            samples, ack_lines, pipe = _batch_run(tmp, batched, args)
+        label = "batched" if batched else "separate"
+        print(f"{label}: {pipe.issued} queries in {pipe.frames} command writes, {ack_lines} ack lines")
+        _report("  sync", samples)
+
+
+# ===== state block =====
+_STATE_COUNT_KEYS = ("REGTOTAL", "MON", "KEY", "DISK", "BLACK", "WEAPON", "MONEY", "PUZZLES")
+
+
+def _state_sample(k: int) -> dict:
+    data = {"MAP": f"Map_{k % 97}", "WORLD": "1", "PAWN": "1", "RADAR": "0", "PANEL": "1",
+            "PROTO": "3", "PROTOACT": "3", "EMIT": f"{k:.3f}", "PRUNE": f"{k:.3f}", "STATEWRITE": f"{k:.3f}"}
+    for key in _STATE_COUNT_KEYS:
+        data[key] = str(k)
+    return data
+
+
+def _state_consistent(data: dict) -> bool:
+    k = data.get("REGTOTAL")
+    return (all(data.get(key) == k for key in _STATE_COUNT_KEYS)
+            and data.get("STATEWRITE") == f"{int(k):.3f}" and data.get("MAP") == f"Map_{int(k) % 97}")
+
+
+def _state_writer_proc(path: str, seconds: float, hz: float):
+    writer = StateBlockWriter(path)
+    pause = (1.0 / hz) if hz > 0 else 0.0
+    stop = time.monotonic() + seconds
+    k = 0
+    while time.monotonic() < stop:
+        k += 1
+        writer.write(_state_sample(k), {"x": float(k), "y": 0.0, "z": 0.0})
+        if pause:
+            time.sleep(pause)
+    writer.close()
+
+
+def bench_state(args):
+    """Per-poll cost of the STATE text file vs the mapped block, then a torn-read stress run."""
+    with tempfile.TemporaryDirectory() as tmp:
+        text_path = os.path.join(tmp, "bridge_state.txt")
+        bin_path = os.path.join(tmp, "bridge_state.bin")
+        line = "STATE=" + "#".join(f"{k}:{v}" for k, v in _state_sample(1).items())
+        Path(text_path).write_text(line + "\n", encoding="utf-8")
+        writer = StateBlockWriter(bin_path)
+        writer.write(_state_sample(1))
+        tail = TailReader(text_path)
+        tail.read_snapshot()
+        reader = StateBlockReader(bin_path)
+        reader.read()
+
+        text_idle = _time_call(tail.read_snapshot, args.reps)
+        block_idle = _time_call(reader.read, args.reps)
+
+        def _text_changed():
+            Path(text_path).write_text(line + "\n", encoding="utf-8")
+            os.utime(text_path, ns=(time.time_ns(), time.time_ns()))
+            t0 = time.perf_counter()
+            tail.read_snapshot()
+            return time.perf_counter() - t0
+
+        def _block_changed():
+            writer.write(_state_sample(2))
+            t0 = time.perf_counter()
+            reader.read()
+            return time.perf_counter() - t0
+
+        text_new = sum(_text_changed() for _ in range(args.reps)) * 1e6 / args.reps
+        block_new = sum(_block_changed() for _ in range(args.reps)) * 1e6 / args.reps
+        reader.close()
+        writer.close()
+        print(f"{'source':>8} | {'idle poll':>10} {'new state':>10}")
+        print(f"{'text':>8} | {text_idle:>8.2f}us {text_new:>8.2f}us")
+        print(f"{'mmap':>8} | {block_idle:>8.2f}us {block_new:>8.2f}us")
+
+        # Writer in another process so the seqlock is exercised without the GIL in the way.
+        proc = multiprocessing.Process(target=_state_writer_proc, args=(bin_path, args.seconds, args.writer_hz))
+        proc.start()
+        reader = StateBlockReader(bin_path)
+        polls = bad = 0
+        while proc.is_alive():
+            polls += 1
+            data = reader.read()
+            if data is not None and not _state_consistent(data):
+                bad += 1
+        proc.join()
+        reader.close()
+        print(f"stress: {polls:,} polls, {reader.snapshots:,} snapshots, "
+              f"{reader.torn:,} retries, {bad} inconsistent")
+        if bad:
+            raise SystemExit(1)
+
+
+# ===== io thread =====
+def _registry_stream(count: int, updates: int, churn: int) -> list:
+    rng = random.Random(count * 17 + churn)
+    entries = make_world_entries(count)
+    self_pos = {"x": 0.0, "y": 0.0, "z": 0.0}
+    enc = WorldDeltaEncoder()
+    lines = [enc.keyframe(entries, self_pos)]
+    for _ in range(updates):
+        self_pos = {"x": self_pos["x"] + 1.5, "y": self_pos["y"], "z": self_pos["z"]}
+        for _ in range(churn):
+            e = entries[rng.randrange(len(entries))]
+            e["x"] += rng.uniform(-50, 50)
+        line = enc.delta(entries, self_pos)
+        if line:
+            lines.append(line)
+    return lines
+
+
+def _stall_run(tmp: str, lines: list, threaded: bool, args) -> tuple[list, list, float, WorldModel]:
+    """Replays lines into a registry journal while the calling thread plays the GUI loop.
+
+    Returns per-iteration stalls (wall time past the tick sleep), GUI-thread time
+    per applied update, worker time and the GUI-side model.
+    """
+    from BlackboxIO import BridgeReader
+
+    path = os.path.join(tmp, "bridge_registry.txt")
+    writer = JournalWriter(path, epoch="1", max_bytes=1 << 40)
+    world = WorldModel()
+    done = threading.Event()
+    patches = []
+    lock = threading.Lock()
+    worker_s = [0.0]
+    tick = args.tick_ms / 1000.0
+
+    def _write():
+        pause = 1.0 / args.hz
+        for line in lines:
+            writer.append(line)
+            time.sleep(pause)
+        time.sleep(0.05)
+        done.set()
+
+    def _work(reader):
+        while True:
+            finished = done.is_set()
+            t0 = time.perf_counter()
+            patch = reader.read_world()
+            worker_s[0] += time.perf_counter() - t0
+            if patch is not None:
+                with lock:
+                    patches.append(patch)
+            if finished:
+                break
+            time.sleep(tick)
+
+    if threaded:
+        names = ("bridge_ack.txt", "bridge_notice.txt", "bridge_registry.bin", "bridge_state.txt")
+        reader = BridgeReader(*(os.path.join(tmp, n) for n in names[:2]), path,
+                              *(os.path.join(tmp, n) for n in names[2:]))
+        worker = threading.Thread(target=_work, args=(reader,), daemon=True)
+    else:
+        journal = JournalReader(path)
+    threads = [threading.Thread(target=_write, daemon=True)]
+    if threaded:
+        threads.append(worker)
+    for t in threads:
+        t.start()
+
+    stalls = []
+    applied = []
+    while True:
+        finished = done.is_set() and not (threaded and worker.is_alive())
+        t0 = time.perf_counter()
+        if threaded:
+            with lock:
+                batch = patches[:]
+                patches.clear()
+            for patch in batch:
+                t1 = time.perf_counter()
+                world.apply_patch(patch)
+                applied.append((time.perf_counter() - t1) * 1000.0)
+        else:
+            t1 = time.perf_counter()
+            changed = False
+            for line in journal.read_new():
+                changed = world.apply_line(line) or changed
+            if changed:
+                applied.append((time.perf_counter() - t1) * 1000.0)
+        time.sleep(tick)
+        stalls.append(max(0.0, (time.perf_counter() - t0 - tick) * 1000.0))
+        if finished:
+            break
+    for t in threads:
+        t.join()
+    return stalls, applied, worker_s[0], world
+
+
+def bench_iostall(args):
+    """GUI-thread stall under a large registry stream: reads+decode on the GUI thread vs an I/O thread."""
+    print(f"{'entries':>8} {'path':>7} | {'updates':>7} {'gui/update':>10} {'stall p99':>10} {'stall max':>10} "
+          f"{'worker':>9}")
+    for count in args.counts:
+        lines = _registry_stream(count, args.updates, args.churn)
+        models = []
+        for threaded in (False, True):
+            with tempfile.TemporaryDirectory() as tmp:
+                stalls, applied, worker_s, world = _stall_run(tmp, lines, threaded, args)
+            models.append(world)
+            label = "thread" if threaded else "gui"
+            worker_txt = f"{worker_s * 1000:>7.1f}ms" if threaded else f"{'--':>9}"
+            print(f"{count:>8} {label:>7} | {len(applied):>7} {statistics.fmean(applied or [0.0]):>8.2f}ms "
+                  f"{_pct(stalls, 99):>8.2f}ms {max(stalls or [0.0]):>8.2f}ms {worker_txt}")
+        if models[0].entries != models[1].entries or models[0].self_pos != models[1].self_pos:
+            raise RuntimeError("patched model diverged from the directly applied one")
+
+
+# ===== runtime =====
+def bench_runtime(args):
+    """Headless Runtime under load: concurrent query fan-out plus notice bursts into a slow consumer."""
+    with tempfile.TemporaryDirectory() as tmp:
+        peer = StandInPeer(tmp, args.latency_ms / 1000.0)
+        peer.serve_file(args.peer_poll_ms / 1000.0)
+        acks = JournalReader(os.path.join(tmp, "bridge_ack.txt"))
+        notices = JournalReader(os.path.join(tmp, "bridge_notice.txt"))
+        bridge = CommandBridge(os.path.join(tmp, "bridge_cmd.txt"))
+        rt = Runtime()
+        samples = []
+        consumed = [0]
+        burst_no = [0]
+
+        def _poll():
+            for line in acks.read_new():
+                parsed = parse_ack_line(line)
+                if parsed:
+                    bridge.resolve(*parsed)
+            for line in notices.read_new():
+                bridge.publish(line.strip())
+            bridge.expire()
+
+        async def _fanout():
+            while True:
+                t0 = time.perf_counter()
+                await gather([bridge.call(name, "", 5.0) for _, name in PIPELINE_QUERIES])
+                samples.append((time.perf_counter() - t0) * 1000.0)
+
+        def _burst():
+            burst_no[0] += 1
+            for i in range(args.burst):
+                peer.notice(f"PLAYERS=SELF:Host;P:Guest{i % 4}:{burst_no[0]}.0,{i}.0,0.0")
+                peer.notice(f"NOTICE|INFO|burst {burst_no[0]} #{i}")
+
+        stream = bridge.notices(maxlen=args.queue)
+
+        async def _consume():
+            async for _line in stream:
+                consumed[0] += 1
+                await rt.sleep(args.consume_ms / 1000.0)
+
+        for _ in range(args.tasks):
+            rt.spawn(_fanout())
+        rt.every(1.0 / args.burst_hz, _burst, "bursts")
+        rt.spawn(_consume())
+        try:
+            rt.run(timeout_s=args.seconds, poll=_poll, tick_s=0.002)
+        finally:
+            live = len(rt.tasks)
+            cancelled = rt.shutdown()
+            peer.stop()
+        published = burst_no[0] * args.burst * 2
+        print(f"{args.tasks} fan-out tasks x {len(PIPELINE_QUERIES)} queries, peer poll {args.peer_poll_ms:.0f}ms, "
+              f"{args.seconds:g}s")
+        _report("  gather", samples)
+        print(f"  queries/s {len(samples) * len(PIPELINE_QUERIES) / args.seconds:,.0f}, timeouts {bridge.timeouts}")
+        print(f"  notices: published {published:,}, consumed {consumed[0]:,}, coalesced {stream.coalesced:,}, "
+              f"dropped {stream.dropped:,}, max queue {stream.max_depth}/{args.queue}")
+        print(f"  shutdown: {live} live tasks, {cancelled} cancelled, {len(rt.tasks)} left, "
+              f"{rt.wheel.pending()} timers pending")
+        if rt.tasks or rt.failed:
+            raise SystemExit(1)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Blackbox bridge benchmarks.")
+    sub = ap.add_subparsers(dest="bench", required=True)
+
+    p = sub.add_parser("transport", help="command round-trip latency, file vs socket")
+    p.add_argument("--count", type=int, default=50)
+    p.add_argument("--file-poll-ms", type=float, default=100.0,
+                   help="peer poll interval for the file bridge (Lua uses 100ms)")
+    p.set_defaults(fn=bench_transport)
+
+    p = sub.add_parser("journal", help="burst delivery through the sequenced journal")
+    p.add_argument("--bursts", type=int, default=200)
+    p.add_argument("--burst-size", type=int, default=250)
+    p.add_argument("--rotate-bytes", type=int, default=16 * 1024)
+    p.set_defaults(fn=bench_journal)
+
+    p = sub.add_parser("tail", help="bridge file read cost vs WORLD payload size")
+    p.add_argument("--sizes-kb", type=int, nargs="+", default=[16, 256, 1024, 4096])
+    p.add_argument("--reps", type=int, default=50)
+    p.set_defaults(fn=bench_tail)
+
+    p = sub.add_parser("world", help="registry stream bytes/s, snapshots vs deltas")
+    p.add_argument("--counts", type=int, nargs="+", default=[100, 1000, 10000])
+    p.add_argument("--churn", type=int, nargs="+", default=[0, 10],
+                   help="entries moved per 250ms emit")
+    p.add_argument("--seconds", type=float, default=30.0)
+    p.set_defaults(fn=bench_world)
+
+    p = sub.add_parser("worldlist", help="world list refresh cost, widget rebuild vs model/proxy diffs")
+    p.add_argument("--counts", type=int, nargs="+", default=[100, 1000, 10000])
+    p.add_argument("--updates", type=int, default=40)
+    p.add_argument("--churn", type=int, default=10, help="entries moved per update")
+    p.add_argument("--sort", default="CATEGORY", choices=("CATEGORY", "DISTANCE", "NAME"),
+                   help="model sort mode (the rebuild always sorts by category)")
+    p.set_defaults(fn=bench_worldlist)
+
+    p = sub.add_parser("select", help="world selection lookup/restore, linear id scans vs id indexes")
+    p.add_argument("--counts", type=int, nargs="+", default=[1000, 10000, 100000])
+    p.add_argument("--lookups", type=int, default=2000)
+    p.set_defaults(fn=bench_select)
+
+    p = sub.add_parser("columns", help="world store bytes/entity and update cost, dicts vs numpy columns")
+    p.add_argument("--counts", type=int, nargs="+", default=[1000, 10000])
+    p.add_argument("--updates", type=int, default=40)
+    p.add_argument("--churn", type=int, default=10, help="entries moved per update")
+    p.set_defaults(fn=bench_columns)
+
+    p = sub.add_parser("grid", help="nearest-entity queries, full scan vs the per-tag spatial grid")
+    p.add_argument("--counts", type=int, nargs="+", default=[1000, 10000, 50000])
+    p.add_argument("--queries", type=int, default=200)
+    p.add_argument("--radius", type=float, default=2500.0, help="within-radius query (registry units)")
+    p.add_argument("--updates", type=int, default=40)
+    p.add_argument("--churn", type=int, default=10, help="entries moved per update")
+    p.set_defaults(fn=bench_grid)
+
+    p = sub.add_parser("codec", help="binary world frame size and decode throughput vs text")
+    p.add_argument("--counts", type=int, nargs="+", default=[100, 1000, 10000])
+    p.add_argument("--reps", type=int, default=20)
+    p.set_defaults(fn=bench_codec)
+
+    p = sub.add_parser("pipeline", help="per-panel staleness, single in-flight vs pipelined window")
+    p.add_argument("--windows", type=int, nargs="+", default=[1, 4, 8])
+    p.add_argument("--seconds", type=float, default=5.0)
+    p.add_argument("--hz", type=float, default=4.0, help="refresh rounds per second")
+    p.add_argument("--peer-poll-ms", type=float, default=100.0)
+    p.add_argument("--latency-ms", type=float, default=5.0, help="peer latency for most commands")
+    p.add_argument("--slow-ms", type=float, default=250.0, help="peer latency for contract_gui_state")
+    p.set_defaults(fn=bench_pipeline)
+
+    p = sub.add_parser("priority", help="interactive latency under background query load, fifo vs priority")
+    p.add_argument("--seconds", type=float, default=6.0)
+    p.add_argument("--hz", type=float, default=10.0, help="background refresh rounds per second")
+    p.add_argument("--window", type=int, default=4)
+    p.add_argument("--peer-poll-ms", type=float, default=100.0)
+    p.add_argument("--query-ms", type=float, default=15.0, help="peer cost of each background query")
+    p.add_argument("--action-ms", type=float, default=2.0, help="peer cost of a user action")
+    p.add_argument("--action-every-ms", type=float, default=150.0)
+    p.set_defaults(fn=bench_priority)
+
+    p = sub.add_parser("batch", help="panel-open sync, one frame per command vs one batch frame")
+    p.add_argument("--rounds", type=int, default=20)
+    p.add_argument("--window", type=int, default=8)
+    p.add_argument("--peer-poll-ms", type=float, default=100.0)
+    p.add_argument("--latency-ms", type=float, default=2.0, help="peer cost of each query")
+    p.set_defaults(fn=bench_batch)
+
+    p = sub.add_parser("state", help="STATE poll cost, text file vs mapped seqlock block")
+    p.add_argument("--reps", type=int, default=2000)
+    p.add_argument("--seconds", type=float, default=2.0)
+    p.add_argument("--writer-hz", type=float, default=0.0, help="0 writes as fast as possible")
+    p.set_defaults(fn=bench_state)
+
+    p = sub.add_parser("iostall", help="GUI-thread stall under a large registry, inline reads vs the I/O thread")
+    p.add_argument("--counts", type=int, nargs="+", default=[1000, 10000, 50000])
+    p.add_argument("--updates", type=int, default=40)
+    p.add_argument("--churn", type=int, default=200, help="entries moved per update")
+    p.add_argument("--hz", type=float, default=20.0, help="registry writes per second")
+    p.add_argument("--tick-ms", type=float, default=4.0, help="GUI loop / worker poll interval")
+    p.set_defaults(fn=bench_iostall)
+
+    p = sub.add_parser("runtime", help="headless task runtime: concurrent fan-out, notice backpressure, shutdown")
+    p.add_argument("--tasks", type=int, default=8, help="concurrent fan-out tasks")
+    p.add_argument("--seconds", type=float, default=3.0)
+    p.add_argument("--peer-poll-ms", type=float, default=10.0)
+    p.add_argument("--latency-ms", type=float, default=1.0)
+    p.add_argument("--burst", type=int, default=200, help="notice pairs per burst")
+    p.add_argument("--burst-hz", type=float, default=4.0)
+    p.add_argument("--queue", type=int, default=32, help="notice stream bound")
+    p.add_argument("--consume-ms", type=float, default=5.0, help="consumer cost per notice")
+    p.set_defaults(fn=bench_runtime)
+
+    args = ap.parse_args()
+    args.fn(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1490 @@
+import mmap
+import os
+import socket
+import struct
+import threading
+import time
+from abc import ABC, abstractmethod
+
+# ===== Bridge transports =====
+# Commands travel as one line per frame: CMD|<id>|<name>|<arg>\n
+# Acks come back as ACK|<id>|<ok>|<msg>\n (file or socket, depending on transport).
+BRIDGE_SOCKET_HOST = "127.0.0.1"
+BRIDGE_SOCKET_PORT = 47815
+BRIDGE_SOCKET_RECONNECT_S = 0.5
+# A batch is one CMD frame named BATCH_CMD whose arg is name/arg pairs joined by
+# BATCH_SEP. The peer runs them in order in one tick and sends a single ack whose
+# msg is ok/msg pairs joined the same way; the ack's own ok is set when all were ok.
+BATCH_CMD = "batch"
+BATCH_SEP = "\x1f"
+
+
+def sanitize_arg(value) -> str:
+    s = "" if value is None else str(value)
+    return s.replace("\r", " ").replace("\n", " ").replace("|", " ").replace(BATCH_SEP, " ")
+
+
+def format_cmd_line(cmd_id: int, name: str, arg: str = "") -> str:
+    return f"CMD|{int(cmd_id)}|{name}|{sanitize_arg(arg)}\n"
+
+
+def format_batch_line(cmd_id: int, commands) -> str:
+    fields = []
+    for name, arg in commands:
+        fields.append(sanitize_arg(name))
+        fields.append(sanitize_arg(arg))
+    return f"CMD|{int(cmd_id)}|{BATCH_CMD}|{BATCH_SEP.join(fields)}\n"
+
+
+def _pairs(text: str) -> list[tuple[str, str]]:
+    # Line readers strip trailing whitespace, which includes BATCH_SEP, so a
+    # missing last field is an empty one.
+    fields = str(text or "").split(BATCH_SEP)
+    return [(fields[i], fields[i + 1] if i + 1 < len(fields) else "") for i in range(0, len(fields), 2)]
+
+
+def parse_batch_arg(arg: str) -> list[tuple[str, str]]:
+    return [(name.strip().lower(), a) for name, a in _pairs(arg) if name.strip()]
+
+
+def format_batch_results(results) -> str:
+    return BATCH_SEP.join(f"{'1' if ok else '0'}{BATCH_SEP}{sanitize_arg(msg)}" for ok, msg in results)
+
+
+def parse_batch_results(msg: str) -> list[tuple[bool, str]]:
+    return [(ok.strip() == "1", text) for ok, text in _pairs(msg)]
+
+
+def parse_ack_line(line: str) -> tuple[str, bool, str] | None:
+    parts = str(line or "").strip().split("|", 3)
+    if len(parts) < 4 or parts[0] != "ACK":
+        return None
+    return parts[1], parts[2] == "1", parts[3] or ""
+
+
+class BridgeTransport(ABC):
+    """Sends command lines to Lua; subclasses implement write_line."""
+
+    name = "base"
+
+    def __init__(self):
+        self._line_handler = None
+
+    def set_line_handler(self, cb):
+        self._line_handler = cb
+
+    def _emit_line(self, line: str):
+        cb = self._line_handler
+        if cb is None or not line:
+            return
+        try:
+            cb(line)
+        except Exception:
+            pass
+
+    def open(self) -> bool:
+        return True
+
+    def is_connected(self) -> bool:
+        return True
+
+    @abstractmethod
+    def write_line(self, line: str) -> bool:
+        ...
+
+    def close(self):
+        pass
+
+
+class FileTransport(BridgeTransport):
+    """Appends command lines to bridge_cmd.txt; acks arrive through the ack file."""
+
+    name = "file"
+
+    def __init__(self, cmd_path: str):
+        super().__init__()
+        self.cmd_path = str(cmd_path or "")
+
+    def is_connected(self) -> bool:
+        return bool(self.cmd_path)
+
+    def write_line(self, line: str) -> bool:
+        if not self.cmd_path:
+            return False
+        try:
+            with open(self.cmd_path, "a", encoding="utf-8", newline="\n") as f:
+                f.write(line)
+            return True
+        except Exception:
+            return False
+
+
+class SocketTransport(BridgeTransport):
+    """Persistent loopback stream connection; acks are read back on a reader thread."""
+
+    name = "socket"
+
+    def __init__(self, host: str = BRIDGE_SOCKET_HOST, port: int = BRIDGE_SOCKET_PORT,
+                 reconnect_s: float = BRIDGE_SOCKET_RECONNECT_S):
+        super().__init__()
+        self.host = str(host or BRIDGE_SOCKET_HOST)
+        self.port = int(port or BRIDGE_SOCKET_PORT)
+        self.reconnect_s = max(0.05, float(reconnect_s))
+        self._sock = None
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._connected = threading.Event()
+        self._thread = None
+
+    def open(self) -> bool:
+        if self._thread and self._thread.is_alive():
+            return True
+        self._closed.clear()
+        self._thread = threading.Thread(target=self._reader_loop, name="BridgeSocket", daemon=True)
+        self._thread.start()
+        return True
+
+    def wait_connected(self, timeout_s: float) -> bool:
+        return self._connected.wait(timeout_s)
+
+    def is_connected(self) -> bool:
+        return self._connected.is_set()
+
+    def write_line(self, line: str) -> bool:
+        with self._lock:
+            sock = self._sock
+        if sock is None:
+            return False
+        try:
+            sock.sendall(line.encode("utf-8"))
+            return True
+        except OSError:
+            self._drop(sock)
+            return False
+
+    def close(self):
+        self._closed.set()
+        with self._lock:
+            sock = self._sock
+        if sock is not None:
+            self._drop(sock)
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def _drop(self, sock):
+        with self._lock:
+            if self._sock is sock:
+                self._sock = None
+                self._connected.clear()
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        try:
+            sock.close()
+        except OSError:
+            pass
+
+    def _connect(self):
+        try:
+            sock = socket.create_connection((self.host, self.port), timeout=1.0)
+        except OSError:
+            return None
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.settimeout(None)
+        with self._lock:
+            self._sock = sock
+            self._connected.set()
+        return sock
+
+    def _reader_loop(self):
+        while not self._closed.is_set():
+            sock = self._connect()
+            if sock is None:
+                self._closed.wait(self.reconnect_s)
+                continue
+            buf = b""
+            while not self._closed.is_set():
+                try:
+                    chunk = sock.recv(65536)
+                except OSError:
+                    chunk = b""
+                if not chunk:
+                    break
+                buf += chunk
+                while True:
+                    nl = buf.find(b"\n")
+                    if nl < 0:
+                        break
+                    raw = buf[:nl]
+                    buf = buf[nl + 1:]
+                    line = raw.decode("utf-8", "replace").strip()
+                    if line:
+                        self._emit_line(line)
+            self._drop(sock)
+
+
+# ===== Command futures =====
+BRIDGE_CALL_TIMEOUT_S = 2.5
+# Lines a notice stream holds for a consumer that is behind (see NoticeStream).
+NOTICE_STREAM_MAX = 32
+
+
+class CommandTimeout(TimeoutError):
+    pass
+
+
+class CommandCancelled(Exception):
+    """Thrown into a task's coroutine by CommandTask.cancel()."""
+
+
+class CommandFuture:
+    """Outcome of one bridge command: (ok, msg), or CommandTimeout when no ack arrives.
+
+    Callbacks run on the thread that settles the future (the GUI thread in the
+    overlay). Awaitable inside coroutines driven by spawn(); gather()/race()
+    combine futures and then() chains a follow-up step.
+    """
+
+    def __init__(self, cmd_id=None, name: str = ""):
+        self.cmd_id = cmd_id
+        self.name = name
+        self._done = False
+        self._result = None
+        self._exc = None
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def done(self) -> bool:
+        return self._done
+
+    def result(self):
+        if not self._done:
+            raise RuntimeError(f"{self.name or 'command'} still pending")
+        if self._exc is not None:
+            raise self._exc
+        return self._result
+
+    def exception(self):
+        return self._exc
+
+    def add_done_callback(self, fn):
+        with self._lock:
+            if not self._done:
+                self._callbacks.append(fn)
+                return
+        self._run(fn)
+
+    def _run(self, fn):
+        try:
+            fn(self)
+        except Exception:
+            pass
+
+    def _settle(self, result, exc) -> bool:
+        with self._lock:
+            if self._done:
+                return False
+            self._done = True
+            self._result = result
+            self._exc = exc
+            callbacks, self._callbacks = self._callbacks, []
+        for fn in callbacks:
+            self._run(fn)
+        return True
+
+    def set_result(self, result) -> bool:
+        return self._settle(result, None)
+
+    def set_exception(self, exc) -> bool:
+        return self._settle(None, exc)
+
+    def adopt(self, other: "CommandFuture"):
+        """Settle this future with whatever other settles with."""
+        other.add_done_callback(lambda f: self._settle(f._result, f._exc))
+
+    def then(self, fn) -> "CommandFuture":
+        """fn(result) runs on success; a returned future is waited on before the chain settles."""
+        out = CommandFuture(self.cmd_id, self.name)
+
+        def _step(f):
+            if f._exc is not None:
+                out.set_exception(f._exc)
+                return
+            try:
+                val = fn(f._result)
+            except Exception as exc:
+                out.set_exception(exc)
+                return
+            if isinstance(val, CommandFuture):
+                out.adopt(val)
+            else:
+                out.set_result(val)
+
+        self.add_done_callback(_step)
+        return out
+
+    def __await__(self):
+        while not self._done:
+            yield self
+        return self.result()
+
+
+def gather(futures) -> CommandFuture:
+    """Settles with the list of results, or with the first failure."""
+    futures = list(futures)
+    out = CommandFuture(name="gather")
+    results = [None] * len(futures)
+    left = [len(futures)]
+    if not futures:
+        out.set_result([])
+        return out
+
+    def _one(i):
+        def _cb(f):
+            if f._exc is not None:
+                out.set_exception(f._exc)
+                return
+            results[i] = f._result
+            left[0] -= 1
+            if left[0] == 0:
+                out.set_result(results)
+        return _cb
+
+    for i, fut in enumerate(futures):
+        fut.add_done_callback(_one(i))
+    return out
+
+
+def race(futures) -> CommandFuture:
+    """Settles like whichever future settles first; the tasks that lost are cancelled."""
+    futures = list(futures)
+    out = CommandFuture(name="race")
+
+    def _cb(f):
+        if not out._settle(f._result, f._exc):
+            return
+        for other in futures:
+            if other is not f and isinstance(other, CommandTask):
+                other.cancel()
+
+    for fut in futures:
+        fut.add_done_callback(_cb)
+    return out
+
+
+class CommandTask(CommandFuture):
+    """Drives a coroutine that awaits CommandFutures; settles with its return value."""
+
+    def __init__(self, coro):
+        super().__init__(name=getattr(coro, "__name__", "task"))
+        self._coro = coro
+        self._waiting = None
+        self._step(None, None)
+
+    def cancel(self) -> bool:
+        """Throws CommandCancelled into the coroutine where it awaits; False when already done."""
+        if self._done:
+            return False
+        self._waiting = None
+        self._step(None, CommandCancelled(f"{self.name} cancelled"))
+        return True
+
+    def _step(self, value, exc):
+        # Futures that are already settled are consumed here rather than through a
+        # callback, so a run of them does not nest one _step per await.
+        while True:
+            try:
+                if exc is not None:
+                    waited = self._coro.throw(exc)
+                else:
+                    waited = self._coro.send(value)
+            except StopIteration as stop:
+                self.set_result(stop.value)
+                return
+            except Exception as err:
+                self.set_exception(err)
+                return
+            if not isinstance(waited, CommandFuture):
+                value, exc = None, TypeError(f"{self.name} awaited {type(waited).__name__}, not a CommandFuture")
+                continue
+            if waited._done:
+                value, exc = waited._result, waited._exc
+                continue
+            self._waiting = waited
+            waited.add_done_callback(self._wake)
+            return
+
+    def _wake(self, fut: CommandFuture):
+        # A cancelled task has moved on from the future it was waiting on.
+        if fut is not self._waiting:
+            return
+        self._waiting = None
+        if fut._exc is not None:
+            self._step(None, fut._exc)
+        else:
+            self._step(fut._result, None)
+
+
+def spawn(coro) -> CommandTask:
+    return CommandTask(coro)
+
+
+def _notice_key(line: str) -> str:
+    # State payloads (PLAYERS=..., WEAPONSTATE=...) supersede each other; other lines only repeat.
+    head, sep, _ = line.partition("=")
+    return head if sep and "|" not in head else line
+
+
+class NoticeStream:
+    """Notice lines for one consumer: async for line in bridge.notices(...).
+
+    Bounded instead of growing behind a slow consumer: a queued line with the
+    same key (the part before '=' for state payloads, the whole line otherwise)
+    is replaced in place by the newer one, and past maxlen the oldest line is
+    dropped. __anext__ returns a CommandFuture, so it is consumed from spawn()ed
+    coroutines like the bridge calls.
+    """
+
+    def __init__(self, bridge, prefixes=None, maxlen: int = NOTICE_STREAM_MAX):
+        self._bridge = bridge
+        self.prefixes = tuple(prefixes) if prefixes else None
+        self.maxlen = max(1, int(maxlen))
+        self._queue: list[str] = []
+        self._waiter = None
+        self.closed = False
+        self.delivered = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.max_depth = 0
+
+    def matches(self, line: str) -> bool:
+        return self.prefixes is None or line.startswith(self.prefixes)
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def put(self, line: str):
+        if self.closed:
+            return
+        waiter = self._waiter
+        if waiter is not None:
+            self._waiter = None
+            self.delivered += 1
+            waiter.set_result(line)
+            return
+        queue = self._queue
+        key = _notice_key(line)
+        for i, queued in enumerate(queue):
+            if _notice_key(queued) == key:
+                queue[i] = line
+                self.coalesced += 1
+                return
+        queue.append(line)
+        if len(queue) > self.maxlen:
+            del queue[0]
+            self.dropped += 1
+        self.max_depth = max(self.max_depth, len(queue))
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self) -> CommandFuture:
+        fut = CommandFuture(name="notice")
+        if self._queue:
+            self.delivered += 1
+            fut.set_result(self._queue.pop(0))
+        elif self.closed:
+            fut.set_exception(StopAsyncIteration())
+        else:
+            self._waiter = fut
+        return fut
+
+    def close(self):
+        """Ends the consumer's async for once the queued lines are read."""
+        if self.closed:
+            return
+        self.closed = True
+        self._bridge._drop_stream(self)
+        waiter, self._waiter = self._waiter, None
+        if waiter is not None:
+            waiter.set_exception(StopAsyncIteration())
+
+
+class CommandBridge:
+    def __init__(self, cmd_path: str, transport: BridgeTransport | None = None):
+        self.cmd_path = str(cmd_path or "")
+        self._cmd_id = 1
+        self._file = FileTransport(self.cmd_path)
+        self.transport = transport or self._file
+        self.last_transport = ""
+        self._pending: dict[str, tuple[float, CommandFuture]] = {}
+        self._pending_lock = threading.Lock()
+        self.timeouts = 0
+        self._streams: list[NoticeStream] = []
+
+    def open(self) -> bool:
+        return self.transport.open()
+
+    def close(self):
+        for stream in list(self._streams):
+            stream.close()
+        try:
+            self.transport.close()
+        except Exception:
+            pass
+
+    # ----- notices -----
+    def notices(self, prefixes=None, maxlen: int = NOTICE_STREAM_MAX) -> NoticeStream:
+        """A stream of published notice lines (only those starting with prefixes, if given)."""
+        stream = NoticeStream(self, prefixes, maxlen)
+        self._streams.append(stream)
+        return stream
+
+    def publish(self, line: str) -> int:
+        """Hands a notice line to every matching stream; returns how many took it."""
+        taken = 0
+        for stream in list(self._streams):
+            if stream.matches(line):
+                stream.put(line)
+                taken += 1
+        return taken
+
+    def _drop_stream(self, stream: NoticeStream):
+        if stream in self._streams:
+            self._streams.remove(stream)
+
+    def set_line_handler(self, cb):
+        self.transport.set_line_handler(cb)
+
+    def _write(self, line: str) -> bool:
+        if self.transport.write_line(line):
+            self.last_transport = self.transport.name
+            return True
+        # Socket peer not reachable (no luasocket in game): fall back to the file queue.
+        if self.transport is not self._file and self._file.write_line(line):
+            self.last_transport = self._file.name
+            return True
+        return False
+
+    def send(self, name: str, arg: str = "") -> int | None:
+        try:
+            cmd = str(name or "").strip().lower()
+            if not cmd:
+                return None
+            cmd_id = int(self._cmd_id)
+            self._cmd_id += 1
+            return cmd_id if self._write(format_cmd_line(cmd_id, cmd, arg)) else None
+        except Exception:
+            return None
+
+    def send_batch(self, commands) -> int | None:
+        """Sends (name, arg) pairs as one frame; the peer answers with one ack."""
+        try:
+            cmds = [(str(name or "").strip().lower(), arg) for name, arg in commands]
+            cmds = [(name, arg) for name, arg in cmds if name]
+            if not cmds:
+                return None
+            cmd_id = int(self._cmd_id)
+            self._cmd_id += 1
+            return cmd_id if self._write(format_batch_line(cmd_id, cmds)) else None
+        except Exception:
+            return None
+
+    # ----- futures -----
+    def _track(self, cmd_id, name: str, timeout_s: float) -> CommandFuture:
+        fut = CommandFuture(cmd_id, name)
+        if not cmd_id:
+            fut.set_exception(ConnectionError(f"{name}: command not sent"))
+            return fut
+        with self._pending_lock:
+            self._pending[str(cmd_id)] = (time.monotonic() + float(timeout_s), fut)
+        return fut
+
+    def call(self, name: str, arg: str = "", timeout_s: float = BRIDGE_CALL_TIMEOUT_S) -> CommandFuture:
+        """Sends a command; the future settles from resolve() or fails in expire()."""
+        return self._track(self.send(name, arg), str(name or ""), timeout_s)
+
+    def call_batch(self, commands, timeout_s: float = BRIDGE_CALL_TIMEOUT_S) -> CommandFuture:
+        """Like call, for a batch; settles with one (ok, msg) per command, in order."""
+        commands = list(commands)
+        fut = self._track(self.send_batch(commands), BATCH_CMD, timeout_s)
+
+        def _split(res):
+            results = parse_batch_results(res[1])
+            if len(results) != len(commands):
+                # Peers without batch support answer the frame as one unknown command.
+                raise ValueError(f"{BATCH_CMD} #{fut.cmd_id}: {len(results)} results, {len(commands)} sent")
+            return results
+
+        return fut.then(_split)
+
+    def resolve(self, ack_id, ok: bool, msg: str) -> bool:
+        """Settles the future waiting on ack_id; False for acks nobody is waiting on."""
+        with self._pending_lock:
+            entry = self._pending.pop(str(ack_id), None)
+        if entry is None:
+            return False
+        entry[1].set_result((bool(ok), msg))
+        return True
+
+    def expire(self, now: float | None = None) -> int:
+        now = time.monotonic() if now is None else now
+        with self._pending_lock:
+            stale = [k for k, v in self._pending.items() if v[0] <= now]
+            futures = [self._pending.pop(k)[1] for k in stale]
+        for fut in futures:
+            self.timeouts += 1
+            fut.set_exception(CommandTimeout(f"{fut.name} #{fut.cmd_id}: no ack"))
+        return len(futures)
+
+    def next_deadline(self) -> float | None:
+        with self._pending_lock:
+            if not self._pending:
+                return None
+            return min(v[0] for v in self._pending.values())
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+
+def make_transport(kind: str, cmd_path: str) -> BridgeTransport:
+    kind = str(kind or "").strip().lower()
+    if kind == "socket":
+        port = os.environ.get("BLACKBOX_BRIDGE_PORT", "")
+        try:
+            port_n = int(port) if port else BRIDGE_SOCKET_PORT
+        except ValueError:
+            port_n = BRIDGE_SOCKET_PORT
+        return SocketTransport(BRIDGE_SOCKET_HOST, port_n)
+    return FileTransport(cmd_path)
+
+
+# ===== Command pipeline =====
+# Queries are correlated by cmd_id, so several can be outstanding at once. The
+# window bounds how many the overlay keeps in flight.
+BRIDGE_WINDOW = 4
+
+# Priority classes. User actions are sent at once and never wait on the window;
+# state queries come next; bulk/polled queries are paced hardest and leave one
+# window slot free for state queries.
+PRIO_INTERACTIVE = 0
+PRIO_STATE = 1
+PRIO_BULK = 2
+PRIO_NAMES = {PRIO_INTERACTIVE: "interactive", PRIO_STATE: "state", PRIO_BULK: "bulk"}
+# Token bucket per pipelined class: sustained issues per second and burst size.
+# Classes without a rate are unpaced; interactive commands skip the pipeline.
+PRIO_RATE_HZ = {PRIO_STATE: 20.0, PRIO_BULK: 4.0}
+PRIO_BURST = {PRIO_STATE: 8, PRIO_BULK: 2}
+
+# Read-only queries the overlay issues in the background. Lua (and the stand-in
+# peer) run every other command in a poll before these; keep in sync with main.lua.
+BACKGROUND_COMMANDS = frozenset((
+    "listplayers_gui",
+    "tp_gui_state",
+    "puzzlestate",
+    "contract_gui_state",
+    "weapon_gui_state",
+    "world_registry_scan",
+    "state_snapshot",
+    "bridge_proto",
+    "subscribe",
+))
+
+
+def command_is_background(line: str) -> bool:
+    parts = str(line or "").split("|", 3)
+    name = parts[2] if len(parts) > 2 and parts[0] == "CMD" else (parts[0] if parts else "")
+    name = name.strip().lower()
+    if name == BATCH_CMD:
+        # A batch waits behind user actions only when everything in it is a query.
+        cmds = parse_batch_arg(parts[3] if len(parts) > 3 else "")
+        return bool(cmds) and all(n in BACKGROUND_COMMANDS for n, _ in cmds)
+    return name in BACKGROUND_COMMANDS
+
+
+def order_command_batch(lines) -> list:
+    """User actions first, then background queries, each kept in arrival order."""
+    front = []
+    back = []
+    for line in lines:
+        (back if command_is_background(line) else front).append(line)
+    return front + back
+
+
+class CommandPipeline:
+    """Keyed query scheduler with priority classes and a bounded in-flight window.
+
+    request(key) queues a registered query and returns a future for its answer;
+    requests for a key that is already queued share one future (coalesced). pump()
+    issues the highest-priority ready key while fewer than `window` are outstanding
+    and its class is not being paced. A key is never in flight twice; asking again
+    while it is outstanding re-issues it after the ack so the answer reflects the
+    latest request. `call` is CommandBridge.call.
+
+    With `call_batch` (CommandBridge.call_batch), every key a pump finds ready goes
+    out as one batch frame, which takes one window slot. request_many() queues
+    several keys before pumping so they share a frame.
+    """
+
+    def __init__(self, call, window: int = BRIDGE_WINDOW, rates: dict | None = None,
+                 bursts: dict | None = None, call_batch=None, clock=time.monotonic):
+        self._call = call
+        self._call_batch = call_batch
+        self._clock = clock
+        self.window = max(1, int(window))
+        self.rates = dict(PRIO_RATE_HZ if rates is None else rates)
+        self.bursts = dict(PRIO_BURST if bursts is None else bursts)
+        self.queries: dict[str, tuple] = {}
+        self.queue: list[str] = []
+        self.waiting: dict[str, CommandFuture] = {}
+        self.inflight: dict[str, CommandFuture] = {}
+        self.issued = 0
+        self.completed = 0
+        self.expired = 0
+        self.coalesced = 0
+        self.frames = 0
+        self.batched = 0
+        self.issued_by_class: dict[int, int] = {}
+        self.last_rtt: dict[str, float] = {}
+        self._buckets: dict[int, tuple[float, float]] = {}
+        self._pumping = False
+
+    def register(self, key: str, name: str, handler, timeout_s: float, arg_fn=None,
+                 priority: int = PRIO_STATE):
+        """handler(ok, msg) runs once per answered query, before any awaiting caller."""
+        self.queries[key] = (name, arg_fn, handler, float(timeout_s), int(priority))
+
+    def busy(self, key: str) -> bool:
+        return key in self.inflight
+
+    def _enqueue(self, key: str) -> CommandFuture:
+        if key not in self.queries:
+            fut = CommandFuture(name=key)
+            fut.set_exception(KeyError(key))
+            return fut
+        fut = self.waiting.get(key)
+        if fut is None:
+            fut = CommandFuture(name=key)
+            self.waiting[key] = fut
+            self.queue.append(key)
+        else:
+            self.coalesced += 1
+        return fut
+
+    def request(self, key: str) -> CommandFuture:
+        fut = self._enqueue(key)
+        self.pump()
+        return fut
+
+    def request_many(self, keys) -> list:
+        futures = [self._enqueue(key) for key in keys]
+        self.pump()
+        return futures
+
+    def _issue(self, keys: list):
+        commands = []
+        waiters = []
+        timeout_s = 0.0
+        for key in keys:
+            name, arg_fn, _, key_timeout_s, prio = self.queries[key]
+            try:
+                arg = arg_fn() if arg_fn else ""
+            except Exception:
+                arg = ""
+            commands.append((name, arg))
+            waiters.append(self.waiting.pop(key))
+            timeout_s = max(timeout_s, key_timeout_s)
+            self.issued += 1
+            self.issued_by_class[prio] = self.issued_by_class.get(prio, 0) + 1
+        sent_at = self._clock()
+        if len(commands) == 1:
+            call = self._call(commands[0][0], commands[0][1], timeout_s)
+        else:
+            call = self._call_batch(commands, timeout_s)
+            self.batched += 1
+        self.frames += 1
+        for key in keys:
+            self.inflight[key] = call
+        call.add_done_callback(lambda f: self._finish(keys, f, waiters, sent_at))
+
+    def _finish(self, keys: list, call: CommandFuture, waiters: list, sent_at: float):
+        for key in keys:
+            if self.inflight.get(key) is call:
+                del self.inflight[key]
+        exc = call.exception()
+        if exc is None:
+            results = call.result() if len(keys) > 1 else [call.result()]
+            rtt = self._clock() - sent_at
+            # Handlers run in frame order, so a batch applies players before tp and so on.
+            for key, waiter, res in zip(keys, waiters, results):
+                self.completed += 1
+                self.last_rtt[key] = rtt
+                handler = self.queries[key][2]
+                if handler is not None:
+                    try:
+                        handler(*res)
+                    except Exception:
+                        pass
+                waiter.set_result(res)
+        else:
+            for waiter in waiters:
+                if isinstance(exc, CommandTimeout):
+                    self.expired += 1
+                waiter.set_exception(exc)
+        self.pump()
+
+    def inflight_frames(self) -> int:
+        return len({id(call) for call in self.inflight.values()})
+
+    def _tokens(self, prio: int, now: float) -> float | None:
+        """Token count for a class as of now; None when the class is unpaced."""
+        rate = self.rates.get(prio, 0.0)
+        if rate <= 0:
+            return None
+        burst = float(max(1, self.bursts.get(prio, 1)))
+        bucket = self._buckets.get(prio)
+        if bucket is None:
+            return burst
+        tokens, last = bucket
+        return min(burst, tokens + (now - last) * rate)
+
+    def _charge(self, prio: int, now: float):
+        tokens = self._tokens(prio, now)
+        if tokens is None:
+            self._buckets.pop(prio, None)
+        else:
+            self._buckets[prio] = (tokens - 1.0, now)
+
+    def _next_key(self, now: float) -> str | None:
+        best = None
+        best_prio = None
+        for key in self.queue:
+            if key in self.inflight:
+                continue
+            prio = self.queries[key][4]
+            if best_prio is not None and prio >= best_prio:
+                continue
+            tokens = self._tokens(prio, now)
+            if tokens is not None and tokens < 1.0:
+                continue
+            if prio >= PRIO_BULK and self.window > 1 and self.inflight_frames() >= self.window - 1:
+                continue
+            best, best_prio = key, prio
+        return best
+
+    def next_ready(self) -> float | None:
+        """When a class that is only waiting on its pace becomes ready again."""
+        now = self._clock()
+        times = []
+        for prio in {self.queries[k][4] for k in self.queue if k not in self.inflight}:
+            tokens = self._tokens(prio, now)
+            if tokens is not None and tokens < 1.0:
+                times.append(now + (1.0 - tokens) / self.rates[prio])
+        return min(times) if times else None
+
+    def pump(self) -> int:
+        # Settling a call can re-enter pump (handlers request more); the outer loop picks that up.
+        if self._pumping:
+            return 0
+        self._pumping = True
+        started = 0
+        try:
+            while self.inflight_frames() < self.window:
+                now = self._clock()
+                keys = []
+                while True:
+                    key = self._next_key(now)
+                    if key is None:
+                        break
+                    self.queue.remove(key)
+                    self._charge(self.queries[key][4], now)
+                    keys.append(key)
+                    if self._call_batch is None:
+                        break
+                if not keys:
+                    break
+                self._issue(keys)
+                started += len(keys)
+        finally:
+            self._pumping = False
+        return started
+
+
+# ===== Tail reader =====
+TAIL_HEAD_BYTES = 32
+TAIL_INITIAL_BUFFER = 64 * 1024
+
+
+class TailReader:
+    """Reads only what was appended to a file since the last call.
+
+    Keeps (size, mtime, offset) per file so an unchanged file costs one stat. New
+    bytes go into a reusable buffer; only complete lines are consumed. Truncation,
+    rotation (new inode) or a rewritten head restart the read from offset 0.
+    """
+
+    def __init__(self, path: str):
+        self.path = str(path or "")
+        self.offset = 0
+        self.size = -1
+        self.mtime_ns = -1
+        self.inode = None
+        self.head = b""
+        self.resets = 0
+        self.bytes_read = 0
+        self.last_line = ""
+        self._buf = bytearray(TAIL_INITIAL_BUFFER)
+
+    def _changed(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        if st.st_size == self.size and st.st_mtime_ns == self.mtime_ns and st.st_ino == self.inode:
+            return None
+        return st
+
+    def _read_range(self, f, start: int, end: int) -> memoryview:
+        n = max(0, end - start)
+        if n > len(self._buf):
+            self._buf = bytearray(max(n, len(self._buf) * 2))
+        view = memoryview(self._buf)[:n]
+        f.seek(start)
+        got = f.readinto(view) or 0
+        self.bytes_read += got
+        return view[:got]
+
+    def _reset(self):
+        self.offset = 0
+        self.head = b""
+        self.resets += 1
+
+    def _read_appended(self):
+        """View of the bytes appended since the last call, or None when unchanged."""
+        st = self._changed()
+        if st is None:
+            return None
+        try:
+            with open(self.path, "rb") as f:
+                if st.st_size < self.offset or (self.inode is not None and st.st_ino != self.inode):
+                    self._reset()
+                elif self.head:
+                    cur = self._read_range(f, 0, min(len(self.head), st.st_size)).tobytes()
+                    if cur != self.head:
+                        self._reset()
+                chunk = self._read_range(f, self.offset, st.st_size)
+                if self.offset == 0 and len(self.head) < TAIL_HEAD_BYTES:
+                    self.head = bytes(chunk[:TAIL_HEAD_BYTES])
+        except OSError:
+            return None
+        self.size = st.st_size
+        self.mtime_ns = st.st_mtime_ns
+        self.inode = st.st_ino
+        return chunk
+
+    def read_lines(self) -> list[str] | None:
+        """Complete lines appended since the last call, or None when the file is unchanged."""
+        chunk = self._read_appended()
+        if chunk is None:
+            return None
+        got = len(chunk)
+        chunk.release()
+        end = self._buf.rfind(b"\n", 0, got) + 1
+        if end <= 0:
+            return []
+        self.offset += end
+        lines = []
+        with memoryview(self._buf) as view:
+            text = str(view[:end], "utf-8", "replace")
+        for raw in text.split("\n"):
+            raw = raw.strip()
+            if raw:
+                lines.append(raw)
+        if lines:
+            self.last_line = lines[-1]
+        return lines
+
+    def read_frames(self) -> list | None:
+        """Complete length-prefixed frames appended since the last call, or None when unchanged.
+
+        Frame bodies are views into the reusable buffer; consume them before the next read.
+        """
+        chunk = self._read_appended()
+        if chunk is None:
+            return None
+        frames, used = split_frames(chunk)
+        self.offset += used
+        return frames
+
+    def read_snapshot(self) -> str | None:
+        """Last non-empty line of a file rewritten in place, or None when unchanged."""
+        st = self._changed()
+        if st is None:
+            return None
+        try:
+            with open(self.path, "rb") as f:
+                chunk = self._read_range(f, 0, st.st_size)
+                text = str(chunk, "utf-8", "replace")
+                chunk.release()
+        except OSError:
+            return None
+        self.size = st.st_size
+        self.mtime_ns = st.st_mtime_ns
+        self.inode = st.st_ino
+        line = ""
+        for raw in text.splitlines():
+            if raw.strip():
+                line = raw.strip()
+        self.last_line = line
+        return line
+
+
+# ===== Journal =====
+# Ack/notice/registry files are append-only journals: J|<epoch>|<seq>|<payload>\n.
+# seq increases by one per record; epoch changes when the Lua side restarts. When a
+# journal grows past JOURNAL_MAX_BYTES the writer moves it to <path>.1 and starts over.
+JOURNAL_TAG = "J"
+JOURNAL_MAX_BYTES = 256 * 1024
+JOURNAL_ROTATED_SUFFIX = ".1"
+
+
+def format_journal_line(epoch: str, seq: int, payload: str) -> str:
+    text = str(payload or "").replace("\r", " ").replace("\n", " ")
+    return f"{JOURNAL_TAG}|{epoch}|{int(seq)}|{text}\n"
+
+
+def parse_journal_line(line: str) -> tuple[str, int, str] | None:
+    parts = str(line or "").rstrip("\r\n").split("|", 3)
+    if len(parts) < 4 or parts[0] != JOURNAL_TAG:
+        return None
+    try:
+        seq = int(parts[2])
+    except ValueError:
+        return None
+    return parts[1], seq, parts[3]
+
+
+class JournalWriter:
+    """Python reference for the Lua journal writer (used by the stand-in peer)."""
+
+    def __init__(self, path: str, epoch: str | None = None, max_bytes: int = JOURNAL_MAX_BYTES):
+        self.path = str(path or "")
+        self.epoch = str(epoch or int(time.time()))
+        self.max_bytes = max(1024, int(max_bytes))
+        self.seq = 0
+        self._bytes = 0
+        self._started = False
+
+    def append(self, payload: str) -> int:
+        if not self._started:
+            self._started = True
+            try:
+                os.remove(self.path + JOURNAL_ROTATED_SUFFIX)
+            except OSError:
+                pass
+            with open(self.path, "w", encoding="utf-8", newline="\n"):
+                pass
+        if self._bytes >= self.max_bytes:
+            self.rotate()
+        self.seq += 1
+        line = format_journal_line(self.epoch, self.seq, payload)
+        with open(self.path, "a", encoding="utf-8", newline="\n") as f:
+            f.write(line)
+        self._bytes += len(line)
+        return self.seq
+
+    def rotate(self):
+        rotated = self.path + JOURNAL_ROTATED_SUFFIX
+        try:
+            os.replace(self.path, rotated)
+            self._bytes = 0
+        except OSError:
+            pass
+
+
+class JournalReader:
+    """Delivers each journal record exactly once, in seq order.
+
+    The cursor is (epoch, seq). Records at or below the cursor are skipped; a gap
+    after rotation is filled from <path>.1. Lines without the J| prefix (older Lua
+    builds) are delivered when the last line changes.
+    """
+
+    def __init__(self, path: str, prime: bool = True):
+        self.path = str(path or "")
+        self.epoch = ""
+        self.seq = 0
+        self.delivered = 0
+        self.recovered = 0
+        self.lost = 0
+        self._legacy_last = ""
+        self._tail = TailReader(self.path)
+        self._priming = False
+        if prime:
+            # Skip whatever is already on disk; only records written from now on are delivered.
+            self._priming = True
+            self.read_new()
+            self._priming = False
+            self.delivered = 0
+
+    @staticmethod
+    def _parse(lines) -> tuple[list, str]:
+        records = []
+        legacy = ""
+        for raw in lines:
+            rec = parse_journal_line(raw)
+            if rec is None:
+                legacy = raw
+                continue
+            records.append(rec)
+        return records, legacy
+
+    def _read_rotated(self) -> list:
+        try:
+            with open(self.path + JOURNAL_ROTATED_SUFFIX, "r", encoding="utf-8", errors="replace") as f:
+                data = f.read()
+        except OSError:
+            return []
+        return self._parse(line.strip() for line in data.splitlines() if line.strip())[0]
+
+    def _pull(self) -> tuple[list, str] | None:
+        lines = self._tail.read_lines()
+        if not lines:
+            return None
+        return self._parse(lines)
+
+    def _deliver(self, payload):
+        return payload
+
+    def _advance(self, seq: int):
+        # Records skipped between the cursor and seq are gone (rotated out twice).
+        if self.seq > 0 and seq > self.seq + 1:
+            self.lost += seq - self.seq - 1
+        self.seq = seq
+
+    def read_new(self) -> list:
+        if not self.path:
+            return []
+        pulled = self._pull()
+        if not pulled:
+            return []
+        records, legacy = pulled
+        if not records:
+            if legacy and legacy != self._legacy_last:
+                self._legacy_last = legacy
+                self.delivered += 1
+                return [legacy]
+            return []
+
+        out = []
+        first_epoch, first_seq, _ = records[0]
+        if first_epoch != self.epoch:
+            # Lua side restarted: take the new journal from its start.
+            self.epoch = first_epoch
+            self.seq = 0
+        if first_seq > self.seq + 1:
+            for epoch, seq, payload in self._read_rotated():
+                if epoch == self.epoch and self.seq < seq < first_seq:
+                    out.append(self._deliver(payload))
+                    self._advance(seq)
+                    self.recovered += 1
+        for epoch, seq, payload in records:
+            if epoch != self.epoch or seq <= self.seq:
+                continue
+            out.append(self._deliver(payload))
+            self._advance(seq)
+        self.delivered += len(out)
+        return out
+
+
+# Binary journals hold length-prefixed frames: u32 len | u32 epoch | u32 seq | body,
+# where len counts epoch + seq + body. Same cursor and rotation rules as text.
+_FRAME_HEAD = struct.Struct("<III")
+
+
+def split_frames(mv: memoryview) -> tuple[list, int]:
+    """Complete (epoch, seq, body view) frames in mv and the bytes they span."""
+    frames = []
+    off = 0
+    end = len(mv)
+    while off + _FRAME_HEAD.size <= end:
+        size, epoch, seq = _FRAME_HEAD.unpack_from(mv, off)
+        stop = off + 4 + size
+        if size < 8 or stop > end:
+            break
+        frames.append((str(epoch), seq, mv[off + _FRAME_HEAD.size:stop]))
+        off = stop
+    return frames, off
+
+
+def pack_frame(epoch: int, seq: int, body: bytes) -> bytes:
+    return _FRAME_HEAD.pack(len(body) + 8, int(epoch) & 0xFFFFFFFF, int(seq) & 0xFFFFFFFF) + body
+
+
+class BinaryJournalWriter(JournalWriter):
+    """Python reference for the Lua binary journal writer."""
+
+    def append(self, body: bytes) -> int:
+        if not self._started:
+            self._started = True
+            try:
+                os.remove(self.path + JOURNAL_ROTATED_SUFFIX)
+            except OSError:
+                pass
+            with open(self.path, "wb"):
+                pass
+        if self._bytes >= self.max_bytes:
+            self.rotate()
+        self.seq += 1
+        frame = pack_frame(int(self.epoch), self.seq, bytes(body))
+        with open(self.path, "ab") as f:
+            f.write(frame)
+        self._bytes += len(frame)
+        return self.seq
+
+
+class BinaryJournalReader(JournalReader):
+    """JournalReader over length-prefixed frames; decode(body_view) runs in delivery order."""
+
+    def __init__(self, path: str, decode=None, prime: bool = True):
+        self._decode = decode or (lambda body: bytes(body))
+        self.errors = 0
+        super().__init__(path, prime=prime)
+
+    def _pull(self) -> tuple[list, str] | None:
+        frames = self._tail.read_frames()
+        if not frames:
+            return None
+        return frames, ""
+
+    def _read_rotated(self) -> list:
+        try:
+            with open(self.path + JOURNAL_ROTATED_SUFFIX, "rb") as f:
+                data = f.read()
+        except OSError:
+            return []
+        return split_frames(memoryview(data))[0]
+
+    def _deliver(self, payload):
+        if self._priming:
+            return None
+        try:
+            return self._decode(payload)
+        except Exception:
+            self.errors += 1
+            return None
+
+    def read_new(self) -> list:
+        return [v for v in super().read_new() if v is not None]
+
+
+# ===== State block =====
+# bridge_state.bin mirrors the STATE= line in a fixed layout that the overlay maps
+# into memory. Header: magic | u16 version | u16 size | u32 seq. seq is a seqlock:
+# the writer makes it odd, writes the body, then makes it even again; readers copy
+# the body and retry when seq was odd or moved underneath them.
+STATE_BLOCK_MAGIC = b"BBST"
+STATE_BLOCK_VERSION = 2
+STATE_BLOCK_RETRIES = 8
+STATE_BLOCK_REOPEN_S = 1.0
+_STATE_HEAD = struct.Struct("<4sHHI")
+_STATE_SEQ = struct.Struct("<I")
+_STATE_SEQ_OFFSET = 8
+_STATE_BODY = struct.Struct("<BBBBBBxxIIIIIIIIdddBxxxfff64sHH")
+STATE_BLOCK_SIZE = _STATE_HEAD.size + _STATE_BODY.size
+
+_STATE_FLAGS = ("WORLD", "PAWN", "RADAR", "PANEL")
+_STATE_INTS = ("PROTO", "PROTOACT", "REGTOTAL", "MON", "KEY", "DISK", "BLACK", "WEAPON", "MONEY", "PUZZLES")
+_STATE_CLOCKS = ("EMIT", "PRUNE", "STATEWRITE")
+_STATE_SHORTS = ("POLLMS", "CMDWAIT")
+
+
+def _state_int(data: dict, key: str) -> int:
+    try:
+        return int(float(data.get(key, 0) or 0)) & 0xFFFFFFFF
+    except Exception:
+        return 0
+
+
+def _state_float(data: dict, key: str) -> float:
+    try:
+        return float(data.get(key, 0) or 0)
+    except Exception:
+        return 0.0
+
+
+def pack_state_block(data: dict, self_pos=None) -> bytes:
+    """Body bytes for a STATE dict (same keys and string values as the text line)."""
+    flags = [1 if str(data.get(k, "0")) == "1" else 0 for k in _STATE_FLAGS]
+    ints = [_state_int(data, k) for k in _STATE_INTS]
+    clocks = [_state_float(data, k) for k in _STATE_CLOCKS]
+    if self_pos:
+        pos = [1, float(self_pos.get("x", 0)), float(self_pos.get("y", 0)), float(self_pos.get("z", 0))]
+    else:
+        pos = [0, 0.0, 0.0, 0.0]
+    map_name = str(data.get("MAP", "") or "").encode("utf-8")[:64]
+    shorts = [min(_state_int(data, k), 0xFFFF) for k in _STATE_SHORTS]
+    return _STATE_BODY.pack(*flags, *ints, *clocks, *pos, map_name, *shorts)
+
+
+def unpack_state_block(body) -> tuple[dict, dict | None]:
+    vals = _STATE_BODY.unpack(body)
+    data = {}
+    for i, key in enumerate(_STATE_FLAGS):
+        data[key] = "1" if vals[i] else "0"
+    base = len(_STATE_FLAGS)
+    for i, key in enumerate(_STATE_INTS):
+        data[key] = str(vals[base + i])
+    base += len(_STATE_INTS)
+    for i, key in enumerate(_STATE_CLOCKS):
+        data[key] = f"{vals[base + i]:.3f}"
+    base += len(_STATE_CLOCKS)
+    self_pos = None
+    if vals[base]:
+        self_pos = {"x": vals[base + 1], "y": vals[base + 2], "z": vals[base + 3]}
+    data["MAP"] = vals[base + 4].rstrip(b"\0").decode("utf-8", "replace")
+    base += 5
+    for i, key in enumerate(_STATE_SHORTS):
+        data[key] = str(vals[base + i])
+    return data, self_pos
+
+
+class StateBlockWriter:
+    """Python reference for the Lua state block writer (stand-in peer, benchmarks)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.seq = 0
+        self._file = None
+        self._mm = None
+
+    def _open(self):
+        if self._mm is not None:
+            return self._mm
+        try:
+            f = open(self.path, "r+b")
+        except OSError:
+            f = None
+        if f is not None:
+            head = f.read(_STATE_HEAD.size)
+            ok = False
+            if len(head) == _STATE_HEAD.size and os.fstat(f.fileno()).st_size == STATE_BLOCK_SIZE:
+                magic, version, size, seq = _STATE_HEAD.unpack(head)
+                if magic == STATE_BLOCK_MAGIC and version == STATE_BLOCK_VERSION and size == STATE_BLOCK_SIZE:
+                    self.seq = (seq + (seq & 1)) & 0xFFFFFFFF
+                    ok = True
+            if not ok:
+                f.close()
+                f = None
+        if f is None:
+            f = open(self.path, "w+b")
+            self.seq = 0
+            f.write(_STATE_HEAD.pack(STATE_BLOCK_MAGIC, STATE_BLOCK_VERSION, STATE_BLOCK_SIZE, 0))
+            f.write(bytes(_STATE_BODY.size))
+            f.flush()
+        self._file = f
+        self._mm = mmap.mmap(f.fileno(), STATE_BLOCK_SIZE)
+        return self._mm
+
+    def write(self, data: dict, self_pos=None) -> int:
+        mm = self._open()
+        body = pack_state_block(data, self_pos)
+        self.seq = (self.seq + 1) & 0xFFFFFFFF
+        _STATE_SEQ.pack_into(mm, _STATE_SEQ_OFFSET, self.seq)
+        mm[_STATE_HEAD.size:STATE_BLOCK_SIZE] = body
+        self.seq = (self.seq + 1) & 0xFFFFFFFF
+        _STATE_SEQ.pack_into(mm, _STATE_SEQ_OFFSET, self.seq)
+        return self.seq
+
+    def close(self):
+        for obj in (self._mm, self._file):
+            try:
+                if obj is not None:
+                    obj.close()
+            except Exception:
+                pass
+        self._mm = None
+        self._file = None
+
+
+class StateBlockReader:
+    """Seqlock reader over a read-only mapping; polling is a couple of memory loads."""
+
+    def __init__(self, path: str, retries: int = STATE_BLOCK_RETRIES):
+        self.path = path
+        self.retries = max(1, int(retries))
+        self.seq = 0
+        self.data: dict = {}
+        self.self_pos = None
+        self.snapshots = 0
+        self.torn = 0
+        self._file = None
+        self._mm = None
+        self._next_open = 0.0
+
+    @property
+    def mapped(self) -> bool:
+        return self._mm is not None
+
+    def _open(self) -> bool:
+        now = time.monotonic()
+        if now < self._next_open:
+            return False
+        self._next_open = now + STATE_BLOCK_REOPEN_S
+        try:
+            f = open(self.path, "rb")
+        except OSError:
+            return False
+        try:
+            if os.fstat(f.fileno()).st_size < STATE_BLOCK_SIZE:
+                f.close()
+                return False
+            mm = mmap.mmap(f.fileno(), STATE_BLOCK_SIZE, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            f.close()
+            return False
+        magic, version, size, _ = _STATE_HEAD.unpack_from(mm, 0)
+        if magic != STATE_BLOCK_MAGIC or version != STATE_BLOCK_VERSION or size != STATE_BLOCK_SIZE:
+            mm.close()
+            f.close()
+            return False
+        self._file = f
+        self._mm = mm
+        return True
+
+    def close(self):
+        for obj in (self._mm, self._file):
+            try:
+                if obj is not None:
+                    obj.close()
+            except Exception:
+                pass
+        self._mm = None
+        self._file = None
+
+    def read(self) -> dict | None:
+        """STATE dict when the writer published a new snapshot, else None."""
+        if self._mm is None and not self._open():
+            return None
+        mm = self._mm
+        seq_at = _STATE_SEQ.unpack_from
+        for _ in range(self.retries):
+            (seq,) = seq_at(mm, _STATE_SEQ_OFFSET)
+            if seq == self.seq:
+                return None
+            if seq & 1:
+                self.torn += 1
+                continue
+            body = mm[_STATE_HEAD.size:STATE_BLOCK_SIZE]
+            (again,) = seq_at(mm, _STATE_SEQ_OFFSET)
+            if again != seq:
+                self.torn += 1
+                continue
+            self.seq = seq
+            self.data, self.self_pos = unpack_state_block(body)
+            self.snapshots += 1
+            return self.data
+        return None
@@ -0,0 +1,226 @@
+"""Binary world frames (PROTO 3).
+
+Same keyframe/delta stream as the WORLDK=/WORLDD= text lines, but typed and
+length-prefixed so names survive any character and Python can decode with
+struct.unpack_from over a memoryview. All integers are little-endian.
+
+  frame   u8 kind (1 keyframe, 2 delta) | u32 kf | u32 seq
+          u8 has_self [f32 x, f32 y, f32 z]
+          u16 n_strings { u16 index, str }      new entries of the string table
+          u32 n_add { row } | u32 n_upd { row } | u32 n_del { u32 id }
+  row     u32 id | u16 tag | u16 code | u16 status | u8 flags | f32 x, y, z | str name
+  str     u16 byte length + UTF-8 bytes
+
+tag/code/status are indices into the string table. A keyframe resets the table;
+deltas only carry strings that are new since the previous frame. flags bit 0 is
+set when the row has a position.
+"""
+
+import struct
+
+FRAME_KEYFRAME = 1
+FRAME_DELTA = 2
+ROW_HAS_POS = 0x01
+
+_HEAD = struct.Struct("<BII")
+_SELF = struct.Struct("<fff")
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_ROW = struct.Struct("<IHHHBfff")
+
+
+class CodecError(ValueError):
+    pass
+
+
+def _read_str(mv: memoryview, off: int) -> tuple[str, int]:
+    (n,) = _U16.unpack_from(mv, off)
+    off += 2
+    end = off + n
+    if end > len(mv):
+        raise CodecError("string past end of frame")
+    return str(mv[off:end], "utf-8", "replace"), end
+
+
+def _pack_str(s: str) -> bytes:
+    data = str(s or "").encode("utf-8")[:0xFFFF]
+    return _U16.pack(len(data)) + data
+
+
+class WorldFrameDecoder:
+    """Decodes frames into the dict shape WorldModel.apply_frame expects."""
+
+    def __init__(self):
+        self.strings: list[str] = []
+
+    def _read_rows(self, mv: memoryview, off: int, out: list) -> int:
+        (count,) = _U32.unpack_from(mv, off)
+        off += 4
+        strings = self.strings
+        upper = [v.upper() for v in strings]
+        status_up = [v.upper() if v else "UNKNOWN" for v in strings]
+        n_strings = len(strings)
+        row_unpack = _ROW.unpack_from
+        row_size = _ROW.size
+        str_unpack = _U16.unpack_from
+        append = out.append
+        end_of_frame = len(mv)
+        for _ in range(count):
+            entry_id, tag, code, status, flags, x, y, z = row_unpack(mv, off)
+            off += row_size
+            (n,) = str_unpack(mv, off)
+            off += 2
+            end = off + n
+            if end > end_of_frame:
+                raise CodecError("string past end of frame")
+            name = str(mv[off:end], "utf-8", "replace")
+            off = end
+            if tag >= n_strings or code >= n_strings or status >= n_strings:
+                raise CodecError("string index out of range")
+            has_pos = flags & ROW_HAS_POS
+            append({
+                "tag": upper[tag],
+                "code": strings[code],
+                "name": name,
+                "x": x if has_pos else None,
+                "y": y if has_pos else None,
+                "z": z if has_pos else None,
+                "id": str(entry_id),
+                "status": status_up[status],
+            })
+        return off
+
+    def decode(self, data) -> dict:
+        mv = data if isinstance(data, memoryview) else memoryview(data)
+        try:
+            kind, kf, seq = _HEAD.unpack_from(mv, 0)
+            off = _HEAD.size
+            (has_self,) = _U8.unpack_from(mv, off)
+            off += 1
+            self_pos = None
+            if has_self:
+                x, y, z = _SELF.unpack_from(mv, off)
+                off += _SELF.size
+                self_pos = {"x": x, "y": y, "z": z}
+            if kind == FRAME_KEYFRAME:
+                self.strings = []
+            (n_str,) = _U16.unpack_from(mv, off)
+            off += 2
+            for _ in range(n_str):
+                (idx,) = _U16.unpack_from(mv, off)
+                s, off = _read_str(mv, off + 2)
+                if idx >= len(self.strings):
+                    self.strings.extend([""] * (idx + 1 - len(self.strings)))
+                self.strings[idx] = s
+            adds: list = []
+            upds: list = []
+            off = self._read_rows(mv, off, adds)
+            off = self._read_rows(mv, off, upds)
+            (n_del,) = _U32.unpack_from(mv, off)
+            off += 4
+            dels = [str(v) for v in struct.unpack_from(f"<{n_del}I", mv, off)]
+        except struct.error as exc:
+            raise CodecError(str(exc)) from None
+        return {
+            "kind": kind,
+            "kf": kf,
+            "seq": seq,
+            "self": self_pos,
+            "adds": adds,
+            "upds": upds,
+            "dels": dels,
+        }
+
+
+class WorldFrameEncoder:
+    """Python reference for the Lua PROTO 3 encoder (stand-in peer, corpus, benchmarks)."""
+
+    def __init__(self):
+        self.keyframe_id = 0
+        self.seq = 0
+        self._strings: dict[str, int] = {}
+        self._new: list[tuple[int, str]] = []
+        self._sent: dict[int, bytes] = {}
+        self._sent_self = None
+
+    def _intern(self, s: str) -> int:
+        s = str(s or "")
+        idx = self._strings.get(s)
+        if idx is None:
+            idx = len(self._strings)
+            self._strings[s] = idx
+            self._new.append((idx, s))
+        return idx
+
+    def _row(self, entry: dict) -> bytes:
+        x, y, z = entry.get("x"), entry.get("y"), entry.get("z")
+        has_pos = x is not None and y is not None and z is not None
+        return _ROW.pack(
+            int(entry.get("id") or 0) & 0xFFFFFFFF,
+            self._intern(entry.get("tag") or "OBJECT"),
+            self._intern(entry.get("code") or ""),
+            self._intern(entry.get("status") or ""),
+            ROW_HAS_POS if has_pos else 0,
+            float(x) if has_pos else 0.0,
+            float(y) if has_pos else 0.0,
+            float(z) if has_pos else 0.0,
+        ) + _pack_str(entry.get("name") or "Unknown")
+
+    def _frame(self, kind: int, self_pos, adds, upds, dels) -> bytes:
+        parts = [_HEAD.pack(kind, self.keyframe_id, self.seq)]
+        if self_pos:
+            parts.append(_U8.pack(1))
+            parts.append(_SELF.pack(float(self_pos.get("x", 0)), float(self_pos.get("y", 0)),
+                                    float(self_pos.get("z", 0))))
+        else:
+            parts.append(_U8.pack(0))
+        parts.append(_U16.pack(len(self._new)))
+        for idx, s in self._new:
+            parts.append(_U16.pack(idx))
+            parts.append(_pack_str(s))
+        self._new = []
+        for rows in (adds, upds):
+            parts.append(_U32.pack(len(rows)))
+            parts.extend(rows)
+        parts.append(_U32.pack(len(dels)))
+        parts.append(struct.pack(f"<{len(dels)}I", *dels))
+        return b"".join(parts)
+
+    def keyframe(self, entries, self_pos) -> bytes:
+        self._strings = {}
+        self._new = []
+        self.keyframe_id += 1
+        self.seq = 0
+        rows = []
+        self._sent = {}
+        for e in entries:
+            row = self._row(e)
+            self._sent[int(e.get("id") or 0)] = row
+            rows.append(row)
+        self._sent_self = self_pos
+        return self._frame(FRAME_KEYFRAME, self_pos, rows, [], [])
+
+    def delta(self, entries, self_pos) -> bytes | None:
+        adds, upds = [], []
+        seen = set()
+        for e in entries:
+            key = int(e.get("id") or 0)
+            row = self._row(e)
+            seen.add(key)
+            prev = self._sent.get(key)
+            if prev is None:
+                adds.append(row)
+            elif prev != row:
+                upds.append(row)
+            self._sent[key] = row
+        dels = [k for k in self._sent if k not in seen]
+        for k in dels:
+            del self._sent[k]
+        moved = self_pos != self._sent_self
+        if moved:
+            self._sent_self = self_pos
+        if not adds and not upds and not dels and not moved:
+            return None
+        self.seq += 1
+        return self._frame(FRAME_DELTA, self_pos if moved else None, adds, upds, dels)
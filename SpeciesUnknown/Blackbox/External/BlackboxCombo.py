@@ -0,0 +1,51 @@
+"""Diff-based QComboBox updates for the overlay's selectors.
+
+sync_combo() turns a combo's items into a new (text, data) list with the fewest
+removeItem/insertItem/setItemText calls, keeping the current item; it returns
+whether anything changed.
+"""
+
+from difflib import SequenceMatcher
+
+
+def combo_items(combo) -> list[tuple[str, object]]:
+    return [(combo.itemText(i), combo.itemData(i)) for i in range(combo.count())]
+
+
+def sync_combo(combo, items) -> bool:
+    """Makes combo list items ((text, data) pairs); True when anything changed.
+
+    The current item is kept when its data is still listed, otherwise the first
+    item becomes current (what a clear()/addItem() rebuild left behind).
+    """
+    new = [(str(text), data) for text, data in items]
+    old = combo_items(combo)
+    if old == new:
+        return False
+    prev = combo.currentData() if combo.currentIndex() >= 0 else None
+    blocked = combo.blockSignals(True)
+    try:
+        ops = SequenceMatcher(None, [d for _, d in old], [d for _, d in new], autojunk=False).get_opcodes()
+        # Back to front, so each edit leaves the old indexes before it valid.
+        for op, i1, i2, j1, j2 in reversed(ops):
+            if op == "equal":
+                for k in range(i2 - i1):
+                    if old[i1 + k][0] != new[j1 + k][0]:
+                        combo.setItemText(i1 + k, new[j1 + k][0])
+                continue
+            keep = min(i2 - i1, j2 - j1) if op == "replace" else 0
+            for k in range(keep):
+                text, data = new[j1 + k]
+                combo.setItemText(i1 + k, text)
+                combo.setItemData(i1 + k, data)
+            for _ in range(i1 + keep, i2):
+                combo.removeItem(i1 + keep)
+            for k in range(keep, j2 - j1):
+                text, data = new[j1 + k]
+                combo.insertItem(i1 + k, text, data)
+        if new and (combo.currentIndex() < 0 or combo.currentData() != prev):
+            datas = [d for _, d in new]
+            combo.setCurrentIndex(datas.index(prev) if prev in datas else 0)
+    finally:
+        combo.blockSignals(blocked)
+    return True
@@ -0,0 +1,112 @@
+"""Frame-paced UI refresh for the overlay.
+
+FrameCoalescer keeps a set of dirty views and flushes it at most once per
+frame, highest priority first, within a per-frame time budget. Views bound to
+tabs stay dirty (parked) until the gate callback reports one of their tabs on
+screen, then render once from the latest payload.
+"""
+
+import time
+
+
+class FrameCoalescer:
+    """Dirty views flushed at most once per frame interval, in priority order.
+
+    mark(name, *args) schedules a view; marking a view that is already dirty
+    merges into the pending refresh, and when it carried arguments (a snapshot
+    payload) the older ones are dropped unrendered. flush() runs views until the
+    budget is spent (always at least one) and leaves the rest dirty for the next
+    frame.
+    """
+
+    def __init__(self, hz: float = 30.0, budget_s: float = 0.008, clock=time.monotonic):
+        self.hz = max(1.0, float(hz))
+        self.interval = 1.0 / self.hz
+        self.budget = max(0.0, float(budget_s))
+        self._clock = clock
+        self._views: dict[str, tuple[int, object, tuple]] = {}
+        self._dirty: dict[str, tuple] = {}
+        self._gate = None
+        self._last_flush = None
+        self.marks = 0
+        self.merged = 0
+        self.dropped = 0
+        self.flushes = 0
+        self.runs = 0
+        self.deferred = 0
+        self.errors = 0
+        self.last_flush_s = 0.0
+
+    def set_rate(self, hz: float, budget_s: float):
+        self.hz = max(1.0, float(hz))
+        self.interval = 1.0 / self.hz
+        self.budget = max(0.0, float(budget_s))
+
+    def register(self, name: str, fn, prio: int = 0, tabs=()):
+        """Lower prio renders first and is the last to be deferred; tabs feed the gate."""
+        self._views[name] = (int(prio), fn, tuple(tabs))
+
+    def set_gate(self, fn):
+        """fn(tabs) -> bool: may a view bound to these tabs (() = panel-wide) render now?"""
+        self._gate = fn
+
+    def _ready(self, name: str) -> bool:
+        view = self._views.get(name)
+        if view is None or self._gate is None:
+            return True
+        try:
+            return bool(self._gate(view[2]))
+        except Exception:
+            return True
+
+    def mark(self, name: str, *args) -> bool:
+        """True when the view was clean (a new refresh), False when merged."""
+        self.marks += 1
+        prev = self._dirty.get(name)
+        self._dirty[name] = args
+        if prev is None:
+            return True
+        self.merged += 1
+        if prev:
+            self.dropped += 1
+        return False
+
+    def pending(self) -> bool:
+        """Dirty views the gate lets through (parked ones wait for their tab)."""
+        return any(self._ready(name) for name in self._dirty)
+
+    def parked(self) -> list[str]:
+        return [name for name in self._dirty if not self._ready(name)]
+
+    def due_in(self, now: float | None = None) -> float | None:
+        """Seconds until the next flush may run; None when nothing can render."""
+        if not self.pending():
+            return None
+        if self._last_flush is None:
+            return 0.0
+        now = self._clock() if now is None else now
+        return max(0.0, self._last_flush + self.interval - now)
+
+    def flush(self) -> int:
+        start = self._clock()
+        self._last_flush = start
+        self.flushes += 1
+        order = sorted((n for n in self._dirty if self._ready(n)),
+                       key=lambda n: self._views.get(n, (99,))[0])
+        ran = 0
+        for i, name in enumerate(order):
+            if ran and (self._clock() - start) >= self.budget:
+                self.deferred += sum(1 for n in order[i:] if n in self._dirty)
+                break
+            args = self._dirty.pop(name, None)
+            view = self._views.get(name)
+            if args is None or view is None:
+                continue
+            try:
+                view[1](*args)
+            except Exception:
+                self.errors += 1
+            ran += 1
+        self.runs += ran
+        self.last_flush_s = self._clock() - start
+        return ran
@@ -0,0 +1,69 @@
+"""CPU budget governor for the overlay's timers.
+
+CpuGovernor compares the process's CPU time (time.process_time, all threads)
+with wall time over each sample window and turns it into an interval scale:
+over budget it grows x1.5 per window up to max_scale, under half the budget it
+eases back /1.25 per window, and while the panel has focus it is held at 1.
+"""
+
+import time
+
+GOVERNOR_STEP_UP = 1.5
+GOVERNOR_STEP_DOWN = 1.25
+
+
+class CpuGovernor:
+    """Own-process CPU usage per window and the interval scale it implies."""
+
+    def __init__(self, budget: float, max_scale: float = 4.0, clock=time.monotonic, cpu=time.process_time):
+        self.budget = max(1e-4, float(budget))
+        self.max_scale = max(1.0, float(max_scale))
+        self._clock = clock
+        self._cpu = cpu
+        self._wall0 = clock()
+        self._cpu0 = cpu()
+        self.scale = 1.0
+        self.usage = 0.0
+        self.avg = 0.0
+        self.peak = 0.0
+        self.focused = False
+        self.samples = 0
+        self.throttles = 0
+        self.recoveries = 0
+
+    def sample(self, focused: bool = False) -> bool:
+        """Closes a window; True when the scale changed."""
+        wall, cpu = self._clock(), self._cpu()
+        dt = wall - self._wall0
+        if dt <= 0:
+            return False
+        usage = max(0.0, (cpu - self._cpu0) / dt)
+        self._wall0, self._cpu0 = wall, cpu
+        self.usage = usage
+        self.avg = usage if not self.samples else self.avg * 0.7 + usage * 0.3
+        self.peak = max(self.peak, usage)
+        self.samples += 1
+        self.focused = bool(focused)
+
+        prev = self.scale
+        if self.focused:
+            self.scale = 1.0
+        elif usage > self.budget:
+            self.scale = min(self.max_scale, self.scale * GOVERNOR_STEP_UP)
+        elif usage < self.budget * 0.5:
+            scale = self.scale / GOVERNOR_STEP_DOWN
+            self.scale = 1.0 if scale < 1.05 else scale
+        if self.scale > prev:
+            self.throttles += 1
+        elif self.scale < prev:
+            self.recoveries += 1
+        return self.scale != prev
+
+    def interval(self, base_s: float) -> float:
+        return base_s * self.scale
+
+    def summary(self) -> str:
+        state = "focused" if self.focused else ("throttled" if self.scale > 1.0 else "full rate")
+        return (f"{self.usage * 100:.2f}% of {self.budget * 100:.2f}% budget "
+                f"({self.usage / self.budget * 100:.0f}%), avg {self.avg * 100:.2f}%, peak {self.peak * 100:.2f}% | "
+                f"intervals x{self.scale:.2f} {state} | throttled {self.throttles}, recovered {self.recoveries}")
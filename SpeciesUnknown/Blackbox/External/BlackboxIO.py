@@ -0,0 +1,503 @@
+"""Bridge file reads and payload parsing on a worker thread.
+
+BridgeReader reads the ack/notice/registry journals and the STATE file, parses
+acks and topic payloads, and folds world lines/frames into one WorldShadow
+patch per read. BridgeIO runs it on a QThread and delivers each result to the
+GUI thread as (kind, value) through a queued signal. Topic payloads arrive as
+frozen models (freeze(): mapping proxies and tuples), batch ack pieces included.
+"""
+
+from pathlib import Path
+from types import MappingProxyType
+
+from PySide6.QtCore import QFileSystemWatcher, QObject, QThread, QTimer, Signal, Slot
+
+from BlackboxBridge import (
+    BATCH_SEP,
+    BinaryJournalReader,
+    JournalReader,
+    TailReader,
+    parse_ack_line,
+    parse_batch_results,
+)
+from BlackboxCodec import FRAME_KEYFRAME, WorldFrameDecoder
+from BlackboxWorld import WorldShadow, split_player_pos
+
+# Prefix of each pushed/queried payload and the state domain it updates.
+TOPIC_PREFIXES = {
+    "PLAYERS=": "players",
+    "TPSTATE=": "tp",
+    "PUZZLES=": "puzzles",
+    "CONTRACTS=": "contracts",
+    "WEAPONSTATE=": "weapon",
+}
+STATE_POLL_MS = 250
+
+
+# ----- payload parsers -----
+def parse_kv(payload: str) -> dict:
+    """KEY:value#KEY:value (STATE, WEAPONSTATE); keys upper-cased."""
+    data = {}
+    for part in str(payload or "").split("#"):
+        if ":" not in part:
+            continue
+        key, val = part.split(":", 1)
+        data[key.strip().upper()] = val.strip()
+    return data
+
+
+def parse_state_line(line: str) -> dict | None:
+    if not line.startswith("STATE="):
+        return None
+    return parse_kv(line[len("STATE="):])
+
+
+def parse_player_list(payload: str) -> dict:
+    self_name = None
+    names = []
+    positions = {}
+    for entry in str(payload or "").split(";"):
+        if not entry:
+            continue
+        if entry.startswith("SELF:"):
+            self_name = entry[5:]
+        elif entry.startswith("P:"):
+            name, pos = split_player_pos(entry[2:])
+            names.append(name)
+            if name and pos:
+                positions[name] = pos
+        else:
+            names.append(entry)
+    return {"self": self_name, "names": [n for n in names if n], "positions": positions}
+
+
+def parse_tp_state(payload: str) -> dict:
+    state = {
+        "map": "Unknown",
+        "pawn": False,
+        "return": False,
+        "teleports": [],
+        "near": {},
+        "others": 0,
+    }
+    for part in str(payload or "").split("#"):
+        if ":" not in part:
+            continue
+        key, val = part.split(":", 1)
+        key = key.strip().upper()
+        val = val.strip()
+        if key == "MAP":
+            state["map"] = val or "Unknown"
+        elif key == "PAWN":
+            state["pawn"] = val == "1"
+        elif key == "RETURN":
+            state["return"] = val == "1"
+        elif key == "OTHERS":
+            try:
+                state["others"] = int(val)
+            except Exception:
+                state["others"] = 0
+        elif key == "TPS":
+            tps = []
+            for entry in val.split(","):
+                if "=" not in entry:
+                    continue
+                k, n = entry.split("=", 1)
+                k = k.strip()
+                n = n.strip()
+                if k:
+                    tps.append((k, n or k))
+            state["teleports"] = tps
+        elif key == "NEAR":
+            near = {}
+            for entry in val.split(","):
+                if "=" not in entry:
+                    continue
+                k, v = entry.split("=", 1)
+                near[k.strip().upper()] = v.strip() == "1"
+            state["near"] = near
+    return state
+
+
+def parse_pipe_string(value: str) -> list:
+    out = []
+    for ch in list(str(value or ""))[:8]:
+        if ch == "1":
+            out.append(True)
+        elif ch == "0":
+            out.append(False)
+        else:
+            out.append(None)
+    while len(out) < 8:
+        out.append(None)
+    return out
+
+
+def parse_air_entries(value: str) -> list:
+    entries = []
+    for part in str(value or "").split(","):
+        part = part.strip()
+        if not part or "=" not in part:
+            continue
+        letter, val = part.split("=", 1)
+        letter = letter.strip() or "?"
+        val = val.strip()
+        if val == "1":
+            v = True
+        elif val == "0":
+            v = False
+        else:
+            v = None
+        entries.append({"letter": letter, "valid": v})
+    return entries
+
+
+def parse_puzzles_state(payload: str) -> dict:
+    state = {
+        "pipe_found": False,
+        "pipe_red": [None] * 8,
+        "pipe_blue": [None] * 8,
+        "air_found": False,
+        "air_entries": [],
+    }
+    for part in str(payload or "").split("#"):
+        if ":" not in part:
+            continue
+        key, val = part.split(":", 1)
+        key = key.strip().upper()
+        val = val.strip()
+        if key == "PIPEFOUND":
+            state["pipe_found"] = val == "1"
+        elif key == "PIPER":
+            state["pipe_red"] = parse_pipe_string(val)
+        elif key == "PIPEB":
+            state["pipe_blue"] = parse_pipe_string(val)
+        elif key == "AIRFOUND":
+            state["air_found"] = val == "1"
+        elif key == "AIR":
+            state["air_entries"] = parse_air_entries(val)
+    return state
+
+
+def parse_contract_kv(value: str) -> dict:
+    out = {}
+    for part in str(value or "").split(","):
+        part = part.strip()
+        if not part or "=" not in part:
+            continue
+        key, val = part.split("=", 1)
+        out[key.strip()] = val.strip()
+    return out
+
+
+def parse_contract_state(payload: str) -> dict:
+    state = {
+        "ready": False,
+        "map": "Unknown",
+        "lists": 0,
+        "first": False,
+        "props": 0,
+        "hooks": 0,
+        "age": None,
+        "types": {},
+        "values": {},
+    }
+    for part in str(payload or "").split("#"):
+        if ":" not in part:
+            continue
+        key, val = part.split(":", 1)
+        key = key.strip().upper()
+        val = val.strip()
+        if key == "READY":
+            state["ready"] = val == "1"
+        elif key == "MAP":
+            state["map"] = val or "Unknown"
+        elif key in ("LISTS", "PROPS", "HOOKS"):
+            try:
+                state[key.lower()] = int(val)
+            except Exception:
+                state[key.lower()] = 0
+        elif key == "FIRST":
+            state["first"] = val == "1"
+        elif key == "AGE":
+            try:
+                state["age"] = float(val)
+            except Exception:
+                state["age"] = None
+        elif key == "TYPES":
+            state["types"] = parse_contract_kv(val)
+        elif key == "VALUES":
+            state["values"] = parse_contract_kv(val)
+    return state
+
+
+TOPIC_PARSERS = {
+    "players": parse_player_list,
+    "tp": parse_tp_state,
+    "puzzles": parse_puzzles_state,
+    "contracts": parse_contract_state,
+    "weapon": parse_kv,
+}
+
+
+def freeze(value):
+    """Read-only copy of a parsed payload: dicts become mapping proxies, lists tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def parse_topic(msg: str) -> tuple[str, MappingProxyType] | None:
+    """(domain, frozen payload) for a topic message, None for anything else."""
+    for prefix, key in TOPIC_PREFIXES.items():
+        if msg.startswith(prefix):
+            return key, freeze(TOPIC_PARSERS[key](msg[len(prefix):]))
+    return None
+
+
+def parse_ack(line: str) -> tuple[str, bool, str, MappingProxyType] | None:
+    """(id, ok, msg, topics) for an ACK line; topics maps each topic payload in msg
+    (every piece of a batch result too) to its parse_topic() value."""
+    parsed = parse_ack_line(line)
+    if parsed is None:
+        return None
+    ack_id, ok, msg = parsed
+    pieces = [text for _, text in parse_batch_results(msg)] if BATCH_SEP in msg else [msg]
+    topics = {}
+    for text in pieces:
+        topic = parse_topic(text)
+        if topic is not None:
+            topics[text] = topic
+    return ack_id, ok, msg, MappingProxyType(topics)
+
+
+# ----- reader (worker thread) -----
+def _ensure_file(path: str, binary: bool = False):
+    try:
+        p = Path(path)
+        if path and not p.exists():
+            if binary:
+                p.write_bytes(b"")
+            else:
+                p.write_text("", encoding="utf-8")
+    except Exception:
+        pass
+
+
+class BridgeReader:
+    """Owns the bridge's inbound files; each read_* returns parsed, GUI-ready values."""
+
+    def __init__(self, ack_path: str, notice_path: str, registry_path: str,
+                 registry_bin_path: str, state_path: str):
+        self.ack_path = ack_path
+        self.notice_path = notice_path
+        self.registry_path = registry_path
+        self.registry_bin_path = registry_bin_path
+        self.state_path = state_path
+        for path in (ack_path, notice_path, registry_path, state_path):
+            _ensure_file(path)
+        _ensure_file(registry_bin_path, binary=True)
+        self._acks = JournalReader(ack_path)
+        self._notices = JournalReader(notice_path)
+        self._registry = JournalReader(registry_path)
+        # PROTO 3 world frames land in a separate binary journal.
+        self._decoder = WorldFrameDecoder()
+        self._registry_bin = BinaryJournalReader(registry_bin_path, self._decoder.decode)
+        self._state = TailReader(state_path)
+        self._last_registry_line = ""
+        self._last_state_line = ""
+        self.world = WorldShadow()
+        self.world_gen = 0
+
+    def paths(self) -> list[str]:
+        return [p for p in (self.ack_path, self.notice_path, self.registry_path, self.registry_bin_path) if p]
+
+    def read_acks(self) -> tuple:
+        return tuple(ack for ack in map(parse_ack, self._acks.read_new()) if ack is not None)
+
+    def read_notices(self) -> tuple:
+        """(line, parse_topic(line)) pairs."""
+        lines = (line.strip() for line in self._notices.read_new())
+        return tuple((line, parse_topic(line)) for line in lines if line)
+
+    def read_world(self) -> dict | None:
+        """New registry lines and frames as one patch (with world_gen), or None."""
+        world = self.world
+        # Snapshots/keyframes replace the model, so a burst only needs the newest one
+        # plus the deltas that follow it.
+        lines = self._registry.read_new()
+        start = 0
+        for i, line in enumerate(lines):
+            if line.startswith("WORLD=") or line.startswith("WORLDK="):
+                start = i
+        for line in lines[start:]:
+            line = line.strip()
+            if not line or line == self._last_registry_line:
+                continue
+            self._last_registry_line = line
+            world.apply_line(line)
+
+        frames = self._registry_bin.read_new()
+        start = 0
+        for i, frame in enumerate(frames):
+            if frame.get("kind") == FRAME_KEYFRAME:
+                start = i
+        for frame in frames[start:]:
+            world.apply_frame(frame)
+
+        patch = world.take_patch()
+        if patch is not None:
+            patch["gen"] = self.world_gen
+        return patch
+
+    def reset_world(self, gen: int):
+        """The GUI cleared its model; patches continue from an empty shadow."""
+        self.world.reset()
+        self.world_gen = gen
+        self._last_registry_line = ""
+
+    def read_state(self) -> tuple[bool, dict | None] | None:
+        """None without a STATE line; (changed, data) otherwise (data None when unchanged)."""
+        if not self.state_path:
+            return None
+        # One stat when unchanged; the file is only re-read after Lua rewrites it.
+        fresh = self._state.read_snapshot()
+        line = self._state.last_line if fresh is None else fresh
+        if not line:
+            return None
+        if line == self._last_state_line:
+            return False, None
+        self._last_state_line = line
+        return True, parse_state_line(line)
+
+
+class BridgeWorker(QObject):
+    """Lives on the I/O thread: watches the journals and polls STATE."""
+
+    ready = Signal(str, object)
+
+    def __init__(self, reader: BridgeReader):
+        super().__init__()
+        self._reader = reader
+        self._watcher = None
+        self._timer = None
+        self._interval = STATE_POLL_MS
+
+    @Slot()
+    def start(self):
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._rewatch()
+        self._timer = QTimer(self)
+        self._timer.setInterval(self._interval)
+        self._timer.timeout.connect(self._poll_state)
+        self._timer.start()
+
+    @Slot()
+    def stop(self):
+        if self._timer is not None:
+            self._timer.stop()
+        if self._watcher is not None:
+            self._watcher.deleteLater()
+            self._watcher = None
+
+    @Slot(int)
+    def set_state_interval(self, ms: int):
+        self._interval = int(ms)
+        if self._timer is not None:
+            self._timer.setInterval(self._interval)
+
+    @Slot(int)
+    def reset_world(self, gen: int):
+        self._reader.reset_world(gen)
+
+    def _rewatch(self):
+        # Rotation replaces the file, which drops it from the watcher.
+        try:
+            watched = self._watcher.files()
+            for path in self._reader.paths():
+                _ensure_file(path, binary=path == self._reader.registry_bin_path)
+                if path not in watched:
+                    self._watcher.addPath(path)
+        except Exception:
+            pass
+
+    def _emit(self, kind: str, value):
+        if value:
+            self.ready.emit(kind, value)
+
+    @Slot(str)
+    def _on_file_changed(self, path: str):
+        reader = self._reader
+        try:
+            if path == reader.ack_path:
+                self._emit("acks", reader.read_acks())
+            elif path == reader.notice_path:
+                self._emit("notices", reader.read_notices())
+            else:
+                self._emit("world", reader.read_world())
+        except Exception:
+            pass
+        if self._watcher is not None:
+            self._rewatch()
+
+    @Slot()
+    def _poll_state(self):
+        try:
+            state = self._reader.read_state()
+        except Exception:
+            return
+        if state is not None:
+            self.ready.emit("state", state)
+
+
+class BridgeIO(QObject):
+    """GUI-thread handle on the I/O thread; results arrive on ready(kind, value)."""
+
+    ready = Signal(str, object)
+    _start = Signal()
+    _stop = Signal()
+    _interval = Signal(int)
+    _reset = Signal(int)
+
+    def __init__(self, reader: BridgeReader, parent=None):
+        super().__init__(parent)
+        self.reader = reader
+        self._world_gen = 0
+        self._thread = QThread()
+        self._thread.setObjectName("BlackboxIO")
+        self._worker = BridgeWorker(reader)
+        self._worker.moveToThread(self._thread)
+        self._start.connect(self._worker.start)
+        self._stop.connect(self._worker.stop)
+        self._interval.connect(self._worker.set_state_interval)
+        self._reset.connect(self._worker.reset_world)
+        # Emitted on the I/O thread, delivered here through the event loop.
+        self._worker.ready.connect(self.ready)
+        self._thread.finished.connect(self._worker.deleteLater)
+
+    @property
+    def world_gen(self) -> int:
+        return self._world_gen
+
+    def start(self):
+        if not self._thread.isRunning():
+            self._thread.start()
+            self._start.emit()
+
+    def stop(self, wait_ms: int = 2000):
+        if self._thread.isRunning():
+            self._stop.emit()
+            self._thread.quit()
+            self._thread.wait(wait_ms)
+
+    def set_state_interval(self, ms: int):
+        self._interval.emit(int(ms))
+
+    def reset_world(self) -> int:
+        """New world generation; patches read against the old shadow are stale."""
+        self._world_gen += 1
+        self._reset.emit(self._world_gen)
+        return self._world_gen
@@ -1,10 +1,10 @@
 import os
 import ctypes
+import math
 from ctypes import wintypes
 from pathlib import Path
 
 import time
-import threading
 
 from PySide6.QtWidgets import (
     QApplication, QWidget,
@@ -12,13 +12,34 @@ from PySide6.QtWidgets import (
     QVBoxLayout, QHBoxLayout,
     QFrame, QScrollArea, QLineEdit,
     QPushButton, QCheckBox, QComboBox,
-    QSlider, QMessageBox, QListWidget, QListWidgetItem,
+    QSlider, QMessageBox,
 )
 from PySide6.QtGui import (
     QPainter, QPen, QBrush, QColor, QLinearGradient, QRadialGradient,
     QFont, QFontMetrics, QPainterPath,
 )
-from PySide6.QtCore import Qt, QFileSystemWatcher, Signal, QTimer
+from PySide6.QtCore import Qt, Signal, QTimer
+
+from BlackboxBridge import (
+    BRIDGE_CALL_TIMEOUT_S,
+    BRIDGE_WINDOW,
+    CommandBridge,
+    CommandFuture,
+    CommandPipeline,
+    PRIO_BULK,
+    StateBlockReader,
+    make_transport,
+    gather,
+)
+from BlackboxCombo import sync_combo
+from BlackboxFrame import FrameCoalescer
+from BlackboxGovernor import CpuGovernor
+from BlackboxIO import BridgeIO, BridgeReader, parse_ack
+from BlackboxRefresh import RefreshPlanner
+from BlackboxRuntime import Runtime
+from BlackboxTimers import TimerWheel
+from BlackboxWorld import WORLD_PROTO_BINARY, WorldColumns, WorldGrid, WorldModel
+from BlackboxWorldView import WorldListModel, WorldListProxy, WorldListView
 
 _MUTEX_HANDLE = None
 
@@ -80,7 +101,75 @@ CMD_PATH = str(BASE_DIR / "bridge_cmd.txt")
 ACK_PATH = str(BASE_DIR / "bridge_ack.txt")
 NOTICE_PATH = str(BASE_DIR / "bridge_notice.txt")
 REGISTRY_PATH = str(BASE_DIR / "bridge_registry.txt")
+REGISTRY_BIN_PATH = str(BASE_DIR / "bridge_registry.bin")
 STATE_PATH = str(BASE_DIR / "bridge_state.txt")
+STATE_BIN_PATH = str(BASE_DIR / "bridge_state.bin")
+# Mapped state block (seqlock); polled at display rate, the STATE text file stays as fallback.
+STATE_BLOCK_ENABLED = os.environ.get("BLACKBOX_STATE_BLOCK", "1") != "0"
+STATE_BLOCK_POLL_MS = 16
+# State poll timers while the panel is hidden (PANEL= open requests also arrive as notices).
+HIDDEN_POLL_MS = 1000
+# Toast notices queue in a bounded stream (repeats merged, oldest dropped) and show at most one per pace.
+TOAST_NOTICE_PREFIXES = ("SPLASH|", "NOTICE|", "ALERT|")
+TOAST_QUEUE_MAX = 6
+TOAST_PACE_S = 0.15
+# "file" (default) appends to bridge_cmd.txt; "socket" keeps one loopback connection to the Lua side.
+BRIDGE_TRANSPORT = os.environ.get("BLACKBOX_BRIDGE", "file")
+# Highest bridge protocol the overlay speaks; the Lua side advertises its own in STATE PROTO.
+# BLACKBOX_BRIDGE_PROTO=2 keeps the world stream as text.
+try:
+    BRIDGE_PROTO = max(1, min(WORLD_PROTO_BINARY, int(os.environ.get("BLACKBOX_BRIDGE_PROTO", WORLD_PROTO_BINARY))))
+except ValueError:
+    BRIDGE_PROTO = WORLD_PROTO_BINARY
+# Max bridge queries in flight at once (1 = the old one-at-a-time behaviour).
+try:
+    BRIDGE_INFLIGHT = max(1, int(os.environ.get("BLACKBOX_BRIDGE_WINDOW", BRIDGE_WINDOW)))
+except ValueError:
+    BRIDGE_INFLIGHT = BRIDGE_WINDOW
+# Widget refreshes from bridge payloads are coalesced to at most this many flushes per second,
+# each limited to the budget (lower-priority views wait for the next frame when it runs over).
+try:
+    UI_FRAME_HZ = max(1.0, float(os.environ.get("BLACKBOX_UI_HZ", "30")))
+except ValueError:
+    UI_FRAME_HZ = 30.0
+try:
+    UI_FRAME_BUDGET_MS = max(0.0, float(os.environ.get("BLACKBOX_UI_BUDGET_MS", "8")))
+except ValueError:
+    UI_FRAME_BUDGET_MS = 8.0
+# Overlay CPU budget in percent of one core. Past it the governor stretches the poll and
+# animation intervals (up to GOVERNOR_MAX_SCALE times) and shrinks the frame budget.
+try:
+    CPU_BUDGET_PCT = max(0.05, float(os.environ.get("BLACKBOX_CPU_BUDGET", "1.0")))
+except ValueError:
+    CPU_BUDGET_PCT = 1.0
+GOVERNOR_MAX_SCALE = 4.0
+GOVERNOR_WINDOW_S = 1.0
+TOAST_FRAME_MS = 16
+# Pipeline keys refreshed together (one batch frame) when the panel opens.
+PANEL_SYNC_KEYS = ("players", "tp", "puzzles", "contracts", "weapon")
+# Max age (seconds) before a state domain is queried again by a follow-up or panel sync;
+# explicit refreshes and actions that change a domain always query. BLACKBOX_REFRESH_SCALE
+# stretches or shrinks every budget.
+# Weapon changes are pushed (weapon topic), so its budget only covers a missed notice.
+REFRESH_MAX_AGE = {"players": 5.0, "tp": 5.0, "puzzles": 10.0, "contracts": 10.0, "weapon": 30.0, "world": 5.0}
+try:
+    REFRESH_SCALE = max(0.0, float(os.environ.get("BLACKBOX_REFRESH_SCALE", "1")))
+except ValueError:
+    REFRESH_SCALE = 1.0
+# Topics Lua publishes on change (subscribe command) at up to this many updates a second,
+# subscribed only while one of their tabs is on screen and dropped when the panel hides.
+TOPIC_RATES_HZ = {"players": 2.0, "tp": 4.0, "puzzles": 4.0, "contracts": 4.0, "weapon": 4.0, "world": 4.0}
+TOPIC_TABS = {
+    "players": ("Teleport", "Player", "Weapons", "World"),
+    "tp": ("Teleport",),
+    "puzzles": ("Puzzles",),
+    "contracts": ("Contracts",),
+    "weapon": ("Weapons",),
+    "world": ("World", "Weapons"),
+}
+# World tab "Nearest" buttons (registry tag, label) and the nearby-monster chip radius (registry units).
+WORLD_NEAREST_TAGS = (("MONSTER", "Monster"), ("OBJECTIVE", "Keycard"), ("BLACKBOX", "Blackbox"), ("WEAPON", "Weapon"))
+WORLD_NEAR_RADIUS = 2500.0
 GAME_EXE = "SpeciesUnknown-Win64-Shipping.exe"
 GAME_WINDOW_TITLE = "SpeciesUnknown"
 # Prefer process checks (more reliable than window-title). Add more names if needed.
@@ -479,32 +568,11 @@ def _get_foreground_title_zoomed():
     return title, visible, zoomed, pid
 
 
-class CommandBridge:
-    def __init__(self, cmd_path: str):
-        self.cmd_path = str(cmd_path or "")
-        self._cmd_id = 1
-
-    def send(self, name: str, arg: str = "") -> int | None:
-        try:
-            cmd = str(name or "").strip().lower()
-            if not cmd:
-                return None
-            arg_s = "" if arg is None else str(arg)
-            arg_s = arg_s.replace("\r", " ").replace("\n", " ").replace("|", " ")
-            cmd_id = int(self._cmd_id)
-            self._cmd_id += 1
-            line = f"CMD|{cmd_id}|{cmd}|{arg_s}\n"
-            with open(self.cmd_path, "a", encoding="utf-8", newline="\n") as f:
-                f.write(line)
-            return cmd_id
-        except Exception:
-            return None
-
-
 class ToastWidget(QWidget):
     closed = Signal(object)
 
-    def __init__(self, text: str, level: str = "INFO", duration_ms: int = 2500, base_font: QFont | None = None):
+    def __init__(self, text: str, level: str = "INFO", duration_ms: int = 2500, base_font: QFont | None = None,
+                 frame_ms: int = TOAST_FRAME_MS):
         super().__init__()
         self.text = str(text or "")
         self.level = str(level or "INFO").upper()
@@ -533,7 +601,8 @@ class ToastWidget(QWidget):
         self._t0 = time.time()
 
         self._timer = QTimer(self)
-        self._timer.setInterval(16)
+        # Fades follow wall time, so a longer frame only makes them coarser.
+        self._timer.setInterval(frame_ms)
         self._timer.timeout.connect(self._tick)
         self._timer.start()
 
@@ -611,6 +680,7 @@ class ToastWidget(QWidget):
 class ToastManager:
     def __init__(self):
         self._toasts = []
+        self.frame_ms = TOAST_FRAME_MS
         self._base_font = QFont("Agency FB", 10, QFont.Bold)
         self._base_font.setLetterSpacing(QFont.PercentageSpacing, 105)
 
@@ -618,13 +688,18 @@ class ToastManager:
         text = str(text or "").strip()
         if not text:
             return
-        toast = ToastWidget(text, level, duration_ms, self._base_font)
+        toast = ToastWidget(text, level, duration_ms, self._base_font, self.frame_ms)
         toast.closed.connect(self._on_toast_closed)
         self._toasts.append(toast)
         self._reposition()
         toast.show()
         toast.raise_()
 
+    def set_frame_ms(self, frame_ms: int):
+        self.frame_ms = int(frame_ms)
+        for toast in self._toasts:
+            toast._timer.setInterval(self.frame_ms)
+
     def _on_toast_closed(self, toast):
         if toast in self._toasts:
             self._toasts.remove(toast)
@@ -649,9 +724,9 @@ class ToastManager:
 class ActionPanel(QWidget):
     _invoke = Signal(object)
 
-    def __init__(self, send_cmd_cb):
+    def __init__(self, bridge: CommandBridge):
         super().__init__()
-        self._send_cmd = send_cmd_cb
+        self._bridge = bridge
         self._panel_request_cb = None
         self._panel_requested = None
         self.setObjectName("actionPanel")
@@ -760,6 +835,8 @@ class ActionPanel(QWidget):
 
         tabs = QTabWidget()
         tabs.setObjectName("panelTabs")
+        self.tabs = tabs
+        self._tab_names = []
         body_l.addWidget(tabs, 1)
         root.addWidget(body, 1)
 
@@ -775,6 +852,7 @@ class ActionPanel(QWidget):
             layout.setContentsMargins(0, 0, 0, 0)
             layout.setSpacing(12)
             tabs.addTab(scroll, title)
+            self._tab_names.append(title)
             return layout
 
         tp_layout = _make_tab("Teleport")
@@ -984,6 +1062,10 @@ class ActionPanel(QWidget):
         self.world_count_lbl = QLabel("Items: 0")
         self.world_count_lbl.setObjectName("panelChip")
         world_row.addWidget(self.world_count_lbl)
+
+        self.world_near_lbl = QLabel("Monsters Nearby: --")
+        self.world_near_lbl.setObjectName("panelChip")
+        world_row.addWidget(self.world_near_lbl)
         world_row.addStretch(1)
         world_l.addLayout(world_row)
 
@@ -1007,9 +1089,22 @@ class ActionPanel(QWidget):
         world_filter_row.addWidget(self.world_sort_combo, 1)
         world_l.addLayout(world_filter_row)
 
-        self.world_list = QListWidget()
+        world_near_row = QHBoxLayout()
+        self.world_origin_combo = QComboBox()
+        self.world_origin_combo.setObjectName("panelCombo")
+        self.world_origin_combo.addItem("Nearest To: Me", "SELF")
+        world_near_row.addWidget(self.world_origin_combo, 1)
+        self.world_nearest_btns = {}
+        for tag, text in WORLD_NEAREST_TAGS:
+            btn = QPushButton(text)
+            btn.setObjectName("panelButton")
+            world_near_row.addWidget(btn)
+            self.world_nearest_btns[tag] = btn
+        world_l.addLayout(world_near_row)
+
+        self.world_list = WorldListView("No world items registered.")
         self.world_list.setObjectName("panelList")
-        self.world_list.setSelectionMode(QListWidget.SingleSelection)
+        self.world_list.setSelectionMode(WorldListView.SingleSelection)
         world_l.addWidget(self.world_list, 1)
 
         world_btns = QHBoxLayout()
@@ -1522,10 +1617,23 @@ class ActionPanel(QWidget):
         self.debug_cmd_lbl.setObjectName("panelChip")
         adv_l.addWidget(self.debug_cmd_lbl)
 
+        self.debug_poll_lbl = QLabel("Bridge Poll: --")
+        self.debug_poll_lbl.setObjectName("panelChip")
+        adv_l.addWidget(self.debug_poll_lbl)
+
         self.debug_perf_lbl = QLabel("Perf: --")
         self.debug_perf_lbl.setObjectName("panelChip")
         adv_l.addWidget(self.debug_perf_lbl)
 
+        self.debug_cpu_lbl = QLabel("CPU: --")
+        self.debug_cpu_lbl.setObjectName("panelChip")
+        adv_l.addWidget(self.debug_cpu_lbl)
+
+        self.debug_refresh_lbl = QLabel("Refresh: --")
+        self.debug_refresh_lbl.setObjectName("panelChip")
+        self.debug_refresh_lbl.setWordWrap(True)
+        adv_l.addWidget(self.debug_refresh_lbl)
+
         self.debug_adv_box.setVisible(True)
         debug_layout.addWidget(self.debug_adv_box)
         debug_layout.addStretch(1)
@@ -1878,9 +1986,11 @@ class ActionPanel(QWidget):
         self.world_refresh_btn.clicked.connect(self._refresh_world)
         self.world_filter_combo.currentIndexChanged.connect(self._refresh_world_list)
         self.world_sort_combo.currentIndexChanged.connect(self._refresh_world_list)
-        self.world_list.currentItemChanged.connect(self._update_world_actions)
+        self.world_origin_combo.currentIndexChanged.connect(self._update_world_actions)
         self.world_tp_btn.clicked.connect(self._world_teleport)
         self.world_bring_btn.clicked.connect(self._world_bring)
+        for tag, btn in self.world_nearest_btns.items():
+            btn.clicked.connect(lambda _=False, t=tag: self._world_select_nearest(t))
 
         self.tp_refresh_btn.clicked.connect(self._refresh_tp_state)
         self.tp_set_return_btn.clicked.connect(self._tp_set_return)
@@ -1947,17 +2057,46 @@ class ActionPanel(QWidget):
 
         # Ack polling (bridge responses)
         self._ack_path = ACK_PATH
-        self._ack_handlers = {}
-        self._ack_watcher = QFileSystemWatcher(self)
+        self._pipeline = CommandPipeline(self._call, BRIDGE_INFLIGHT, call_batch=self._call_batch)
+        self._planner = RefreshPlanner({k: v * REFRESH_SCALE for k, v in REFRESH_MAX_AGE.items()})
+        self._pipeline.register("players", "listplayers_gui", self._handle_players_ack, 2.5)
+        self._pipeline.register("tp", "tp_gui_state", self._handle_tp_state_ack, 2.5)
+        self._pipeline.register("puzzles", "puzzlestate", self._handle_puzzles_ack, 2.5)
+        self._pipeline.register("contracts", "contract_gui_state", self._handle_contract_state_ack, 2.5)
+        # Changes arrive on the weapon topic; paced as bulk so it never takes the last slot.
+        self._pipeline.register("weapon", "weapon_gui_state", self._handle_weapon_state_ack, 1.5,
+                                self._weapon_state_arg, PRIO_BULK)
+        self._ack_timer = QTimer(self)
+        self._ack_timer.setSingleShot(True)
+        self._ack_timer.timeout.connect(self._on_ack_timeout)
+        self._frames = FrameCoalescer(UI_FRAME_HZ, UI_FRAME_BUDGET_MS / 1000.0)
+        # Views only render while one of their tabs is on screen; () = panel-wide (info bar).
+        self._frames.register("players", self._refresh_player_views, 0, ("Teleport", "Player", "Weapons", "World"))
+        self._frames.register("tp", self._refresh_tp_views, 1, ("Teleport",))
+        self._frames.register("weapon", self._apply_weapon_state, 1, ("Weapons",))
+        self._frames.register("world", self._refresh_world_views, 2, ("World",))
+        self._frames.register("weapon_rows", self._refresh_weapon_rows, 2, ("Weapons",))
+        self._frames.register("contracts", self._refresh_contract_views, 3, ("Contracts",))
+        self._frames.register("puzzles", self._refresh_puzzle_views, 3, ("Puzzles",))
+        self._frames.register("contract_actions", self._update_contract_actions, 4, ("Contracts",))
+        self._frames.register("state", self._update_info_bar, 4)
+        self._frames.register("debug", self._update_debug_fields, 5, ("Debug",))
+        self._frames.set_gate(self._views_shown)
+        self.tabs.currentChanged.connect(self._on_tab_changed)
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setSingleShot(True)
+        self._frame_timer.timeout.connect(self._flush_frame)
+        # Delayed calls (_schedule) share one timer armed for the earliest deadline.
+        self._timers = TimerWheel()
+        self._wheel_timer = QTimer(self)
+        self._wheel_timer.setSingleShot(True)
+        self._wheel_timer.timeout.connect(self._run_timers)
+        # Cooperative tasks (BlackboxRuntime.py) sleep on the same wheel.
+        self._runtime = Runtime(self._timers, self._arm_timer_wheel)
+        self._governor = CpuGovernor(CPU_BUDGET_PCT / 100.0, GOVERNOR_MAX_SCALE)
+        self._runtime.every(GOVERNOR_WINDOW_S, self._govern, "governor")
         self._last_ack_time = 0.0
-        try:
-            if self._ack_path:
-                if not Path(self._ack_path).exists():
-                    Path(self._ack_path).write_text("", encoding="utf-8")
-                self._ack_watcher.addPath(self._ack_path)
-        except Exception:
-            pass
-        self._ack_watcher.fileChanged.connect(self._on_ack_changed)
+        self._ack_topics = {}
 
         # Teleport state cache
         self._tp_state = {
@@ -1986,16 +2125,29 @@ class ActionPanel(QWidget):
             "types": {},
             "values": {},
         }
-        self._world_entries = []
+        self._world = WorldModel()
+        # Columnar mirror for distances (numpy); None keeps the per-entry path.
+        self._world_cols = WorldColumns(self._world) if WorldColumns.available() else None
+        self._world_grid = WorldGrid(self._world)
+        self._world_rows = WorldListModel(self._world, self._world_cols, self)
+        self._world_proxy = WorldListProxy(self)
+        self._world_proxy.setSourceModel(self._world_rows)
+        self._world_proxy.sort(0)
+        self.world_list.setModel(self._world_proxy)
+        self.world_list.selectionModel().currentChanged.connect(self._update_world_actions)
         self._world_self_pos = None
+        self._proto_active = 1
+        self._proto_last_request = 0.0
         self._last_cmd_sent = ""
         self._last_cmd_time = 0.0
         self._player_names = []
+        self._player_list = {"self": None, "names": [], "positions": {}}
+        self._players_changed = False
+        self._player_pos = {}
         self._self_name = None
-        self._refresh_queue = []
         self._state_data = {}
         self._weapon_state = {}
-        self._last_weapon_state_request = 0.0
+        self._subs_spec = None
 
         self._update_target_actions()
         self._update_tp_actions()
@@ -2003,58 +2155,36 @@ class ActionPanel(QWidget):
         self._sync_contract_controls_from_state()
         self._update_contract_actions()
 
-        # Notice watcher (event-based updates from UE4SS)
-        self._notice_path = NOTICE_PATH
-        self._notice_watcher = QFileSystemWatcher(self)
-        self._last_notice_line = ""
-        try:
-            if self._notice_path:
-                if not Path(self._notice_path).exists():
-                    Path(self._notice_path).write_text("", encoding="utf-8")
-                self._notice_watcher.addPath(self._notice_path)
-        except Exception:
-            pass
-        self._notice_watcher.fileChanged.connect(self._on_notice_changed)
-
-        # Registry watcher (world registry updates)
-        self._registry_path = REGISTRY_PATH
-        self._registry_watcher = QFileSystemWatcher(self)
-        self._last_registry_line = ""
+        # Bridge files (acks, notices, registry, STATE) are read and parsed on the I/O
+        # thread (BlackboxIO.py); results come back through _on_bridge_io.
         self._last_registry_update = 0.0
-        try:
-            if self._registry_path:
-                if not Path(self._registry_path).exists():
-                    Path(self._registry_path).write_text("", encoding="utf-8")
-                self._registry_watcher.addPath(self._registry_path)
-        except Exception:
-            pass
-        self._registry_watcher.fileChanged.connect(self._on_registry_changed)
-
-        # State polling (info/debug bar)
-        self._state_path = STATE_PATH
-        self._last_state_line = ""
         self._last_state_read = 0.0
         self._last_state_write = 0.0
-        try:
-            if self._state_path and not Path(self._state_path).exists():
-                Path(self._state_path).write_text("", encoding="utf-8")
-        except Exception:
-            pass
-        self._state_timer = QTimer(self)
-        self._state_timer.setInterval(250)
-        self._state_timer.timeout.connect(self._poll_state)
-        self._state_timer.start()
-
-        self._weapon_state_timer = QTimer(self)
-        self._weapon_state_timer.setInterval(600)
-        self._weapon_state_timer.timeout.connect(self._tick_weapon_state)
-        self._weapon_state_timer.start()
+        reader = BridgeReader(self._ack_path, NOTICE_PATH, REGISTRY_PATH, REGISTRY_BIN_PATH, STATE_PATH)
+        self._io = BridgeIO(reader, self)
+        self._io.ready.connect(self._on_bridge_io)
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self._io.stop)
+            app.aboutToQuit.connect(self._runtime.shutdown)
+        self._io.start()
+        self._toast_stream = None
+        if self._bridge is not None:
+            self._toast_stream = self._bridge.notices(TOAST_NOTICE_PREFIXES, TOAST_QUEUE_MAX)
+            self._runtime.spawn(self._toast_notices())
+
+        self._state_block = StateBlockReader(STATE_BIN_PATH) if STATE_BLOCK_ENABLED else None
+        self._state_block_live = 0.0
+        if self._state_block is not None:
+            self._state_block_timer = QTimer(self)
+            self._state_block_timer.setInterval(STATE_BLOCK_POLL_MS)
+            self._state_block_timer.timeout.connect(self._poll_state_block)
+            self._state_block_timer.start()
+
+        self._set_poll_rates(self.isVisible())
 
         # Initial sync
-        self._schedule(0.15, self._refresh_players)
-        self._schedule(0.20, self._refresh_tp_state)
-        self._schedule(0.25, self._refresh_puzzles)
-        self._schedule(0.30, self._refresh_contract_state)
+        self._schedule(0.15, self._sync_panel)
 
         self.setStyleSheet("""
             QWidget {
@@ -2153,17 +2283,17 @@ class ActionPanel(QWidget):
                 color: rgba(150, 130, 200, 210);
                 font-size: 10px;
             }
-            QLabel#panelList, QListWidget#panelList {
+            QLabel#panelList, QListView#panelList {
                 background: rgba(8, 8, 14, 230);
                 border: 1px solid rgba(100, 80, 160, 140);
                 border-radius: 8px;
                 padding: 6px 8px;
                 font-size: 10px;
             }
-            QListWidget#panelList::item {
+            QListView#panelList::item {
                 padding: 4px 2px;
             }
-            QListWidget#panelList::item:selected {
+            QListView#panelList::item:selected {
                 background: rgba(120, 90, 210, 140);
             }
             QComboBox#panelCombo {
@@ -2277,15 +2407,39 @@ class ActionPanel(QWidget):
 
     # ----------------- Commands -----------------
     def _send(self, name: str, arg: str = ""):
-        if self._send_cmd is None:
+        if self._bridge is None:
             return None
         try:
             self._last_cmd_sent = f"{name} {arg}".strip()
             self._last_cmd_time = time.monotonic()
-            return self._send_cmd(name, arg)
+            return self._bridge.send(name, arg)
         except Exception:
             return None
 
+    def _call(self, name: str, arg: str = "", timeout_s: float = BRIDGE_CALL_TIMEOUT_S) -> CommandFuture:
+        """Like _send, but the answer comes back as a future (rejected on timeout)."""
+        if self._bridge is None:
+            fut = CommandFuture(name=name)
+            fut.set_exception(ConnectionError("no bridge"))
+            return fut
+        self._last_cmd_sent = f"{name} {arg}".strip()
+        self._last_cmd_time = time.monotonic()
+        fut = self._bridge.call(name, arg, timeout_s)
+        self._arm_ack_timer()
+        return fut
+
+    def _call_batch(self, commands, timeout_s: float = BRIDGE_CALL_TIMEOUT_S) -> CommandFuture:
+        """One frame, one ack for several commands; settles with [(ok, msg), ...]."""
+        if self._bridge is None:
+            fut = CommandFuture(name="batch")
+            fut.set_exception(ConnectionError("no bridge"))
+            return fut
+        self._last_cmd_sent = "batch " + ", ".join(name for name, _ in commands)
+        self._last_cmd_time = time.monotonic()
+        fut = self._bridge.call_batch(commands, timeout_s)
+        self._arm_ack_timer()
+        return fut
+
     def show_toast(self, text: str, level: str = "INFO", duration_ms: int = 2500):
         try:
             mgr = self._toast_mgr_external or self._toast_mgr
@@ -2297,16 +2451,32 @@ class ActionPanel(QWidget):
         if mgr is not None:
             self._toast_mgr_external = mgr
 
+    @property
+    def runtime(self) -> Runtime:
+        """Tasks on the panel's timer wheel; OverlayApp runs its periodic checks here too."""
+        return self._runtime
+
+    @property
+    def governor(self) -> CpuGovernor:
+        return self._governor
+
+    def post_ack(self, ack: tuple):
+        """Applies a parse_ack() result on the GUI thread; safe to call from any thread."""
+        self._invoke.emit(lambda: self._process_ack(ack))
+
     def showEvent(self, event):
         super().showEvent(event)
+        self._set_poll_rates(True)
+        self._on_tab_changed(self.tabs.currentIndex())
         if not self._initial_splash_shown:
             self._initial_splash_shown = True
             self.show_toast("Blackbox Loaded!", "OK", 2400)
-        self._schedule(0.05, self._refresh_players)
-        self._schedule(0.08, self._refresh_tp_state)
-        self._schedule(0.11, self._refresh_puzzles)
-        self._schedule(0.14, self._refresh_contract_state)
-        self._schedule(0.17, self._refresh_weapon_state)
+        self._schedule(0.05, self._sync_panel)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._set_poll_rates(False)
+        self._update_subscriptions()
 
     def set_panel_request_cb(self, cb):
         self._panel_request_cb = cb
@@ -2413,13 +2583,11 @@ class ActionPanel(QWidget):
     def _on_weapon_target_changed(self):
         self._set_weapon_focus_label(None, None, self._weapon_target_name(), None)
         self._refresh_weapon_state()
+        self._update_subscriptions()
 
-    def _refresh_weapon_targets(self, current=None):
+    def _refresh_weapon_targets(self):
         if not self.weapon_target_combo:
             return
-        self.weapon_target_combo.blockSignals(True)
-        self.weapon_target_combo.clear()
-
         self_name = self._self_name
         others = []
         for name in self._player_names:
@@ -2428,22 +2596,13 @@ class ActionPanel(QWidget):
             others.append(name)
 
         if not others and not self_name:
-            self.weapon_target_combo.addItem("No Players Found", "SELF")
-            self.weapon_target_combo.setEnabled(False)
+            items = [("No Players Found", "SELF")]
         else:
-            self.weapon_target_combo.setEnabled(True)
-            if self_name:
-                self.weapon_target_combo.addItem(f"{self_name} (Self)", "SELF")
-            else:
-                self.weapon_target_combo.addItem("Self", "SELF")
-            for name in sorted(others, key=lambda s: str(s).lower()):
-                self.weapon_target_combo.addItem(name, name)
-            if current:
-                idx = self.weapon_target_combo.findData(current)
-                if idx >= 0:
-                    self.weapon_target_combo.setCurrentIndex(idx)
-        self.weapon_target_combo.blockSignals(False)
-        self._set_weapon_focus_label(None, None, self._weapon_target_name(), None)
+            items = [(f"{self_name} (Self)" if self_name else "Self", "SELF")]
+            items += [(name, name) for name in sorted(others, key=lambda s: str(s).lower())]
+        self.weapon_target_combo.setEnabled(bool(others or self_name))
+        if sync_combo(self.weapon_target_combo, items):
+            self._set_weapon_focus_label(None, None, self._weapon_target_name(), None)
 
     def _with_target(self, base: str) -> str:
         t = self._target_text()
@@ -2452,12 +2611,36 @@ class ActionPanel(QWidget):
         return base.strip()
 
     def _refresh_players(self):
-        if self._ack_handlers:
-            return
-        cmd_id = self._send("listplayers_gui", "")
-        if not cmd_id:
-            return
-        self._queue_ack(cmd_id, self._handle_players_ack, 2.5)
+        return self._runtime.spawn(self._players_flow())
+
+    async def _players_flow(self):
+        # The ack handler applies the list before this resumes, so the follow-ups
+        # are planned against the new player set.
+        await self._request_refresh("players")
+        await self._player_followups()
+
+    def _player_followups(self) -> CommandFuture:
+        # Only what has gone stale, including tp/weapon when the player set changed.
+        return self._refresh_stale(("tp", "puzzles", "weapon"))
+
+    def _sync_panel(self):
+        return self._runtime.spawn(self._sync_flow())
+
+    async def _sync_flow(self):
+        # Everything the panel shows that is stale, as one batch frame; a player set
+        # that changed in it invalidates tp/weapon answers already fresh before it.
+        await self._refresh_stale(PANEL_SYNC_KEYS)
+        await self._player_followups()
+
+    def _refresh_stale(self, keys) -> CommandFuture:
+        # An answer already in flight was asked for after whatever invalidated it.
+        keys = [k for k in self._planner.plan(keys) if not self._pipeline.busy(k)]
+        for key in keys:
+            if key not in self._pipeline.waiting:
+                self._planner.issued(key)
+        futures = self._pipeline.request_many(keys)
+        self._arm_ack_timer()
+        return gather(futures)
 
     def _goto_player(self):
         t = self._target_text()
@@ -2507,30 +2690,22 @@ class ActionPanel(QWidget):
             return
         self._send("bringweapon", code)
 
-    def _refresh_weapon_state(self):
-        if self._ack_handlers:
-            return False
+    def _weapon_state_arg(self) -> str:
         target = self._weapon_target_name()
-        arg = "" if target.lower() == "self" else target
-        cmd_id = self._send("weapon_gui_state", arg)
-        if not cmd_id:
-            return False
-        self._last_weapon_state_request = time.monotonic()
-        self._queue_ack(cmd_id, self._handle_weapon_state_ack, 1.5)
-        return True
+        return "" if target.lower() == "self" else target
+
+    def _refresh_weapon_state(self):
+        return self._request_refresh("weapon")
 
     def _handle_weapon_state_ack(self, ok: bool, msg: str):
-        if not ok or not msg.startswith("WEAPONSTATE="):
-            return
-        payload = msg[len("WEAPONSTATE="):]
-        data = {}
-        for part in str(payload or "").split("#"):
-            if ":" not in part:
-                continue
-            key, val = part.split(":", 1)
-            data[key.strip().upper()] = val.strip()
+        data = self._ack_topic(ok, msg, "weapon")
+        if data is not None:
+            self._apply_weapon_data(data)
+
+    def _apply_weapon_data(self, data: dict, pushed: bool = False):
         self._weapon_state = data
-        self._apply_weapon_state()
+        self._planner.fresh("weapon", pushed)
+        self._mark_view("weapon")
 
     def _apply_weapon_state(self):
         data = self._weapon_state or {}
@@ -2552,32 +2727,17 @@ class ActionPanel(QWidget):
             name = WEAPON_LABELS.get(code_key, code)
         self._set_weapon_focus_label(name, code_key or code, target, True, cls if cls else None)
 
-    def _tick_weapon_state(self):
-        if not self.isVisible():
-            return
-        if self._ack_handlers:
-            return
-        now = time.monotonic()
-        if (now - self._last_weapon_state_request) < 0.5:
-            return
-        self._refresh_weapon_state()
-
     def _weapon_nearest_distances(self) -> dict:
         out = {}
-        for entry in self._world_entries:
-            if str(entry.get("tag") or "").upper() != "WEAPON":
-                continue
-            code = str(entry.get("code") or "").upper()
-            if not code:
-                continue
-            if str(entry.get("status") or "").lower() == "collected":
-                continue
-            dist = self._world_distance(entry)
-            if dist is None:
+        entries = self._world.entries
+        for row in self.weapon_rows:
+            code = str(row.get("code") or "").upper()
+            if not code or code in out:
                 continue
-            prev = out.get(code)
-            if not prev or dist < prev["dist"]:
-                out[code] = {"dist": dist, "entry": entry}
+            hit = self._world_grid.nearest(self._world_self_pos, 1, "WEAPON", code=code, uncollected=True)
+            if hit:
+                dist, key = hit[0]
+                out[code] = {"dist": dist, "entry": entries[key]}
         return out
 
     def _refresh_weapon_rows(self):
@@ -2646,16 +2806,18 @@ class ActionPanel(QWidget):
         self._send("state_snapshot", "")
 
     def _debug_force_resync(self):
-        self._world_entries = []
+        self._world.clear()
+        # Patches the I/O thread read against its old shadow model are dropped.
+        self._io.reset_world()
         self._world_self_pos = None
-        if self.world_list:
-            self.world_list.clear()
+        if self._world_cols is not None:
+            self._world_cols.rebuild()
+        self._world_grid.rebuild()
+        self._world_rows.reset()
         self._refresh_weapon_rows()
         self._send("state_snapshot", "")
-        self._refresh_players()
-        self._refresh_tp_state()
-        self._refresh_puzzles()
-        self._refresh_contract_state()
+        self._planner.invalidate(*PANEL_SYNC_KEYS)
+        self._sync_panel()
         self._refresh_world()
 
     def _debug_clear_registry(self):
@@ -2680,228 +2842,250 @@ class ActionPanel(QWidget):
         self._set_walkspeed()
 
     def _refresh_tp_state(self):
-        if self._ack_handlers:
-            return False
-        cmd_id = self._send("tp_gui_state", "")
-        if not cmd_id:
-            return False
-        self._queue_ack(cmd_id, self._handle_tp_state_ack, 2.5)
-        return True
+        return self._request_refresh("tp")
 
     def _refresh_puzzles(self):
-        if self._ack_handlers:
-            return False
-        cmd_id = self._send("puzzlestate", "")
-        if not cmd_id:
-            return False
-        self._queue_ack(cmd_id, self._handle_puzzles_ack, 2.5)
-        return True
+        return self._request_refresh("puzzles")
 
     def _refresh_contract_state(self):
-        if self._ack_handlers:
-            return False
-        cmd_id = self._send("contract_gui_state", "")
-        if not cmd_id:
-            return False
-        self._queue_ack(cmd_id, self._handle_contract_state_ack, 2.5)
-        return True
+        return self._request_refresh("contracts")
 
     def _refresh_world(self):
-        if self._ack_handlers:
-            return False
         cmd_id = self._send("world_registry_scan", "")
+        if cmd_id:
+            self._planner.issued("world")
         return bool(cmd_id)
 
-    def _queue_followup_refreshes(self):
-        self._enqueue_refresh("tp")
-        self._enqueue_refresh("puzzles")
-        self._run_refresh_queue()
-
-    def _enqueue_refresh(self, key: str):
-        if key not in self._refresh_queue:
-            self._refresh_queue.append(key)
-
-    def _run_refresh_queue(self):
-        if self._ack_handlers or not self._refresh_queue:
+    def _request_refresh(self, key: str) -> CommandFuture:
+        # Independent queries go out together, up to the in-flight window and in
+        # priority order; user actions go straight through _send. See CommandPipeline.
+        if key not in self._pipeline.waiting:
+            self._planner.issued(key)
+        fut = self._pipeline.request(key)
+        self._arm_ack_timer()
+        return fut
+
+    def _current_tab(self) -> str:
+        idx = self.tabs.currentIndex()
+        return self._tab_names[idx] if 0 <= idx < len(self._tab_names) else ""
+
+    def _tab_shown(self, name: str) -> bool:
+        return self.isVisible() and self._current_tab() == name
+
+    def _views_shown(self, tabs) -> bool:
+        return self.isVisible() and (not tabs or self._current_tab() in tabs)
+
+    def _on_tab_changed(self, _index: int):
+        # Parked views for the new tab catch up once from the latest payload.
+        if self._tab_shown("World"):
+            self._refresh_world_list()
+        self._arm_frame_timer()
+        self._update_subscriptions()
+
+    def _subscription_spec(self) -> str:
+        if not self.isVisible():
+            return ""
+        tab = self._current_tab()
+        specs = []
+        for topic, hz in TOPIC_RATES_HZ.items():
+            if tab not in TOPIC_TABS.get(topic, ()):
+                continue
+            spec = f"{topic}:{hz:g}"
+            if topic == "weapon":
+                target = self._weapon_state_arg()
+                if target:
+                    spec += f":{self._encode_arg(target)}"
+            specs.append(spec)
+        return " ".join(specs)
+
+    def _update_subscriptions(self):
+        # Lua only produces topics the current tab shows; the list replaces the last one.
+        spec = self._subscription_spec()
+        if spec == self._subs_spec:
             return
-        next_key = self._refresh_queue[0]
-        started = False
-        if next_key == "tp":
-            started = self._refresh_tp_state()
-        elif next_key == "puzzles":
-            started = self._refresh_puzzles()
-        elif next_key == "contracts":
-            started = self._refresh_contract_state()
-        if started:
-            self._refresh_queue.pop(0)
-
-    def _queue_ack(self, cmd_id, handler, timeout_s: float):
-        try:
-            ack_id = str(cmd_id)
-            deadline = time.monotonic() + float(timeout_s)
-            self._ack_handlers[ack_id] = (deadline, handler)
-        except Exception:
-            pass
-
-    def _cleanup_acks(self):
-        now = time.monotonic()
-        expired = [k for k, v in self._ack_handlers.items() if v[0] < now]
-        for k in expired:
-            del self._ack_handlers[k]
-
-    def _on_ack_changed(self, _path: str):
-        self._cleanup_acks()
-        try:
-            if not self._ack_path:
-                return
-            with open(self._ack_path, "r", encoding="utf-8") as f:
-                line = (f.read() or "").strip()
-        except Exception:
+        self._subs_spec = spec
+        fut = self._call("subscribe", spec, 2.5)
+
+        def _done(f):
+            if f.exception() is not None or not f.result()[0]:
+                # Ask again on the next tab/visibility change.
+                if self._subs_spec == spec:
+                    self._subs_spec = None
+
+        fut.add_done_callback(_done)
+
+    def _set_poll_rates(self, shown: bool):
+        # Hidden rates are already slow; only the shown ones follow the CPU governor.
+        scale = self._governor.scale
+        self._io.set_state_interval(int(250 * scale) if shown else HIDDEN_POLL_MS)
+        if self._state_block is not None:
+            # Under the 1s liveness window, so _on_state_read keeps trusting the block.
+            self._state_block_timer.setInterval(int(STATE_BLOCK_POLL_MS * scale) if shown else HIDDEN_POLL_MS // 2)
+
+    def _govern(self):
+        focused = self.isVisible() and self.isActiveWindow()
+        if self._governor.sample(focused):
+            self._apply_governor()
+
+    def _apply_governor(self):
+        scale = self._governor.scale
+        self._frames.set_rate(UI_FRAME_HZ / scale, UI_FRAME_BUDGET_MS / 1000.0 / scale)
+        self._set_poll_rates(self.isVisible())
+        for mgr in (self._toast_mgr, self._toast_mgr_external):
+            if mgr is not None:
+                mgr.set_frame_ms(int(TOAST_FRAME_MS * scale))
+
+    def _mark_view(self, name: str, *args):
+        # Widgets re-render on the next frame flush rather than once per payload.
+        self._frames.mark(name, *args)
+        self._arm_frame_timer()
+
+    def _arm_frame_timer(self):
+        if self._frame_timer.isActive():
             return
-        if not line:
+        due = self._frames.due_in()
+        if due is not None:
+            self._frame_timer.start(int(due * 1000))
+
+    def _flush_frame(self):
+        self._frames.flush()
+        self._arm_frame_timer()
+
+    def _arm_ack_timer(self):
+        # One timer for both ack deadlines and paced queries waiting on their class budget.
+        times = [t for t in (self._bridge.next_deadline() if self._bridge is not None else None,
+                             self._pipeline.next_ready()) if t is not None]
+        if not times:
+            self._ack_timer.stop()
             return
+        self._ack_timer.start(max(0, int((min(times) - time.monotonic()) * 1000) + 1))
+
+    def _on_ack_timeout(self):
+        # Rejects futures whose ack never came, which frees their pipeline slot.
+        if self._bridge is not None:
+            self._bridge.expire()
+        self._pipeline.pump()
+        self._arm_ack_timer()
+
+    def _on_bridge_io(self, kind: str, value):
+        # Read and parsed on the I/O thread; only models and widgets change here.
+        if kind == "acks":
+            for parsed in value:
+                self._process_ack(parsed)
+        elif kind == "notices":
+            for line, topic in value:
+                self._process_notice_line(line, topic)
+        elif kind == "world":
+            self._apply_world_patch(value)
+        elif kind == "state":
+            self._on_state_read(*value)
+
+    def _process_ack(self, ack: tuple):
+        # parse_ack() output, from the I/O thread or the socket transport's thread.
         self._last_ack_time = time.monotonic()
-        parts = line.split("|", 3)
-        if len(parts) < 4 or parts[0] != "ACK":
-            return
-        ack_id = parts[1]
-        ok = parts[2] == "1"
-        msg = parts[3] or ""
-        handler_entry = self._ack_handlers.get(ack_id)
-        if not handler_entry:
-            if ack_id == "0":
-                if msg.startswith("PUZZLES="):
-                    payload = msg[len("PUZZLES="):]
-                    self._apply_puzzles_state(payload)
-                elif msg.startswith("TPSTATE="):
-                    payload = msg[len("TPSTATE="):]
-                    self._apply_tp_state(payload)
-                elif msg.startswith("CONTRACTS="):
-                    payload = msg[len("CONTRACTS="):]
-                    self._apply_contract_state(payload)
-            return
-        _, handler = handler_entry
-        del self._ack_handlers[ack_id]
-        try:
-            handler(ok, msg)
-        except Exception:
-            pass
-
+        ack_id, ok, msg, topics = ack
+        # Query handlers run inside resolve() and look their payload up here.
+        self._ack_topics = topics
         try:
-            if self._ack_path and self._ack_path not in self._ack_watcher.files():
-                self._ack_watcher.addPath(self._ack_path)
-        except Exception:
-            pass
+            resolved = self._bridge is not None and self._bridge.resolve(ack_id, ok, msg)
+        finally:
+            self._ack_topics = {}
+        if not resolved and ack_id == "0":
+            # Topic publishes also come as id-0 acks (the socket path's push channel).
+            self._apply_topic(topics.get(msg))
+        self._arm_ack_timer()
+
+    def _ack_topic(self, ok: bool, msg: str, key: str):
+        # Parsed payload of a query ack (or of one piece of a batch ack).
+        topic = self._ack_topics.get(msg) if ok else None
+        if topic is None or topic[0] != key:
+            return None
+        return topic[1]
 
     def _handle_players_ack(self, ok: bool, msg: str):
-        if not ok or not msg.startswith("PLAYERS="):
+        players = self._ack_topic(ok, msg, "players")
+        if players is None:
             return
-        payload = msg[len("PLAYERS="):]
-        self._apply_player_list(payload)
-        self._run_refresh_queue()
+        self._planner.fresh("players")
+        self._apply_player_list(players)
 
     def _handle_tp_state_ack(self, ok: bool, msg: str):
-        if not ok or not msg.startswith("TPSTATE="):
+        state = self._ack_topic(ok, msg, "tp")
+        if state is None:
             return
-        payload = msg[len("TPSTATE="):]
-        self._apply_tp_state(payload)
-        self._run_refresh_queue()
+        self._planner.fresh("tp")
+        self._apply_tp_state(state)
 
     def _handle_puzzles_ack(self, ok: bool, msg: str):
-        if not ok or not msg.startswith("PUZZLES="):
+        state = self._ack_topic(ok, msg, "puzzles")
+        if state is None:
             return
-        payload = msg[len("PUZZLES="):]
-        self._apply_puzzles_state(payload)
-        self._run_refresh_queue()
+        self._planner.fresh("puzzles")
+        self._apply_puzzles_state(state)
 
     def _handle_contract_state_ack(self, ok: bool, msg: str):
-        if not ok or not msg.startswith("CONTRACTS="):
-            return
-        payload = msg[len("CONTRACTS="):]
-        self._apply_contract_state(payload)
-        self._run_refresh_queue()
-
-    def _on_notice_changed(self, _path: str):
-        try:
-            if not self._notice_path:
-                return
-            p = Path(self._notice_path)
-            if not p.exists():
-                p.write_text("", encoding="utf-8")
-                self._notice_watcher.addPath(self._notice_path)
-                return
-            data = p.read_text(encoding="utf-8") if p.stat().st_size > 0 else ""
-        except Exception:
-            return
-
-        line = ""
-        for raw in (data or "").splitlines():
-            if raw.strip():
-                line = raw.strip()
-        if not line:
+        state = self._ack_topic(ok, msg, "contracts")
+        if state is None:
             return
-        self._process_notice_line(line)
+        self._planner.fresh("contracts")
+        self._apply_contract_state(state)
 
-        try:
-            if self._notice_path not in self._notice_watcher.files():
-                self._notice_watcher.addPath(self._notice_path)
-        except Exception:
-            pass
-
-    def _on_registry_changed(self, _path: str):
-        try:
-            if not self._registry_path:
-                return
-            p = Path(self._registry_path)
-            if not p.exists():
-                p.write_text("", encoding="utf-8")
-                self._registry_watcher.addPath(self._registry_path)
-                return
-            data = p.read_text(encoding="utf-8") if p.stat().st_size > 0 else ""
-        except Exception:
+    def _apply_world_patch(self, patch: dict):
+        if patch.get("gen") != self._io.world_gen:
             return
-
-        line = ""
-        for raw in (data or "").splitlines():
-            if raw.strip():
-                line = raw.strip()
-        if not line:
+        if patch.get("resync"):
+            # Missed a delta or never saw the keyframe: ask Lua for a fresh one.
+            self._request_bridge_proto(force=True)
+        if not patch.get("applied"):
             return
-        self._process_registry_line(line)
-
-        try:
-            if self._registry_path not in self._registry_watcher.files():
-                self._registry_watcher.addPath(self._registry_path)
-        except Exception:
-            pass
+        self._world.apply_patch(patch)
+        self._apply_world_model()
+        self._last_registry_update = time.monotonic()
+        self._planner.fresh("world", pushed=True)
 
-    def _process_notice_line(self, line: str):
+    def _process_notice_line(self, line: str, topic=None):
         if not line:
             return
-        if self._handle_toast_notice(line):
+        taken = self._bridge.publish(line) if self._bridge is not None else 0
+        if line.startswith(TOAST_NOTICE_PREFIXES):
+            # Normally shown by _toast_notices, paced.
+            if not taken:
+                self._handle_toast_notice(line)
             return
-        if line == self._last_notice_line:
+        if self._apply_topic(topic):
             return
-        self._last_notice_line = line
-
-        if line.startswith("PLAYERS="):
-            payload = line[len("PLAYERS="):]
-            self._apply_player_list(payload)
-        elif line.startswith("TPSTATE="):
-            payload = line[len("TPSTATE="):]
-            self._apply_tp_state(payload)
-        elif line.startswith("PUZZLES="):
-            payload = line[len("PUZZLES="):]
-            self._apply_puzzles_state(payload)
-        elif line.startswith("CONTRACTS="):
-            payload = line[len("CONTRACTS="):]
-            self._apply_contract_state(payload)
-        elif line.startswith("PANEL="):
+        if line.startswith("PANEL="):
             payload = line[len("PANEL="):]
             self._apply_panel_state(payload)
         else:
             self.show_toast(line, "INFO", 2200)
 
+    def _apply_topic(self, topic) -> bool:
+        """A pushed topic payload (notice or id-0 ack) as parse_topic() returns it; False for None."""
+        if topic is None:
+            return False
+        key, data = topic
+        if key == "weapon":
+            self._apply_weapon_data(data, pushed=True)
+            return True
+        self._planner.fresh(key, pushed=True)
+        apply = {
+            "players": self._apply_player_list,
+            "tp": self._apply_tp_state,
+            "puzzles": self._apply_puzzles_state,
+            "contracts": self._apply_contract_state,
+        }.get(key)
+        if apply is not None:
+            apply(data)
+        if key == "players":
+            self._player_followups()
+        return True
+
+    async def _toast_notices(self):
+        async for line in self._toast_stream:
+            self._handle_toast_notice(line)
+            await self._runtime.sleep(TOAST_PACE_S)
+
     def _handle_toast_notice(self, line: str) -> bool:
         if not line:
             return False
@@ -2944,54 +3128,35 @@ class ActionPanel(QWidget):
             self.show_toast(text, level, duration)
         return True
 
-    def _process_registry_line(self, line: str):
-        if not line:
-            return
-        if line == self._last_registry_line:
-            return
-        self._last_registry_line = line
-        if line.startswith("WORLD="):
-            payload = line[len("WORLD="):]
-            self._apply_world_list(payload)
-            self._last_registry_update = time.monotonic()
+    def _state_block_active(self) -> bool:
+        return self._state_block is not None and (time.monotonic() - self._state_block_live) < 1.0
 
-    def _poll_state(self):
-        try:
-            if not self._state_path:
-                return
-            p = Path(self._state_path)
-            if not p.exists():
-                return
-            data = p.read_text(encoding="utf-8") if p.stat().st_size > 0 else ""
-        except Exception:
+    def _poll_state_block(self):
+        # Two memory loads when nothing changed; no file I/O once the block is mapped.
+        data = self._state_block.read()
+        if data is None:
             return
-
-        line = ""
-        for raw in (data or "").splitlines():
-            if raw.strip():
-                line = raw.strip()
-        if not line:
+        now = time.monotonic()
+        self._last_state_read = now
+        self._state_block_live = now
+        self._apply_state_data(data)
+
+    def _on_state_read(self, changed: bool, data: dict | None):
+        if self._state_block_active():
+            # Fresh snapshots arrive through the mapped block; only age the freshness labels here.
+            self._mark_state_views()
             return
         self._last_state_read = time.monotonic()
-        if line != self._last_state_line:
-            self._last_state_line = line
-            self._parse_state_line(line)
+        if changed:
+            if data is not None:
+                self._apply_state_data(data)
         else:
             # Still update freshness-based UI
-            self._update_info_bar()
-            self._update_debug_fields()
+            self._mark_state_views()
 
-    def _parse_state_line(self, line: str):
-        if not line.startswith("STATE="):
-            return
-        payload = line[len("STATE="):]
-        data = {}
-        for part in str(payload or "").split("#"):
-            if ":" not in part:
-                continue
-            key, val = part.split(":", 1)
-            data[key.strip().upper()] = val.strip()
+    def _apply_state_data(self, data: dict):
         self._state_data = data
+        self._sync_bridge_proto(data)
         panel_val = data.get("PANEL")
         if panel_val is not None:
             self._apply_panel_state(panel_val)
@@ -2999,67 +3164,94 @@ class ActionPanel(QWidget):
             self._last_state_write = float(data.get("STATEWRITE", "0") or 0)
         except Exception:
             self._last_state_write = 0.0
-        self._update_info_bar()
-        self._update_debug_fields()
-        self._update_contract_actions()
+        self._mark_state_views()
+
+    def _mark_state_views(self):
+        self._mark_view("state")
+        self._mark_view("debug")
+        self._mark_view("contract_actions")
+
+    def _sync_bridge_proto(self, data: dict):
+        try:
+            peer = int(data.get("PROTO", "1") or 1)
+            active = int(data.get("PROTOACT", "1") or 1)
+        except Exception:
+            return
+        self._proto_active = active
+        want = min(peer, BRIDGE_PROTO)
+        if want <= 1:
+            return
+        # Re-negotiate after a Lua restart, and ask for a keyframe if we have none yet.
+        if active != want or self._world.keyframe_id == 0:
+            self._request_bridge_proto()
+
+    def _request_bridge_proto(self, force: bool = False):
+        try:
+            want = min(int(self._state_data.get("PROTO", "1") or 1), BRIDGE_PROTO)
+        except Exception:
+            want = 1
+        if want <= 1:
+            return
+        now = time.monotonic()
+        if (now - self._proto_last_request) < (0.5 if force else 2.0):
+            return
+        self._proto_last_request = now
+        self._send("bridge_proto", str(want))
 
     def _apply_panel_state(self, payload: str):
         val = str(payload or "").strip().lower()
         open_value = val in ("1", "true", "on", "open", "show", "yes")
         self._emit_panel_request(open_value)
 
-    def _apply_player_list(self, payload: str):
-        entries = [e for e in str(payload or "").split(";") if e]
-        current = self.target_combo.currentData()
-        tp_current = self.tp_target_combo.currentData() if self.tp_target_combo else None
-        weapon_current = self.weapon_target_combo.currentData() if self.weapon_target_combo else None
-        self.target_combo.blockSignals(True)
-        self.target_combo.clear()
-
-        self_name = None
-        names = []
-        for entry in entries:
-            if entry.startswith("SELF:"):
-                self_name = entry[5:]
-            elif entry.startswith("P:"):
-                names.append(entry[2:])
-            else:
-                names.append(entry)
-
-        names = [n for n in names if n]
-        all_names = set(names)
+    def _apply_player_list(self, players: dict):
+        # The model updates on every payload; only the widgets wait for a frame.
+        self_name = players["self"]
+        positions = players["positions"]
+        all_names = set(players["names"])
         if self_name:
             all_names.add(self_name)
         player_names = sorted(all_names, key=lambda s: str(s).lower())
+        # Positions move every update; only the set of players feeds the combos.
+        changed = (player_names != self._player_names or self_name != self._self_name
+                   or positions.keys() != self._player_pos.keys())
+        self._player_pos = positions
         self._player_names = player_names
         self._self_name = self_name
+        self._player_list = players
+        if changed:
+            self._players_changed = True
+            # tp destinations and the weapon target depend on who is in the session;
+            # the caller's _player_followups() re-queries them.
+            self._planner.invalidate("tp", "weapon")
+        self._mark_view("players")
+
+    def _refresh_player_views(self):
+        names = self._player_list["names"]
+        self_name = self._self_name
+        changed, self._players_changed = self._players_changed, False
+        items = []
         if not names and not self_name:
-            self.target_combo.addItem("No Players Found", "")
-            self.target_combo.setEnabled(False)
+            items.append(("No Players Found", ""))
         else:
-            self.target_combo.setEnabled(True)
             self_lower = str(self_name or "").strip().lower()
             added_self = False
             for name in sorted(names, key=lambda s: str(s).lower()):
                 if self_lower and str(name).strip().lower() == self_lower:
-                    self.target_combo.addItem(f"{name} (Self)", "SELF")
+                    items.append((f"{name} (Self)", "SELF"))
                     added_self = True
                 else:
-                    self.target_combo.addItem(name, name)
+                    items.append((name, name))
             if (not added_self) and self_name:
-                self.target_combo.addItem(f"{self_name} (Self)", "SELF")
-            if current:
-                idx = self.target_combo.findData(current)
-                if idx >= 0:
-                    self.target_combo.setCurrentIndex(idx)
-        self.target_combo.blockSignals(False)
-        self._refresh_tp_targets(tp_current)
+                items.append((f"{self_name} (Self)", "SELF"))
+        self.target_combo.setEnabled(bool(names or self_name))
+        if not sync_combo(self.target_combo, items) and not changed:
+            return
+        self._refresh_tp_targets()
         self._refresh_tp_destinations()
-        self._refresh_weapon_targets(weapon_current)
-        self._schedule(0.2, self._refresh_weapon_state)
+        self._refresh_weapon_targets()
+        self._refresh_world_origins()
         self._update_target_actions()
         self._update_tp_actions()
-        self._queue_followup_refreshes()
 
     def _player_label(self, name: str) -> str:
         name = str(name or "")
@@ -3069,190 +3261,58 @@ class ActionPanel(QWidget):
             return f"{name} (Self)"
         return name
 
-    def _refresh_tp_targets(self, current=None):
+    def _refresh_tp_targets(self) -> bool:
         if not self.tp_target_combo:
-            return
-        self.tp_target_combo.blockSignals(True)
-        self.tp_target_combo.clear()
+            return False
         if not self._player_names:
-            self.tp_target_combo.addItem("No Players Found", "")
-            self.tp_target_combo.setEnabled(False)
+            items = [("No Players Found", "")]
         else:
-            self.tp_target_combo.setEnabled(True)
-            for name in self._player_names:
-                self.tp_target_combo.addItem(self._player_label(name), name)
-            if current:
-                idx = self.tp_target_combo.findData(current)
-                if idx >= 0:
-                    self.tp_target_combo.setCurrentIndex(idx)
-        self.tp_target_combo.blockSignals(False)
+            items = [(self._player_label(name), name) for name in self._player_names]
+        self.tp_target_combo.setEnabled(bool(self._player_names))
+        return sync_combo(self.tp_target_combo, items)
 
     def _refresh_tp_map_combo(self):
         tps = list(self._tp_state.get("teleports") or [])
-        current = self.tp_map_combo.currentData()
-        self.tp_map_combo.blockSignals(True)
-        self.tp_map_combo.clear()
-        for key, name in tps:
-            self.tp_map_combo.addItem(str(name), str(key))
-        self.tp_map_combo.blockSignals(False)
-        if current:
-            idx = self.tp_map_combo.findData(current)
-            if idx >= 0:
-                self.tp_map_combo.setCurrentIndex(idx)
+        items = [(str(name), str(key)) for key, name in tps]
+        sync_combo(self.tp_map_combo, items)
         self.tp_map_empty_lbl.setVisible(len(tps) == 0)
-
-        current_all = self.tp_all_combo.currentData()
-        self.tp_all_combo.blockSignals(True)
-        self.tp_all_combo.clear()
-        for key, name in tps:
-            self.tp_all_combo.addItem(str(name), str(key))
-        self.tp_all_combo.blockSignals(False)
-        if current_all:
-            idx = self.tp_all_combo.findData(current_all)
-            if idx >= 0:
-                self.tp_all_combo.setCurrentIndex(idx)
+        sync_combo(self.tp_all_combo, items)
 
     def _refresh_tp_destinations(self):
         if not self.tp_dest_combo:
             return
         target = self._tp_target_name()
-        current = self.tp_dest_combo.currentData()
-        self.tp_dest_combo.blockSignals(True)
-        self.tp_dest_combo.clear()
-
         tps = list(self._tp_state.get("teleports") or [])
-        for key, name in tps:
-            self.tp_dest_combo.addItem(f"TP: {name}", f"TP:{key}")
-
+        items = [(f"TP: {name}", f"TP:{key}") for key, name in tps]
         for name in self._player_names:
             if target and str(name).strip().lower() == str(target).strip().lower():
                 continue
             label = self._player_label(name)
-            self.tp_dest_combo.addItem(f"Player: {label}", f"P:{name}")
+            items.append((f"Player: {label}", f"P:{name}"))
 
-        if self.tp_dest_combo.count() == 0:
-            self.tp_dest_combo.addItem("No Destinations", "")
-            self.tp_dest_combo.setEnabled(False)
-        else:
-            self.tp_dest_combo.setEnabled(True)
-            if current:
-                idx = self.tp_dest_combo.findData(current)
-                if idx >= 0:
-                    self.tp_dest_combo.setCurrentIndex(idx)
-        self.tp_dest_combo.blockSignals(False)
+        self.tp_dest_combo.setEnabled(bool(items))
+        sync_combo(self.tp_dest_combo, items or [("No Destinations", "")])
 
     # ----------------- Teleport UI -----------------
-    def _apply_tp_state(self, payload: str):
-        state = {
-            "map": "Unknown",
-            "pawn": False,
-            "return": False,
-            "teleports": [],
-            "near": {},
-            "others": 0,
-        }
-        for part in str(payload or "").split("#"):
-            if ":" not in part:
-                continue
-            key, val = part.split(":", 1)
-            key = key.strip().upper()
-            val = val.strip()
-            if key == "MAP":
-                state["map"] = val or "Unknown"
-            elif key == "PAWN":
-                state["pawn"] = val == "1"
-            elif key == "RETURN":
-                state["return"] = val == "1"
-            elif key == "OTHERS":
-                try:
-                    state["others"] = int(val)
-                except Exception:
-                    state["others"] = 0
-            elif key == "TPS":
-                tps = []
-                for entry in val.split(","):
-                    if "=" not in entry:
-                        continue
-                    k, n = entry.split("=", 1)
-                    k = k.strip()
-                    n = n.strip()
-                    if k:
-                        tps.append((k, n or k))
-                state["teleports"] = tps
-            elif key == "NEAR":
-                near = {}
-                for entry in val.split(","):
-                    if "=" not in entry:
-                        continue
-                    k, v = entry.split("=", 1)
-                    near[k.strip().upper()] = v.strip() == "1"
-                state["near"] = near
-
+    def _apply_tp_state(self, state: dict):
+        if state == self._tp_state:
+            return
         self._tp_state = state
-        self.tp_map_lbl.setText(f"Map: {state['map']}")
+        self._mark_view("tp")
+
+    def _refresh_tp_views(self):
+        self.tp_map_lbl.setText(f"Map: {self._tp_state['map']}")
         self._refresh_tp_map_combo()
         self._refresh_tp_destinations()
         self._update_tp_actions()
 
     # ----------------- Puzzles UI -----------------
-    def _parse_pipe_string(self, value: str):
-        out = []
-        for ch in list(str(value or ""))[:8]:
-            if ch == "1":
-                out.append(True)
-            elif ch == "0":
-                out.append(False)
-            else:
-                out.append(None)
-        while len(out) < 8:
-            out.append(None)
-        return out
-
-    def _parse_air_entries(self, value: str):
-        entries = []
-        for part in str(value or "").split(","):
-            part = part.strip()
-            if not part or "=" not in part:
-                continue
-            letter, val = part.split("=", 1)
-            letter = letter.strip() or "?"
-            val = val.strip()
-            if val == "1":
-                v = True
-            elif val == "0":
-                v = False
-            else:
-                v = None
-            entries.append({"letter": letter, "valid": v})
-        return entries
-
-    def _apply_puzzles_state(self, payload: str):
-        state = {
-            "pipe_found": False,
-            "pipe_red": [None] * 8,
-            "pipe_blue": [None] * 8,
-            "air_found": False,
-            "air_entries": [],
-        }
-        for part in str(payload or "").split("#"):
-            if ":" not in part:
-                continue
-            key, val = part.split(":", 1)
-            key = key.strip().upper()
-            val = val.strip()
-            if key == "PIPEFOUND":
-                state["pipe_found"] = val == "1"
-            elif key == "PIPER":
-                state["pipe_red"] = self._parse_pipe_string(val)
-            elif key == "PIPEB":
-                state["pipe_blue"] = self._parse_pipe_string(val)
-            elif key == "AIRFOUND":
-                state["air_found"] = val == "1"
-            elif key == "AIR":
-                state["air_entries"] = self._parse_air_entries(val)
-
+    def _apply_puzzles_state(self, state: dict):
         self._puzzle_state = state
+        self._mark_view("puzzles")
 
+    def _refresh_puzzle_views(self):
+        state = self._puzzle_state
         pipe_status = "Found" if state["pipe_found"] else "Not Found"
         air_status = "Found" if state["air_found"] else "Not Found"
         self.puzzle_status_lbl.setText(f"Status: Pipes={pipe_status} | Airlock={air_status}")
@@ -3291,16 +3351,6 @@ class ActionPanel(QWidget):
         self._update_puzzle_actions()
 
     # ----------------- Contract UI -----------------
-    def _parse_contract_kv(self, value: str):
-        out = {}
-        for part in str(value or "").split(","):
-            part = part.strip()
-            if not part or "=" not in part:
-                continue
-            key, val = part.split("=", 1)
-            out[key.strip()] = val.strip()
-        return out
-
     def _parse_contract_bool(self, value: str):
         val = str(value or "").strip().lower()
         if val in ("1", "true", "on", "yes"):
@@ -3398,56 +3448,11 @@ class ActionPanel(QWidget):
             self.contract_age_lbl.setText(f"Hook Age: {age:.1f}s")
         self.contract_props_lbl.setText(f"Props: {props}")
 
-    def _apply_contract_state(self, payload: str):
-        state = {
-            "ready": False,
-            "map": "Unknown",
-            "lists": 0,
-            "first": False,
-            "props": 0,
-            "hooks": 0,
-            "age": None,
-            "types": {},
-            "values": {},
-        }
-        for part in str(payload or "").split("#"):
-            if ":" not in part:
-                continue
-            key, val = part.split(":", 1)
-            key = key.strip().upper()
-            val = val.strip()
-            if key == "READY":
-                state["ready"] = val == "1"
-            elif key == "MAP":
-                state["map"] = val or "Unknown"
-            elif key == "LISTS":
-                try:
-                    state["lists"] = int(val)
-                except Exception:
-                    state["lists"] = 0
-            elif key == "FIRST":
-                state["first"] = val == "1"
-            elif key == "PROPS":
-                try:
-                    state["props"] = int(val)
-                except Exception:
-                    state["props"] = 0
-            elif key == "HOOKS":
-                try:
-                    state["hooks"] = int(val)
-                except Exception:
-                    state["hooks"] = 0
-            elif key == "AGE":
-                try:
-                    state["age"] = float(val)
-                except Exception:
-                    state["age"] = None
-            elif key == "TYPES":
-                state["types"] = self._parse_contract_kv(val)
-            elif key == "VALUES":
-                state["values"] = self._parse_contract_kv(val)
-
+    def _apply_contract_state(self, state: dict):
         self._contract_state = state
+        self._mark_view("contracts")
+
+    def _refresh_contract_views(self):
         self._sync_contract_controls_from_state()
         self._update_contract_actions()
 
@@ -3525,56 +3530,26 @@ class ActionPanel(QWidget):
         self._schedule(0.15, self._refresh_contract_state)
 
     # ----------------- World Registry UI -----------------
-    def _apply_world_list(self, payload: str):
-        entries = []
-        self_pos = None
-        for raw in str(payload or "").split(";"):
-            raw = raw.strip()
-            if not raw:
-                continue
-            parts = raw.split(",")
-            tag = parts[0].strip() if len(parts) > 0 else ""
-            code = parts[1].strip() if len(parts) > 1 else ""
-            name = parts[2].strip() if len(parts) > 2 else ""
-            x = parts[3].strip() if len(parts) > 3 else ""
-            y = parts[4].strip() if len(parts) > 4 else ""
-            z = parts[5].strip() if len(parts) > 5 else ""
-            entry_id = parts[6].strip() if len(parts) > 6 else ""
-            status = parts[7].strip() if len(parts) > 7 else ""
-
-            if tag.upper() == "SELF":
-                try:
-                    self_pos = {
-                        "x": float(x),
-                        "y": float(y),
-                        "z": float(z),
-                    }
-                except Exception:
-                    self_pos = None
-                continue
-
-            def _num(v):
-                try:
-                    return float(v)
-                except Exception:
-                    return None
-
-            entries.append({
-                "tag": tag.upper(),
-                "code": code,
-                "name": name,
-                "x": _num(x),
-                "y": _num(y),
-                "z": _num(z),
-                "id": entry_id,
-                "status": status.upper() if status else "UNKNOWN",
-            })
-
-        self._world_entries = entries
-        self._world_self_pos = self_pos
-        self.world_count_lbl.setText(f"Items: {len(entries)}")
-        self._refresh_world_list()
-        self._refresh_weapon_rows()
+    def _apply_world_model(self):
+        if self._world_cols is not None:
+            self._world_cols.sync()
+        self._world_grid.sync()
+        self._world_self_pos = self._world.self_pos
+        # The list model follows every delta while the World tab is up (it diffs
+        # against the previous one); hidden, it resets once when the tab returns.
+        # Counts, the nearby chip and weapon rows only need the latest state.
+        if self._tab_shown("World"):
+            self._refresh_world_list()
+        self._mark_view("world")
+        self._mark_view("weapon_rows")
+
+    def _refresh_world_views(self):
+        self.world_count_lbl.setText(f"Items: {len(self._world.entries)}")
+        if self._world_self_pos:
+            near = self._world_grid.within(self._world_self_pos, WORLD_NEAR_RADIUS, "MONSTER", uncollected=True)
+            self.world_near_lbl.setText(f"Monsters Nearby: {len(near)}")
+        else:
+            self.world_near_lbl.setText("Monsters Nearby: --")
 
     def _state_str(self, key: str, default: str = "--") -> str:
         return str(self._state_data.get(str(key).upper(), default))
@@ -3616,7 +3591,9 @@ class ActionPanel(QWidget):
         self.info_pawn_lbl.setText(f"PAWN: {'OK' if pawn_ok else 'NONE' if pawn_ok is False else '--'}")
         self.info_radar_lbl.setText(f"RADAR: {'ON' if radar_on else 'OFF' if radar_on is False else '--'}")
         self.info_tracked_lbl.setText(f"TRACKED: {tracked}")
-        self.info_events_lbl.setText(f"EVENTS: {'OK' if events_ok else 'STALE'}")
+        # Registry updates only flow while a world tab is subscribed.
+        events_txt = "OK" if events_ok else "STALE" if "world:" in (self._subs_spec or "") else "IDLE"
+        self.info_events_lbl.setText(f"EVENTS: {events_txt}")
         self.info_bridge_lbl.setText(f"BRIDGE: {'OK' if bridge_ok else 'STALE'}")
 
     def _update_debug_fields(self):
@@ -3631,16 +3608,24 @@ class ActionPanel(QWidget):
         self.debug_world_lbl.setText(f"World Ready: {str(world_ready).lower() if world_ready is not None else '--'}")
         self.debug_pawn_lbl.setText(f"Pawn: {'valid' if pawn_ok else 'invalid' if pawn_ok is False else '--'}")
 
-        if self._world_self_pos:
-            x = self._world_self_pos.get("x", 0.0)
-            y = self._world_self_pos.get("y", 0.0)
-            z = self._world_self_pos.get("z", 0.0)
+        self_pos = self._world_self_pos
+        if self._state_block_active() and self._state_block.self_pos:
+            self_pos = self._state_block.self_pos
+        if self_pos:
+            x = self_pos.get("x", 0.0)
+            y = self_pos.get("y", 0.0)
+            z = self_pos.get("z", 0.0)
             self.debug_pos_lbl.setText(f"Local Pos: {x:.1f} {y:.1f} {z:.1f}")
         else:
             self.debug_pos_lbl.setText("Local Pos: --")
 
         self.debug_radar_lbl.setText(f"Radar: {'enabled' if radar_on else 'disabled' if radar_on is False else '--'}")
-        self.debug_proto_lbl.setText(f"Protocol: {proto}")
+        proto_act = self._state_str("PROTOACT", "--")
+        if self._world.keyframe_id:
+            stream = f"delta kf {self._world.keyframe_id} seq {self._world.seq} ({self._world.resyncs} resyncs)"
+        else:
+            stream = "snapshots"
+        self.debug_proto_lbl.setText(f"Protocol: {proto} (active {proto_act}, world {stream})")
 
         total = self._state_str("REGTOTAL", "0")
         mon = self._state_str("MON", "0")
@@ -3678,6 +3663,8 @@ class ActionPanel(QWidget):
             write_age = now - self._last_state_read
             write_txt = f"{write_age:.1f}s ago"
         read_txt = f"{(now - self._last_state_read):.1f}s ago" if self._last_state_read > 0 else "--"
+        if self._state_block_active():
+            read_txt += f" (mmap seq {self._state_block.seq}, {self._state_block.torn} retries)"
         self.debug_state_write_lbl.setText(f"State Write: {write_txt}")
         self.debug_state_read_lbl.setText(f"State Read: {read_txt}")
 
@@ -3689,47 +3676,35 @@ class ActionPanel(QWidget):
                 cmd_txt = f"{self._last_cmd_sent} | ack {ack_age:.1f}s"
             else:
                 cmd_txt = f"{self._last_cmd_sent} | sent {cmd_age:.1f}s"
+        pipe = self._pipeline
+        cmd_txt += (f" | in flight {pipe.inflight_frames()}/{pipe.window}, queued {len(pipe.queue)}, "
+                    f"coalesced {pipe.coalesced}, batched {pipe.batched}/{pipe.frames}, timeouts {pipe.expired}")
         self.debug_cmd_lbl.setText(f"Last Cmd/Ack: {cmd_txt}")
-        self.debug_perf_lbl.setText("Perf: UI tick ~4Hz")
-    def _world_category_label(self, tag: str) -> str:
-        tag = str(tag or "").upper()
-        if tag == "MONSTER":
-            return "Monster"
-        if tag == "MONEY":
-            return "Money"
-        if tag == "OBJECTIVE":
-            return "Keycard"
-        if tag == "DATA":
-            return "Data Disk"
-        if tag == "BLACKBOX":
-            return "Blackbox"
-        if tag == "WEAPON":
-            return "Weapon"
-        return tag.title() if tag else "Unknown"
-
-    def _world_category_order(self, tag: str) -> int:
-        order = {
-            "MONSTER": 1,
-            "MONEY": 2,
-            "OBJECTIVE": 3,
-            "DATA": 4,
-            "BLACKBOX": 5,
-            "WEAPON": 6,
-        }
-        return order.get(str(tag or "").upper(), 99)
 
-    def _world_distance(self, entry) -> float | None:
-        if not entry or not self._world_self_pos:
-            return None
-        try:
-            if entry.get("x") is None or entry.get("y") is None or entry.get("z") is None:
-                return None
-            dx = entry.get("x") - self._world_self_pos.get("x", 0)
-            dy = entry.get("y") - self._world_self_pos.get("y", 0)
-            dz = entry.get("z") - self._world_self_pos.get("z", 0)
-            return (dx * dx + dy * dy + dz * dz) ** 0.5
-        except Exception:
-            return None
+        poll_ms = self._state_float("POLLMS")
+        wait_ms = self._state_float("CMDWAIT")
+        poll_txt = "--"
+        if poll_ms:
+            poll_txt = f"{poll_ms:.0f}ms"
+            if wait_ms is not None:
+                poll_txt += f" | last cmd waited <= {wait_ms:.0f}ms"
+        rtts = [v for v in pipe.last_rtt.values() if v is not None]
+        if rtts:
+            poll_txt += f" | query rtt {max(rtts) * 1000:.0f}ms max"
+        self.debug_poll_lbl.setText(f"Bridge Poll: {poll_txt}")
+        frames = self._frames
+        self.debug_perf_lbl.setText(
+            f"Perf: UI frames {frames.hz:.0f}Hz, budget {frames.budget * 1000:.0f}ms | "
+            f"flushes {frames.flushes}, views {frames.runs}, last {frames.last_flush_s * 1000:.1f}ms | "
+            f"merged {frames.merged}, dropped {frames.dropped}, deferred {frames.deferred}, "
+            f"parked {len(frames.parked())} | "
+            f"timers {self._timers.pending()} pending, ran {self._timers.ran}, merged {self._timers.merged} | "
+            f"tasks {len(self._runtime.tasks)}, toasts queued {self._toast_queue_txt()}"
+        )
+        self.debug_refresh_lbl.setText(
+            f"Refresh (age q/p/s): {self._planner.summary(now)} | subscribed: {self._subs_spec or '--'}"
+        )
+        self.debug_cpu_lbl.setText(f"CPU: {self._governor.summary()}")
 
     def _world_filter_tag(self) -> str:
         if not self.world_filter_combo:
@@ -3742,73 +3717,35 @@ class ActionPanel(QWidget):
         return str(self.world_sort_combo.currentData() or "CATEGORY").upper()
 
     def _refresh_world_list(self, *_args):
+        # Rows are patched from the model's change sets; the view keeps scroll and selection.
         if not self.world_list:
             return
-        selected_id = None
-        current_item = self.world_list.currentItem()
-        if current_item:
-            selected_id = current_item.data(Qt.UserRole)
-
-        tag_filter = self._world_filter_tag()
-        entries = []
-        for e in self._world_entries:
-            if tag_filter != "ALL" and str(e.get("tag") or "").upper() != tag_filter:
-                continue
-            entries.append(e)
-
-        sort_mode = self._world_sort_mode()
-        if sort_mode == "DISTANCE":
-            entries.sort(key=lambda e: (self._world_distance(e) is None,
-                                        self._world_distance(e) or 0,
-                                        str(e.get("name") or "").lower()))
-        elif sort_mode == "NAME":
-            entries.sort(key=lambda e: str(e.get("name") or "").lower())
-        else:
-            entries.sort(key=lambda e: (self._world_category_order(e.get("tag")),
-                                        str(e.get("name") or "").lower()))
-
-        self.world_list.blockSignals(True)
-        self.world_list.clear()
-        if not entries:
-            item = QListWidgetItem("No world items registered.")
-            item.setFlags(item.flags() & ~Qt.ItemIsSelectable & ~Qt.ItemIsEnabled)
-            self.world_list.addItem(item)
-        else:
-            for e in entries:
-                tag = e.get("tag") or "OBJECT"
-                code = e.get("code") or ""
-                name = e.get("name") or "Unknown"
-                status = e.get("status") or "Unknown"
-                dist = self._world_distance(e)
-                if str(status).lower() == "collected":
-                    dist_str = "N/A"
-                else:
-                    dist_str = f"{dist:.1f}m" if dist is not None else "N/A"
-                label = f"{name} | {self._world_category_label(tag)} | {dist_str} | {status}"
-                item = QListWidgetItem(label)
-                item.setData(Qt.UserRole, e.get("id") or "")
-                self.world_list.addItem(item)
-
-        if selected_id:
-            for i in range(self.world_list.count()):
-                it = self.world_list.item(i)
-                if it and it.data(Qt.UserRole) == selected_id:
-                    self.world_list.setCurrentItem(it)
-                    break
-        self.world_list.blockSignals(False)
+        selected = self._selected_world_key()
+        self._world_proxy.set_tag_filter(self._world_filter_tag())
+        self._world_proxy.set_sort_mode(self._world_sort_mode())
+        self._world_rows.sync()
+        # Qt moves the current row to a neighbour when its entry is removed or
+        # filtered out; only keep a selection that still points at the same entry.
+        row = self._world_rows.row_of(selected) if selected else -1
+        idx = self._world_proxy.mapFromSource(self._world_rows.index(row)) if row >= 0 else None
+        if idx is not None and idx.isValid():
+            if idx != self.world_list.currentIndex():
+                self.world_list.setCurrentIndex(idx)
+        elif selected or self.world_list.currentIndex().isValid():
+            self.world_list.selectionModel().clear()
         self._update_world_actions()
 
-    def _get_selected_world_entry(self):
-        item = self.world_list.currentItem() if self.world_list else None
-        if not item:
+    def _selected_world_key(self) -> str | None:
+        idx = self.world_list.currentIndex() if self.world_list else None
+        if idx is None or not idx.isValid():
             return None
-        sel_id = item.data(Qt.UserRole)
-        if not sel_id:
+        return self._world_rows.key_at(self._world_proxy.mapToSource(idx).row())
+
+    def _get_selected_world_entry(self):
+        key = self._selected_world_key()
+        if not key:
             return None
-        for e in self._world_entries:
-            if e.get("id") == sel_id:
-                return e
-        return None
+        return self._world.entries.get(key)
 
     def _world_ready(self) -> bool:
         return self._world_self_pos is not None
@@ -3821,6 +3758,42 @@ class ActionPanel(QWidget):
         can_use = ready and valid and status != "collected"
         self.world_tp_btn.setEnabled(can_use)
         self.world_bring_btn.setEnabled(can_use)
+        origin_ok = self._world_origin() is not None
+        for btn in self.world_nearest_btns.values():
+            btn.setEnabled(origin_ok)
+
+    def _refresh_world_origins(self):
+        items = [("Nearest To: Me", "SELF")]
+        items += [(f"Nearest To: {name}", name) for name in sorted(self._player_pos, key=lambda s: str(s).lower())]
+        if sync_combo(self.world_origin_combo, items):
+            self._update_world_actions()
+
+    def _world_origin(self):
+        name = self.world_origin_combo.currentData()
+        if not name or name == "SELF":
+            return self._world_self_pos
+        return self._player_pos.get(name)
+
+    def _world_select_nearest(self, tag: str):
+        return self._runtime.spawn(self._world_nearest_flow(tag))
+
+    async def _world_nearest_flow(self, tag: str):
+        if self.world_origin_combo.currentData() != "SELF":
+            # Other players' positions only arrive with the player list.
+            try:
+                await self._request_refresh("players")
+            except Exception:
+                pass
+        hit = self._world_grid.nearest(self._world_origin(), 1, tag, uncollected=True)
+        if not hit:
+            return
+        if self._world_filter_tag() not in ("ALL", tag):
+            self.world_filter_combo.setCurrentIndex(max(0, self.world_filter_combo.findData("ALL")))
+        row = self._world_rows.row_of(hit[0][1])
+        idx = self._world_proxy.mapFromSource(self._world_rows.index(row)) if row >= 0 else None
+        if idx is not None and idx.isValid():
+            self.world_list.setCurrentIndex(idx)
+            self.world_list.scrollTo(idx)
 
     def _world_teleport(self):
         entry = self._get_selected_world_entry()
@@ -4005,34 +3978,56 @@ class ActionPanel(QWidget):
         self._send("tpallmap", str(key))
         self._schedule(0.15, self._refresh_tp_state)
 
+    def _toast_queue_txt(self) -> str:
+        stream = self._toast_stream
+        if stream is None:
+            return "--"
+        return f"{len(stream)} (merged {stream.coalesced}, dropped {stream.dropped})"
+
     def _run_invoked(self, fn):
         try:
             fn()
         except Exception:
             pass
 
-    def _schedule(self, delay_s: float, fn):
+    def _schedule(self, delay_s: float, fn, key=None):
+        """Runs fn on the GUI thread after delay_s. Calls share a key (fn by default)
+        while pending, so repeated requests run once, at the earliest deadline."""
         try:
             delay = max(0.0, float(delay_s))
         except Exception:
             delay = 0.0
         if delay <= 0:
             self._invoke.emit(fn)
+            return None
+        handle = self._timers.call_later(delay, fn, fn if key is None else key)
+        self._arm_timer_wheel()
+        return handle
+
+    def _arm_timer_wheel(self):
+        due = self._timers.due_in()
+        if due is None:
+            self._wheel_timer.stop()
             return
-        try:
-            t = threading.Timer(delay, lambda: self._invoke.emit(fn))
-            t.daemon = True
-            t.start()
-        except Exception:
-            self._invoke.emit(fn)
+        ms = int(math.ceil(due * 1000))
+        if self._wheel_timer.isActive() and self._wheel_timer.remainingTime() <= ms:
+            return
+        self._wheel_timer.start(ms)
+
+    def _run_timers(self):
+        self._timers.run_due()
+        self._arm_timer_wheel()
 
 
 class OverlayApp:
     def __init__(self):
         self.app = QApplication([])
         self.app.setQuitOnLastWindowClosed(False)
-        self.bridge = CommandBridge(CMD_PATH)
-        self.panel = ActionPanel(self.bridge.send)
+        self.bridge = CommandBridge(CMD_PATH, make_transport(BRIDGE_TRANSPORT, CMD_PATH))
+        self.panel = ActionPanel(self.bridge)
+        self.bridge.set_line_handler(self._on_socket_line)
+        self.bridge.open()
+        self.app.aboutToQuit.connect(self.bridge.close)
         self.toast_mgr = ToastManager()
         self.panel.set_toast_manager(self.toast_mgr)
         self.panel.set_panel_request_cb(self._on_panel_request)
@@ -4050,19 +4045,14 @@ class OverlayApp:
 
         self.panel.hide()
 
-        self._game_timer = QTimer(self.panel)
-        self._game_timer.setInterval(2500)
-        self._game_timer.timeout.connect(self._update_game_running)
-        self._game_timer.start()
-
-        self._focus_timer = QTimer(self.panel)
-        self._focus_timer.setInterval(200)
-        self._focus_timer.timeout.connect(self._update_game_focus)
-        self._focus_timer.start()
-
-        self.process_timer = QTimer(self.panel)
-        self.process_timer.timeout.connect(self.check_game_running)
-        self.process_timer.start(PROCESS_CHECK_INTERVAL_MS)
+        # Periodic checks are tasks on the panel's runtime; aboutToQuit cancels them.
+        # Intervals stretch with the panel's CPU governor.
+        runtime = self.panel.runtime
+        gov = self.panel.governor
+        runtime.every(lambda: gov.interval(2.5), self._update_game_running, "game_window")
+        runtime.every(lambda: gov.interval(0.2), self._update_game_focus, "game_focus")
+        runtime.every(lambda: gov.interval(PROCESS_CHECK_INTERVAL_MS / 1000.0), self.check_game_running,
+                      "game_process")
 
         self._update_game_running()
         self._update_game_focus()
@@ -4074,6 +4064,12 @@ class OverlayApp:
             )
             QTimer.singleShot(3000, self.app.quit)
 
+    def _on_socket_line(self, line: str):
+        # Socket acks arrive on the transport thread: parse there, apply on the GUI thread.
+        ack = parse_ack(line)
+        if ack is not None:
+            self.panel.post_ack(ack)
+
     def _on_panel_request(self, open_value: bool):
         self._panel_requested = open_value and True or False
         self._apply_visibility()
@@ -0,0 +1,245 @@
+"""Stand-in for the Lua side of the bridge.
+
+Answers overlay commands with canned payloads so the overlay and BlackboxBench.py
+can run without the game. Serves the file bridge (bridge_cmd.txt -> bridge_ack.txt)
+and/or the loopback socket bridge.
+"""
+
+import argparse
+import os
+import socket
+import threading
+import time
+from pathlib import Path
+
+from BlackboxBridge import (
+    BATCH_CMD,
+    BRIDGE_SOCKET_HOST,
+    BRIDGE_SOCKET_PORT,
+    JournalWriter,
+    format_batch_results,
+    order_command_batch,
+    parse_batch_arg,
+)
+
+PEER_FILE_POLL_S = 0.10
+
+
+def _sanitize(s) -> str:
+    return str(s or "").replace("\r", " ").replace("\n", " ").replace("|", " ")
+
+
+def _canned_players() -> str:
+    return "PLAYERS=Host|Guest"
+
+
+def _canned_tp_state() -> str:
+    return "TPSTATE=MAP:Lobby#LOCS:Spawn,Shop,Vault"
+
+
+def _canned_puzzles() -> str:
+    return "PUZZLES=Lobby:Keypad=0"
+
+
+def _canned_contracts() -> str:
+    return "CONTRACTS=ACTIVE:0"
+
+
+def _canned_weapon() -> str:
+    return "WEAPONSTATE=TARGET:Host#OK:1#NAME:Rifle#CODE:RF#CLASS:BP_Rifle_C"
+
+
+class StandInPeer:
+    def __init__(self, base_dir: str, latency_s: float = 0.0, latency_map: dict | None = None,
+                 priority: bool = True):
+        self.base_dir = Path(base_dir)
+        self.cmd_path = self.base_dir / "bridge_cmd.txt"
+        self.ack_path = self.base_dir / "bridge_ack.txt"
+        self.notice_path = self.base_dir / "bridge_notice.txt"
+        self.ack_journal = JournalWriter(str(self.ack_path))
+        self.notice_journal = JournalWriter(str(self.notice_path))
+        self.latency_s = max(0.0, float(latency_s))
+        self.latency_map = dict(latency_map or {})
+        # Like main.lua: user actions in a batch run before background queries.
+        self.priority = bool(priority)
+        self.handlers = {
+            "listplayers_gui": _canned_players,
+            "tp_gui_state": _canned_tp_state,
+            "puzzlestate": _canned_puzzles,
+            "contract_gui_state": _canned_contracts,
+            "weapon_gui_state": _canned_weapon,
+        }
+        self.handled = 0
+        self._stop = threading.Event()
+        self._threads = []
+        self._server = None
+
+    # ===== command handling =====
+    def handle_line(self, line: str) -> str | None:
+        parts = str(line or "").strip().split("|", 3)
+        if len(parts) < 3 or parts[0] != "CMD":
+            return None
+        cmd_id = parts[1]
+        name = parts[2].strip().lower()
+        if name == BATCH_CMD:
+            results = [self._run(sub) for sub, _ in parse_batch_arg(parts[3] if len(parts) > 3 else "")]
+            ok = all(r[0] for r in results)
+            msg = format_batch_results(results)
+        else:
+            ok, msg = self._run(name)
+        return f"ACK|{cmd_id}|{'1' if ok else '0'}|{_sanitize(msg)}\n"
+
+    def _run(self, name: str) -> tuple[bool, str]:
+        delay = self.latency_map.get(name, self.latency_s)
+        if delay > 0:
+            time.sleep(delay)
+        fn = self.handlers.get(name)
+        if fn is None:
+            ok, msg = True, name
+        else:
+            try:
+                ok, msg = True, fn()
+            except Exception as exc:
+                ok, msg = False, str(exc)
+        self.handled += 1
+        return ok, msg
+
+    def notice(self, text: str):
+        try:
+            self.notice_journal.append(text)
+        except Exception:
+            pass
+
+    # ===== file bridge =====
+    def _file_loop(self, poll_s: float):
+        while not self._stop.is_set():
+            try:
+                data = self.cmd_path.read_text(encoding="utf-8") if self.cmd_path.exists() else ""
+            except Exception:
+                data = ""
+            if data:
+                try:
+                    self.cmd_path.write_text("", encoding="utf-8")
+                except Exception:
+                    pass
+                lines = data.splitlines()
+                if self.priority:
+                    lines = order_command_batch(lines)
+                for line in lines:
+                    reply = self.handle_line(line)
+                    if reply:
+                        try:
+                            self.ack_journal.append(reply.rstrip("\n"))
+                        except Exception:
+                            pass
+            self._stop.wait(poll_s)
+
+    def serve_file(self, poll_s: float = PEER_FILE_POLL_S):
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        t = threading.Thread(target=self._file_loop, args=(poll_s,), name="PeerFile", daemon=True)
+        t.start()
+        self._threads.append(t)
+
+    # ===== socket bridge =====
+    def _client_loop(self, conn):
+        buf = b""
+        with conn:
+            while not self._stop.is_set():
+                try:
+                    chunk = conn.recv(65536)
+                except OSError:
+                    break
+                if not chunk:
+                    break
+                buf += chunk
+                nl = buf.rfind(b"\n")
+                if nl < 0:
+                    continue
+                lines = [raw.decode("utf-8", "replace") for raw in buf[:nl].split(b"\n")]
+                buf = buf[nl + 1:]
+                if self.priority:
+                    lines = order_command_batch(lines)
+                for line in lines:
+                    reply = self.handle_line(line)
+                    if reply:
+                        try:
+                            conn.sendall(reply.encode("utf-8"))
+                        except OSError:
+                            return
+
+    def _accept_loop(self):
+        while not self._stop.is_set():
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                break
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            t = threading.Thread(target=self._client_loop, args=(conn,), name="PeerClient", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def serve_socket(self, host: str = BRIDGE_SOCKET_HOST, port: int = BRIDGE_SOCKET_PORT) -> int:
+        srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        srv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        srv.bind((host, int(port)))
+        srv.listen(1)
+        self._server = srv
+        t = threading.Thread(target=self._accept_loop, name="PeerAccept", daemon=True)
+        t.start()
+        self._threads.append(t)
+        return srv.getsockname()[1]
+
+    def stop(self):
+        self._stop.set()
+        if self._server is not None:
+            try:
+                self._server.close()
+            except OSError:
+                pass
+            self._server = None
+        for t in self._threads:
+            t.join(timeout=1.0)
+        self._threads = []
+
+
+def _parse_latency_map(items) -> dict:
+    out = {}
+    for item in items or []:
+        name, _, val = str(item).partition("=")
+        try:
+            out[name.strip().lower()] = float(val) / 1000.0
+        except ValueError:
+            pass
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Stand-in Lua peer for the Blackbox bridge.")
+    ap.add_argument("--dir", default=os.path.dirname(os.path.abspath(__file__)))
+    ap.add_argument("--mode", choices=("file", "socket", "both"), default="both")
+    ap.add_argument("--port", type=int, default=BRIDGE_SOCKET_PORT)
+    ap.add_argument("--latency-ms", type=float, default=0.0)
+    ap.add_argument("--cmd-latency", action="append", metavar="NAME=MS",
+                    help="per-command latency override (repeatable)")
+    ap.add_argument("--fifo", action="store_true", help="run each batch in arrival order")
+    args = ap.parse_args()
+
+    peer = StandInPeer(args.dir, args.latency_ms / 1000.0, _parse_latency_map(args.cmd_latency),
+                       priority=not args.fifo)
+    if args.mode in ("file", "both"):
+        peer.serve_file()
+        print(f"[peer] file bridge on {peer.cmd_path}")
+    if args.mode in ("socket", "both"):
+        port = peer.serve_socket(BRIDGE_SOCKET_HOST, args.port)
+        print(f"[peer] socket bridge on {BRIDGE_SOCKET_HOST}:{port}")
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        peer.stop()
+
+
+if __name__ == "__main__":
+    main()
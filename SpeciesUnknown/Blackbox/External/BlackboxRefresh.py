@@ -0,0 +1,72 @@
+"""Staleness-driven refresh planning for the overlay's state queries.
+
+Each state domain (players, tp, puzzles, contracts, weapon, world) has the time
+its payload last arrived, from a query ack or a push notice, and a max age.
+plan() returns the domains past their max age or invalidated by a related event.
+"""
+
+import time
+
+
+class RefreshPlanner:
+    """Per-domain freshness, invalidation and query accounting."""
+
+    def __init__(self, budgets: dict, clock=time.monotonic):
+        self._clock = clock
+        self.budgets = {name: float(max_age) for name, max_age in budgets.items()}
+        self.updated: dict[str, float] = {}
+        self.invalid: set[str] = set()
+        self.queries = {name: 0 for name in self.budgets}
+        self.pushes = {name: 0 for name in self.budgets}
+        self.skipped = {name: 0 for name in self.budgets}
+
+    def fresh(self, name: str, pushed: bool = False):
+        """A payload for the domain arrived (pushed = from a notice, not an ack)."""
+        self.updated[name] = self._clock()
+        self.invalid.discard(name)
+        if pushed:
+            self.pushes[name] = self.pushes.get(name, 0) + 1
+
+    def invalidate(self, *names):
+        self.invalid.update(names)
+
+    def age(self, name: str, now: float | None = None) -> float | None:
+        stamp = self.updated.get(name)
+        if stamp is None:
+            return None
+        now = self._clock() if now is None else now
+        return max(0.0, now - stamp)
+
+    def stale(self, name: str, max_age: float | None = None, now: float | None = None) -> bool:
+        if name in self.invalid:
+            return True
+        age = self.age(name, now)
+        if age is None:
+            return True
+        return age >= (self.budgets.get(name, 0.0) if max_age is None else max_age)
+
+    def plan(self, names) -> list[str]:
+        """The domains among names that need a query; the rest count as skipped."""
+        now = self._clock()
+        out = []
+        for name in names:
+            if self.stale(name, now=now):
+                out.append(name)
+            else:
+                self.skipped[name] = self.skipped.get(name, 0) + 1
+        return out
+
+    def issued(self, name: str):
+        self.queries[name] = self.queries.get(name, 0) + 1
+
+    def summary(self, now: float | None = None) -> str:
+        now = self._clock() if now is None else now
+        parts = []
+        for name in self.budgets:
+            age = self.age(name, now)
+            age_txt = "--" if age is None else f"{age:.1f}s"
+            if name in self.invalid:
+                age_txt += "!"
+            parts.append(f"{name} {age_txt} q{self.queries.get(name, 0)}"
+                         f"/p{self.pushes.get(name, 0)}/s{self.skipped.get(name, 0)}")
+        return " | ".join(parts)
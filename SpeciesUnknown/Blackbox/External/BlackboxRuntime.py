@@ -0,0 +1,116 @@
+"""Cooperative tasks for the overlay, on the bridge's own futures.
+
+  sleep(s)          a future settled by a TimerWheel deadline
+  every(s, fn)      fn() in a loop task, interval re-read on each pass
+  spawn(coro)       tasks are tracked; shutdown() cancels all of them, each
+                    one getting CommandCancelled where it awaits
+  run(...)          drives the wheel without Qt (headless load tests)
+
+In the overlay the wheel is ActionPanel's, so tasks run on the Qt event loop.
+"""
+
+import time
+
+from BlackboxBridge import CommandCancelled, CommandFuture, CommandTask
+from BlackboxTimers import TimerWheel
+
+
+class Runtime:
+    """Task registry and timers for coroutines awaiting CommandFutures."""
+
+    def __init__(self, wheel: TimerWheel | None = None, on_schedule=None, clock=time.monotonic):
+        self._clock = clock
+        self.wheel = wheel if wheel is not None else TimerWheel(clock)
+        # Re-arms whatever drives the wheel (the overlay's QTimer) after a new deadline.
+        self._on_schedule = on_schedule
+        self.tasks: set[CommandTask] = set()
+        self._sleeps: dict[CommandFuture, object] = {}
+        self.closed = False
+        self.spawned = 0
+        self.cancelled = 0
+        self.failed = 0
+        self.errors = 0
+
+    # ----- timers -----
+    def sleep(self, delay_s: float) -> CommandFuture:
+        fut = CommandFuture(name="sleep")
+        if self.closed:
+            fut.set_exception(CommandCancelled("runtime closed"))
+            return fut
+        self._sleeps[fut] = self.wheel.call_later(delay_s, lambda: self._wake(fut))
+        if self._on_schedule is not None:
+            self._on_schedule()
+        return fut
+
+    def _wake(self, fut: CommandFuture):
+        self._sleeps.pop(fut, None)
+        fut.set_result(None)
+
+    # ----- tasks -----
+    def spawn(self, coro) -> CommandTask:
+        task = CommandTask(coro)
+        self.spawned += 1
+        if self.closed:
+            task.cancel()
+        if not task.done():
+            self.tasks.add(task)
+        task.add_done_callback(self._task_done)
+        return task
+
+    def _task_done(self, task: CommandTask):
+        self.tasks.discard(task)
+        exc = task.exception()
+        if isinstance(exc, CommandCancelled):
+            self.cancelled += 1
+        elif exc is not None:
+            self.failed += 1
+
+    def every(self, interval_s, fn, name: str = "") -> CommandTask:
+        """Calls fn() every interval_s (a number or a callable returning one), first after one interval."""
+        interval = interval_s if callable(interval_s) else (lambda: interval_s)
+
+        async def _loop():
+            while True:
+                await self.sleep(interval())
+                try:
+                    fn()
+                except Exception:
+                    self.errors += 1
+
+        coro = _loop()
+        if name:
+            coro.__name__ = name
+        return self.spawn(coro)
+
+    def shutdown(self) -> int:
+        """Cancels every task and pending sleep; later spawns are cancelled at once."""
+        self.closed = True
+        count = 0
+        for task in list(self.tasks):
+            if task.cancel():
+                count += 1
+        for fut, handle in list(self._sleeps.items()):
+            handle.cancel()
+            fut.set_exception(CommandCancelled("runtime closed"))
+        self._sleeps.clear()
+        return count
+
+    # ----- headless -----
+    def run(self, until=None, timeout_s: float | None = None, poll=None, tick_s: float = 0.005) -> bool:
+        """Drives the wheel on this thread: poll() (acks, notices), then due timers.
+
+        Stops when until() is true (or, without until, when no task is left);
+        False when timeout_s ran out first.
+        """
+        stop = None if timeout_s is None else self._clock() + timeout_s
+        while True:
+            if poll is not None:
+                poll()
+            self.wheel.run_due()
+            if (until() if until is not None else not self.tasks):
+                return True
+            now = self._clock()
+            if stop is not None and now >= stop:
+                return False
+            due = self.wheel.due_in(now)
+            time.sleep(tick_s if due is None else min(tick_s, due))
@@ -0,0 +1,108 @@
+"""Delayed calls for the overlay on one timer.
+
+TimerWheel keeps deadlines in a heap; the owner arms a single timer with
+due_in() and calls run_due(). A keyed call that is already pending is not
+scheduled again (the earlier deadline wins).
+"""
+
+import heapq
+import itertools
+import time
+
+
+class TimerHandle:
+    __slots__ = ("deadline", "fn", "key", "cancelled", "_wheel")
+
+    def __init__(self, wheel, deadline: float, fn, key):
+        self._wheel = wheel
+        self.deadline = deadline
+        self.fn = fn
+        self.key = key
+        self.cancelled = False
+
+    def cancel(self) -> bool:
+        return self._wheel.cancel(self)
+
+
+class TimerWheel:
+    """Heap of pending calls; cancelled ones are skipped when they surface."""
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._heap: list[tuple[float, int, TimerHandle]] = []
+        self._seq = itertools.count()
+        self._keyed: dict[object, TimerHandle] = {}
+        self._live = 0
+        self.scheduled = 0
+        self.merged = 0
+        self.cancelled = 0
+        self.ran = 0
+        self.errors = 0
+
+    def call_later(self, delay_s: float, fn, key=None) -> TimerHandle:
+        """Runs fn after delay_s; with a key, joins a pending call for that key."""
+        deadline = self._clock() + max(0.0, float(delay_s))
+        if key is not None:
+            handle = self._keyed.get(key)
+            if handle is not None and not handle.cancelled:
+                self.merged += 1
+                if deadline < handle.deadline:
+                    # Re-queue at the earlier deadline; the old heap slot is skipped.
+                    handle.cancelled = True
+                    self._live -= 1
+                    return self._push(deadline, fn, key)
+                return handle
+        return self._push(deadline, fn, key)
+
+    def _push(self, deadline: float, fn, key) -> TimerHandle:
+        handle = TimerHandle(self, deadline, fn, key)
+        heapq.heappush(self._heap, (deadline, next(self._seq), handle))
+        if key is not None:
+            self._keyed[key] = handle
+        self._live += 1
+        self.scheduled += 1
+        return handle
+
+    def cancel(self, handle: TimerHandle) -> bool:
+        if handle.cancelled:
+            return False
+        handle.cancelled = True
+        self._live -= 1
+        self.cancelled += 1
+        if handle.key is not None and self._keyed.get(handle.key) is handle:
+            del self._keyed[handle.key]
+        return True
+
+    def pending(self) -> int:
+        return self._live
+
+    def due_in(self, now: float | None = None) -> float | None:
+        """Seconds until the next call is due; None when nothing is pending."""
+        heap = self._heap
+        while heap and heap[0][2].cancelled:
+            heapq.heappop(heap)
+        if not heap:
+            return None
+        now = self._clock() if now is None else now
+        return max(0.0, heap[0][0] - now)
+
+    def run_due(self, now: float | None = None) -> int:
+        """Runs every call whose deadline has passed, in deadline order."""
+        now = self._clock() if now is None else now
+        heap = self._heap
+        ran = 0
+        while heap and heap[0][0] <= now:
+            handle = heapq.heappop(heap)[2]
+            if handle.cancelled:
+                continue
+            handle.cancelled = True
+            self._live -= 1
+            if handle.key is not None and self._keyed.get(handle.key) is handle:
+                del self._keyed[handle.key]
+            try:
+                handle.fn()
+            except Exception:
+                self.errors += 1
+            ran += 1
+        self.ran += ran
+        return ran
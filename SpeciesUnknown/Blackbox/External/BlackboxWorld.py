@@ -0,0 +1,821 @@
+"""Id-keyed world registry model.
+
+Fed by full WORLD= snapshots (PROTO 1) or by the PROTO 2 delta stream:
+  WORLDK=<kf>|<row;row;...>                      keyframe, replaces the model
+  WORLDD=<kf>|<seq>|<x,y,z>|<adds>|<upds>|<dels>  patch against keyframe <kf>
+Rows are tag,code,name,x,y,z,id,status; dels is a comma list of ids.
+PROTO 3 carries the same stream as binary frames (see BlackboxCodec.py).
+"""
+
+import heapq
+import math
+import sys
+
+from BlackboxCodec import FRAME_KEYFRAME
+
+try:
+    import numpy as np
+except ImportError:  # optional: without it callers keep the per-entry Python path
+    np = None
+
+WORLD_PROTO_DELTA = 2
+WORLD_PROTO_BINARY = 3
+# WorldGrid cell edge, in registry (engine) units.
+WORLD_GRID_CELL = 1000.0
+
+
+def _num(v):
+    try:
+        return float(v)
+    except Exception:
+        return None
+
+
+def parse_world_row(raw: str) -> tuple[str, dict | None]:
+    """Returns ("SELF", pos), ("", entry) or ("", None) for an empty row."""
+    raw = str(raw or "").strip()
+    if not raw:
+        return "", None
+    parts = raw.split(",")
+    tag = parts[0].strip() if len(parts) > 0 else ""
+    code = parts[1].strip() if len(parts) > 1 else ""
+    name = parts[2].strip() if len(parts) > 2 else ""
+    x = parts[3].strip() if len(parts) > 3 else ""
+    y = parts[4].strip() if len(parts) > 4 else ""
+    z = parts[5].strip() if len(parts) > 5 else ""
+    entry_id = parts[6].strip() if len(parts) > 6 else ""
+    status = parts[7].strip() if len(parts) > 7 else ""
+
+    if tag.upper() == "SELF":
+        return "SELF", parse_self_pos(x, y, z)
+
+    return "", {
+        "tag": tag.upper(),
+        "code": code,
+        "name": name,
+        "x": _num(x),
+        "y": _num(y),
+        "z": _num(z),
+        "id": entry_id,
+        "status": status.upper() if status else "UNKNOWN",
+    }
+
+
+def parse_self_pos(x, y, z) -> dict | None:
+    try:
+        return {"x": float(x), "y": float(y), "z": float(z)}
+    except Exception:
+        return None
+
+
+def split_player_pos(text: str) -> tuple[str, dict | None]:
+    """PLAYERS entry body "name" or "name:x,y,z" (names never contain ':')."""
+    text = str(text or "")
+    name, sep, tail = text.rpartition(":")
+    if sep:
+        pos = parse_self_pos(*(tail.split(",") + ["", "", ""])[:3])
+        if pos is not None:
+            return name, pos
+    return text, None
+
+
+class WorldModel:
+    def __init__(self):
+        self.entries: dict[str, dict] = {}
+        self.self_pos = None
+        self.keyframe_id = 0
+        self.seq = 0
+        self.version = 0
+        self.added: set[str] = set()
+        self.updated: set[str] = set()
+        self.removed: set[str] = set()
+        self.self_moved = False
+        self.keyframes = 0
+        self.deltas = 0
+        self.resyncs = 0
+
+    def clear(self):
+        self.entries = {}
+        self.self_pos = None
+        self.keyframe_id = 0
+        self.seq = 0
+        self.version += 1
+
+    def entries_list(self) -> list[dict]:
+        return list(self.entries.values())
+
+    def _begin(self):
+        self.added = set()
+        self.updated = set()
+        self.removed = set()
+        self.self_moved = False
+
+    def _set_self(self, pos):
+        if pos != self.self_pos:
+            self.self_pos = pos
+            self.self_moved = True
+
+    def _upsert(self, entry: dict):
+        key = entry.get("id") or f"#{len(self.entries)}"
+        prev = self.entries.get(key)
+        if prev is None:
+            self.entries[key] = entry
+            self.added.add(key)
+        elif prev != entry:
+            prev.update(entry)
+            self.updated.add(key)
+
+    def _replace(self, entries, self_pos):
+        old = self.entries
+        self.entries = {}
+        for val in entries:
+            key = val.get("id") or f"#{len(self.entries)}"
+            prev = old.pop(key, None)
+            if prev is None:
+                self.added.add(key)
+                self.entries[key] = val
+            else:
+                if prev != val:
+                    prev.update(val)
+                    self.updated.add(key)
+                self.entries[key] = prev
+        self.removed.update(old.keys())
+        self._set_self(self_pos)
+
+    def _replace_rows(self, rows: str):
+        entries = []
+        self_pos = None
+        for raw in str(rows or "").split(";"):
+            kind, val = parse_world_row(raw)
+            if kind == "SELF":
+                self_pos = val
+            elif val is not None:
+                entries.append(val)
+        self._replace(entries, self_pos)
+
+    def _patch(self, self_pos, upserts, dels):
+        if self_pos is not None:
+            self._set_self(self_pos)
+        for val in upserts:
+            self._upsert(val)
+        for entry_id in dels:
+            if entry_id and self.entries.pop(entry_id, None) is not None:
+                self.removed.add(entry_id)
+
+    def _accepts(self, kf: int, seq: int) -> bool:
+        if self.keyframe_id == 0 or kf != self.keyframe_id or seq != self.seq + 1:
+            self.resyncs += 1
+            return False
+        return True
+
+    def apply_snapshot(self, rows: str):
+        """Full WORLD= payload (no keyframe id)."""
+        self._begin()
+        self._replace_rows(rows)
+        self.keyframe_id = 0
+        self.seq = 0
+        self.version += 1
+
+    def apply_keyframe(self, payload: str) -> bool:
+        head, _, rows = str(payload or "").partition("|")
+        try:
+            kf = int(head)
+        except ValueError:
+            return False
+        self._begin()
+        self._replace_rows(rows)
+        self.keyframe_id = kf
+        self.seq = 0
+        self.keyframes += 1
+        self.version += 1
+        return True
+
+    def apply_delta(self, payload: str) -> bool:
+        """Patch in place; False when the delta does not follow the current keyframe/seq."""
+        parts = str(payload or "").split("|")
+        if len(parts) < 6:
+            return False
+        try:
+            kf = int(parts[0])
+            seq = int(parts[1])
+        except ValueError:
+            return False
+        if not self._accepts(kf, seq):
+            return False
+        self._begin()
+        self_pos = None
+        if parts[2]:
+            self_pos = parse_self_pos(*(parts[2].split(",") + ["", "", ""])[:3])
+        upserts = []
+        for rows in (parts[3], parts[4]):
+            for raw in rows.split(";"):
+                kind, val = parse_world_row(raw)
+                if kind != "SELF" and val is not None:
+                    upserts.append(val)
+        self._patch(self_pos, upserts, (d.strip() for d in parts[5].split(",")))
+        self.seq = seq
+        self.deltas += 1
+        self.version += 1
+        return True
+
+    def apply_frame(self, frame: dict) -> bool:
+        """Binary frame from BlackboxCodec.WorldFrameDecoder (PROTO 3)."""
+        kf = int(frame.get("kf") or 0)
+        seq = int(frame.get("seq") or 0)
+        if frame.get("kind") == FRAME_KEYFRAME:
+            self._begin()
+            self._replace(frame.get("adds") or [], frame.get("self"))
+            self.keyframe_id = kf
+            self.seq = 0
+            self.keyframes += 1
+            self.version += 1
+            return True
+        if not self._accepts(kf, seq):
+            return False
+        self._begin()
+        self._patch(frame.get("self"), (frame.get("adds") or []) + (frame.get("upds") or []),
+                    frame.get("dels") or [])
+        self.seq = seq
+        self.deltas += 1
+        self.version += 1
+        return True
+
+    def apply_line(self, line: str) -> bool | None:
+        """True when applied, False when a keyframe is needed, None for non-world lines."""
+        line = str(line or "")
+        if line.startswith("WORLDD="):
+            return self.apply_delta(line[len("WORLDD="):])
+        if line.startswith("WORLDK="):
+            return self.apply_keyframe(line[len("WORLDK="):])
+        if line.startswith("WORLD="):
+            self.apply_snapshot(line[len("WORLD="):])
+            return True
+        return None
+
+    def apply_patch(self, patch: dict):
+        """Net change set from a WorldShadow; its entry dicts are handed over, not copied."""
+        self._begin()
+        if patch.get("self_moved"):
+            self._set_self(patch.get("self"))
+        entries = self.entries
+        for key, entry in patch.get("upserts", {}).items():
+            prev = entries.get(key)
+            if prev is None:
+                entries[key] = entry
+                self.added.add(key)
+            elif prev != entry:
+                prev.update(entry)
+                self.updated.add(key)
+        for key in patch.get("dels", ()):
+            if entries.pop(key, None) is not None:
+                self.removed.add(key)
+        self.keyframe_id = patch.get("kf", 0)
+        self.seq = patch.get("seq", 0)
+        self.keyframes = patch.get("keyframes", self.keyframes)
+        self.deltas = patch.get("deltas", self.deltas)
+        self.resyncs = patch.get("resyncs", self.resyncs)
+        self.version += 1
+
+
+class WorldShadow:
+    """WorldModel kept off the GUI thread; folds the updates of one read into a patch.
+
+    A burst of deltas (or a keyframe plus deltas) becomes one net change set
+    against what the last patch left behind: entries added or changed since then
+    (as copies), ids removed, and self_pos. WorldModel.apply_patch() replays it,
+    so the GUI-side model, and the mirrors syncing off its version, see one
+    update per read instead of one per line, with no row parsing.
+    """
+
+    def __init__(self):
+        self.model = WorldModel()
+        self._start()
+
+    def _start(self):
+        self._before: dict[str, bool] = {}
+        self._moved = False
+        self._applied = 0
+        self._resync = False
+
+    def reset(self):
+        self.model = WorldModel()
+        self._start()
+
+    def _note(self, ok) -> bool | None:
+        if ok is None:
+            return None
+        if not ok:
+            self._resync = True
+            return False
+        model = self.model
+        before = self._before
+        # First touch since the last patch decides whether the GUI side has the key.
+        for key in model.added:
+            before.setdefault(key, False)
+        for key in model.updated:
+            before.setdefault(key, True)
+        for key in model.removed:
+            before.setdefault(key, True)
+        self._moved = self._moved or model.self_moved
+        self._applied += 1
+        return True
+
+    def apply_line(self, line: str) -> bool | None:
+        return self._note(self.model.apply_line(line))
+
+    def apply_frame(self, frame: dict) -> bool:
+        return self._note(self.model.apply_frame(frame))
+
+    def take_patch(self) -> dict | None:
+        """The net patch since the last call; None when nothing was applied or refused."""
+        if not self._applied and not self._resync:
+            return None
+        model = self.model
+        entries = model.entries
+        upserts = {}
+        dels = []
+        for key, existed in self._before.items():
+            entry = entries.get(key)
+            if entry is not None:
+                upserts[key] = dict(entry)
+            elif existed:
+                dels.append(key)
+        patch = {
+            "applied": self._applied,
+            "resync": self._resync,
+            "upserts": upserts,
+            "dels": dels,
+            "self_moved": self._moved,
+            "self": dict(model.self_pos) if model.self_pos else None,
+            "kf": model.keyframe_id,
+            "seq": model.seq,
+            "keyframes": model.keyframes,
+            "deltas": model.deltas,
+            "resyncs": model.resyncs,
+        }
+        self._start()
+        return patch
+
+
+class WorldColumns:
+    """Struct-of-arrays mirror of a WorldModel for distance work (needs numpy).
+
+    One slot per entry: x/y/z and the distance as arrays, names interned in a
+    list. Removing an entry moves the last slot
+    into the hole. Distances to self_pos are recomputed for every slot in one
+    array operation when self moves, and only for touched slots otherwise. Kept
+    in step by sync() after each WorldModel apply, like WorldListModel.
+    """
+
+    def __init__(self, world: WorldModel, capacity: int = 256):
+        self._world = world
+        self._version = None
+        self.keys: list[str] = []
+        self.slots: dict[str, int] = {}
+        self.names: list[str] = []
+        self._self = None
+        self._alloc(max(16, int(capacity)))
+        self.rebuilds = 0
+        self.recomputed = 0
+
+    @staticmethod
+    def available() -> bool:
+        return np is not None
+
+    def _alloc(self, capacity: int):
+        n = len(self.keys)
+        old = getattr(self, "xyz", None)
+        cols = {
+            "xyz": np.zeros((capacity, 3), dtype=np.float64),
+            "has_pos": np.zeros(capacity, dtype=bool),
+            "dist": np.full(capacity, np.nan, dtype=np.float64),
+        }
+        if old is not None:
+            for name, arr in cols.items():
+                arr[:n] = getattr(self, name)[:n]
+        for name, arr in cols.items():
+            setattr(self, name, arr)
+        self.capacity = capacity
+
+    def nbytes(self) -> int:
+        return self.xyz.nbytes + self.has_pos.nbytes + self.dist.nbytes
+
+    # ----- updates -----
+    def _put(self, key: str, entry: dict) -> int:
+        slot = self.slots.get(key)
+        if slot is None:
+            slot = len(self.keys)
+            if slot >= self.capacity:
+                self._alloc(self.capacity * 2)
+            self.slots[key] = slot
+            self.keys.append(key)
+            self.names.append("")
+        x, y, z = entry.get("x"), entry.get("y"), entry.get("z")
+        has_pos = x is not None and y is not None and z is not None
+        self.xyz[slot] = (x, y, z) if has_pos else (0.0, 0.0, 0.0)
+        self.has_pos[slot] = has_pos
+        self.names[slot] = sys.intern(str(entry.get("name") or ""))
+        return slot
+
+    def _remove(self, key: str):
+        slot = self.slots.pop(key, None)
+        if slot is None:
+            return
+        last = len(self.keys) - 1
+        if slot != last:
+            moved = self.keys[last]
+            self.keys[slot] = moved
+            self.names[slot] = self.names[last]
+            self.slots[moved] = slot
+            for arr in (self.xyz, self.has_pos, self.dist):
+                arr[slot] = arr[last]
+        self.keys.pop()
+        self.names.pop()
+
+    def _set_self(self, pos) -> bool:
+        if not pos:
+            new = None
+        else:
+            new = np.array((pos.get("x", 0), pos.get("y", 0), pos.get("z", 0)), dtype=np.float64)
+        if new is None and self._self is None:
+            return False
+        if new is not None and self._self is not None and np.array_equal(new, self._self):
+            return False
+        self._self = new
+        return True
+
+    def _distances(self, slots=None):
+        n = len(self.keys)
+        idx = slice(0, n) if slots is None else slots
+        if self._self is None:
+            self.dist[idx] = np.nan
+            return
+        d = self.xyz[idx] - self._self
+        out = np.sqrt(np.einsum("ij,ij->i", d, d))
+        out[~self.has_pos[idx]] = np.nan
+        self.dist[idx] = out
+        self.recomputed += len(out)
+
+    def rebuild(self):
+        self.keys = []
+        self.slots = {}
+        self.names = []
+        for key, entry in self._world.entries.items():
+            self._put(key, entry)
+        self._set_self(self._world.self_pos)
+        self._distances()
+        self._version = self._world.version
+        self.rebuilds += 1
+
+    def sync(self) -> bool:
+        """Applies the WorldModel's last update; False when nothing changed."""
+        world = self._world
+        if world.version == self._version:
+            return False
+        if self._version is None or world.version != self._version + 1:
+            self.rebuild()
+            return True
+        self._version = world.version
+        for key in world.removed:
+            self._remove(key)
+        touched = []
+        entries = world.entries
+        for keys in (world.added, world.updated):
+            for key in keys:
+                entry = entries.get(key)
+                if entry is not None:
+                    touched.append(self._put(key, entry))
+        if len(self.keys) != len(entries):
+            self.rebuild()
+            return True
+        if self._set_self(world.self_pos):
+            self._distances()
+        elif touched:
+            self._distances(np.array(touched, dtype=np.intp))
+        return True
+
+    # ----- queries -----
+    def distance(self, key) -> float | None:
+        slot = self.slots.get(key)
+        if slot is None:
+            return None
+        d = self.dist[slot]
+        return None if d != d else float(d)
+
+    def order_by_distance(self) -> list[str]:
+        """Keys nearest first; entries without a distance follow, by name."""
+        n = len(self.keys)
+        dist = self.dist[:n]
+        known = np.nonzero(~np.isnan(dist))[0]
+        order = known[np.argsort(dist[known], kind="stable")]
+        keys = self.keys
+        out = [keys[i] for i in order.tolist()]
+        if len(out) < n:
+            rest = np.nonzero(np.isnan(dist))[0].tolist()
+            rest.sort(key=lambda i: self.names[i].lower())
+            out.extend(keys[i] for i in rest)
+        return out
+
+
+def _xyz(pos) -> tuple | None:
+    if not pos:
+        return None
+    try:
+        return float(pos.get("x", 0)), float(pos.get("y", 0)), float(pos.get("z", 0))
+    except Exception:
+        return None
+
+
+class WorldGrid:
+    """Uniform grid over positioned WorldModel entries, one grid per tag.
+
+    Kept in step by sync() like WorldColumns, moving only entries whose cell or
+    tag changed. nearest() walks cells ring by ring out from the query point and
+    stops once no unvisited cell can hold anything closer; within() visits the
+    cells overlapping the radius. Pure Python, so it works without numpy.
+    """
+
+    def __init__(self, world: WorldModel, cell: float = WORLD_GRID_CELL):
+        self._world = world
+        self.cell = float(cell)
+        self._version = None
+        self.grids: dict[str, dict[tuple, set]] = {}
+        # Cell index bounds per tag; only grow between rebuilds.
+        self.bounds: dict[str, tuple[list, list]] = {}
+        self.where: dict[str, tuple[str, tuple]] = {}
+        self.rebuilds = 0
+        self.visited = 0
+
+    def _cell_of(self, x: float, y: float, z: float) -> tuple:
+        c = self.cell
+        return math.floor(x / c), math.floor(y / c), math.floor(z / c)
+
+    # ----- updates -----
+    def _drop(self, key: str):
+        old = self.where.pop(key, None)
+        if old is None:
+            return
+        tag, cell = old
+        cells = self.grids.get(tag) or {}
+        keys = cells.get(cell)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del cells[cell]
+
+    def _place(self, key: str, entry: dict):
+        p = None
+        if entry.get("x") is not None and entry.get("y") is not None and entry.get("z") is not None:
+            p = _xyz(entry)
+        if p is None:
+            self._drop(key)
+            return
+        tag = str(entry.get("tag") or "").upper()
+        cell = self._cell_of(*p)
+        if self.where.get(key) == (tag, cell):
+            return
+        self._drop(key)
+        self.grids.setdefault(tag, {}).setdefault(cell, set()).add(key)
+        self.where[key] = (tag, cell)
+        bounds = self.bounds.get(tag)
+        if bounds is None:
+            self.bounds[tag] = (list(cell), list(cell))
+            return
+        lo, hi = bounds
+        for i in range(3):
+            if cell[i] < lo[i]:
+                lo[i] = cell[i]
+            elif cell[i] > hi[i]:
+                hi[i] = cell[i]
+
+    def rebuild(self):
+        self.grids = {}
+        self.bounds = {}
+        self.where = {}
+        for key, entry in self._world.entries.items():
+            self._place(key, entry)
+        self._version = self._world.version
+        self.rebuilds += 1
+
+    def sync(self) -> bool:
+        """Applies the WorldModel's last update; False when nothing changed."""
+        world = self._world
+        if world.version == self._version:
+            return False
+        if self._version is None or world.version != self._version + 1:
+            self.rebuild()
+            return True
+        self._version = world.version
+        entries = world.entries
+        for key in world.removed:
+            self._drop(key)
+        for keys in (world.added, world.updated):
+            for key in keys:
+                entry = entries.get(key)
+                if entry is not None:
+                    self._place(key, entry)
+        return True
+
+    # ----- queries -----
+    def _tags(self, tag: str | None) -> list[str]:
+        if tag is None:
+            return list(self.grids)
+        tag = str(tag).upper()
+        return [tag] if tag in self.grids else []
+
+    def _match(self, entry: dict, code: str | None, uncollected: bool) -> bool:
+        if code is not None and str(entry.get("code") or "").upper() != code:
+            return False
+        return not (uncollected and str(entry.get("status") or "").lower() == "collected")
+
+    def _scan(self, p, cells, keys_out, code, uncollected, limit=None):
+        entries = self._world.entries
+        px, py, pz = p
+        for keys in cells:
+            for key in keys:
+                entry = entries.get(key)
+                if entry is None or not self._match(entry, code, uncollected):
+                    continue
+                dx = entry["x"] - px
+                dy = entry["y"] - py
+                dz = entry["z"] - pz
+                dist = math.sqrt(dx * dx + dy * dy + dz * dz)
+                if limit is None:
+                    keys_out.append((dist, key))
+                elif len(keys_out) < limit:
+                    heapq.heappush(keys_out, (-dist, key))
+                elif dist < -keys_out[0][0]:
+                    heapq.heapreplace(keys_out, (-dist, key))
+
+    def within(self, pos, radius: float, tag: str | None = None, code: str | None = None,
+               uncollected: bool = False) -> list[tuple[float, str]]:
+        """(distance, key) pairs within radius of pos, nearest first."""
+        p = _xyz(pos)
+        if p is None:
+            return []
+        r = float(radius)
+        lo = self._cell_of(p[0] - r, p[1] - r, p[2] - r)
+        hi = self._cell_of(p[0] + r, p[1] + r, p[2] + r)
+        code = str(code).upper() if code is not None else None
+        found = []
+        for name in self._tags(tag):
+            cells = self.grids[name]
+            box = (hi[0] - lo[0] + 1) * (hi[1] - lo[1] + 1) * (hi[2] - lo[2] + 1)
+            if box > len(cells):
+                hit = [keys for cell, keys in cells.items()
+                       if all(lo[i] <= cell[i] <= hi[i] for i in range(3))]
+            else:
+                hit = [cells[c] for c in ((x, y, z) for x in range(lo[0], hi[0] + 1)
+                                          for y in range(lo[1], hi[1] + 1)
+                                          for z in range(lo[2], hi[2] + 1)) if c in cells]
+            self.visited += len(hit)
+            self._scan(p, hit, found, code, uncollected)
+        out = [item for item in found if item[0] <= r]
+        out.sort()
+        return out
+
+    def nearest(self, pos, k: int = 1, tag: str | None = None, code: str | None = None,
+                uncollected: bool = False) -> list[tuple[float, str]]:
+        """Up to k (distance, key) pairs nearest to pos, nearest first."""
+        p = _xyz(pos)
+        names = self._tags(tag)
+        if p is None or k <= 0 or not names:
+            return []
+        code = str(code).upper() if code is not None else None
+        lo = [min(self.bounds[n][0][i] for n in names) for i in range(3)]
+        hi = [max(self.bounds[n][1][i] for n in names) for i in range(3)]
+        occupied = sum(len(self.grids[n]) for n in names)
+        center = self._cell_of(*p)
+        reach = max(max(center[i] - lo[i], hi[i] - center[i]) for i in range(3))
+        best: list = []
+        slots = 0
+        for r in range(max(0, reach) + 1):
+            ring = list(self._ring(center, r, lo, hi))
+            slots += len(ring)
+            if slots > 4 * occupied:
+                # Sparse or far-flung entries: cheaper to rank the occupied cells directly.
+                return self._nearest_by_cells(p, k, names, code, uncollected)
+            hit = [keys for n in names for keys in (self.grids[n].get(c) for c in ring) if keys]
+            self.visited += len(hit)
+            self._scan(p, hit, best, code, uncollected, limit=k)
+            if len(best) >= k and -best[0][0] <= r * self.cell:
+                break
+        return sorted((-d, key) for d, key in best)
+
+    @staticmethod
+    def _ring(center, r: int, lo, hi):
+        """Cells at Chebyshev distance r from center, clipped to the lo/hi bounds."""
+        cx, cy, cz = center
+        zs = range(max(-r, lo[2] - cz), min(r, hi[2] - cz) + 1)
+        for dx in range(max(-r, lo[0] - cx), min(r, hi[0] - cx) + 1):
+            for dy in range(max(-r, lo[1] - cy), min(r, hi[1] - cy) + 1):
+                if abs(dx) == r or abs(dy) == r:
+                    for dz in zs:
+                        yield cx + dx, cy + dy, cz + dz
+                else:
+                    for dz in (-r, r) if r else (0,):
+                        if zs.start <= dz < zs.stop:
+                            yield cx + dx, cy + dy, cz + dz
+
+    def _nearest_by_cells(self, p, k, names, code, uncollected):
+        c = self.cell
+        ranked = []
+        for n in names:
+            for cell, keys in self.grids[n].items():
+                gap = 0.0
+                for i in range(3):
+                    d = max(cell[i] * c - p[i], 0.0, p[i] - (cell[i] + 1) * c)
+                    gap += d * d
+                ranked.append((gap, id(keys), keys))
+        ranked.sort()
+        best: list = []
+        for gap, _, keys in ranked:
+            if len(best) >= k and gap > (-best[0][0]) ** 2:
+                break
+            self.visited += 1
+            self._scan(p, (keys,), best, code, uncollected, limit=k)
+        return sorted((-d, key) for d, key in best)
+
+
+def _fmt_num(v) -> str:
+    return "" if v is None else f"{float(v):.1f}"
+
+
+def encode_world_row(entry: dict) -> str:
+    return ",".join((
+        str(entry.get("tag") or "OBJECT"),
+        str(entry.get("code") or ""),
+        str(entry.get("name") or "Unknown"),
+        _fmt_num(entry.get("x")),
+        _fmt_num(entry.get("y")),
+        _fmt_num(entry.get("z")),
+        str(entry.get("id") or ""),
+        str(entry.get("status") or ""),
+    ))
+
+
+def encode_self_text(pos) -> str:
+    if not pos:
+        return ""
+    return f"{float(pos.get('x', 0)):.1f},{float(pos.get('y', 0)):.1f},{float(pos.get('z', 0)):.1f}"
+
+
+class WorldDeltaEncoder:
+    """Python reference for the Lua registry encoder (stand-in peer and benchmarks)."""
+
+    def __init__(self, keyframe_interval_s: float = 15.0):
+        self.keyframe_interval_s = float(keyframe_interval_s)
+        self.keyframe_id = 0
+        self.seq = 0
+        self.last_keyframe = None
+        self._sent: dict[str, str] = {}
+        self._sent_self = ""
+
+    def snapshot(self, entries, self_pos) -> str:
+        rows = []
+        self_text = encode_self_text(self_pos)
+        if self_text:
+            rows.append(f"SELF,,Self,{self_text},,")
+        rows.extend(encode_world_row(e) for e in entries)
+        return "WORLD=" + ";".join(rows)
+
+    def keyframe(self, entries, self_pos, now: float = 0.0) -> str:
+        body = self.snapshot(entries, self_pos)[len("WORLD="):]
+        self._sent = {str(e.get("id")): encode_world_row(e) for e in entries}
+        self._sent_self = encode_self_text(self_pos)
+        self.keyframe_id += 1
+        self.seq = 0
+        self.last_keyframe = now
+        return f"WORLDK={self.keyframe_id}|{body}"
+
+    def delta(self, entries, self_pos) -> str | None:
+        adds, upds = [], []
+        seen = set()
+        for e in entries:
+            key = str(e.get("id"))
+            row = encode_world_row(e)
+            seen.add(key)
+            prev = self._sent.get(key)
+            if prev is None:
+                adds.append(row)
+            elif prev != row:
+                upds.append(row)
+            self._sent[key] = row
+        dels = [k for k in self._sent if k not in seen]
+        for k in dels:
+            del self._sent[k]
+        self_text = encode_self_text(self_pos)
+        self_out = ""
+        if self_text != self._sent_self:
+            self._sent_self = self_text
+            self_out = self_text
+        if not adds and not upds and not dels and not self_out:
+            return None
+        self.seq += 1
+        return f"WORLDD={self.keyframe_id}|{self.seq}|{self_out}|{';'.join(adds)}|{';'.join(upds)}|{','.join(dels)}"
+
+    def emit(self, entries, self_pos, now: float, force: bool = False) -> str | None:
+        if (force or self.last_keyframe is None
+                or (now - self.last_keyframe) >= self.keyframe_interval_s):
+            return self.keyframe(entries, self_pos, now)
+        return self.delta(entries, self_pos)
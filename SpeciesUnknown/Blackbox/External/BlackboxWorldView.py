@@ -0,0 +1,336 @@
+"""Qt model/view for the world registry list.
+
+WorldListModel mirrors WorldModel.entries as rows keyed by entry id and turns
+each applied keyframe/delta into row inserts, removes and dataChanged ranges, so
+the view keeps its scroll position and selection. WorldListProxy filters by tag
+and sorts on a per-row key string that Qt compares natively.
+
+Distance order changes with every step the player takes, which would have the
+proxy re-sort row by row. In that mode the model keeps its own rows sorted (one
+Python sort and a layoutChanged per update) and the proxy only filters. Given a
+WorldColumns store the model reads distances from its arrays instead, and takes
+the distance order from one argsort.
+"""
+
+import re
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QRegularExpression, QSortFilterProxyModel, Qt, Signal
+from PySide6.QtGui import QPainter
+from PySide6.QtWidgets import QListView
+
+WORLD_ID_ROLE = Qt.UserRole
+WORLD_TAG_ROLE = Qt.UserRole + 1
+WORLD_SORT_ROLE = Qt.UserRole + 2
+
+WORLD_SORT_MODES = ("CATEGORY", "DISTANCE", "NAME")
+# Past this many removed rows in one update a model reset is cheaper than per-run signals.
+WORLD_RESET_REMOVED = 256
+
+CATEGORY_LABELS = {
+    "MONSTER": "Monster",
+    "MONEY": "Money",
+    "OBJECTIVE": "Keycard",
+    "DATA": "Data Disk",
+    "BLACKBOX": "Blackbox",
+    "WEAPON": "Weapon",
+}
+CATEGORY_ORDER = {
+    "MONSTER": 1,
+    "MONEY": 2,
+    "OBJECTIVE": 3,
+    "DATA": 4,
+    "BLACKBOX": 5,
+    "WEAPON": 6,
+}
+
+
+def category_label(tag: str) -> str:
+    tag = str(tag or "").upper()
+    return CATEGORY_LABELS.get(tag) or (tag.title() if tag else "Unknown")
+
+
+def category_order(tag: str) -> int:
+    return CATEGORY_ORDER.get(str(tag or "").upper(), 99)
+
+
+def entry_distance(entry, self_pos) -> float | None:
+    if not entry or not self_pos:
+        return None
+    try:
+        if entry.get("x") is None or entry.get("y") is None or entry.get("z") is None:
+            return None
+        dx = entry.get("x") - self_pos.get("x", 0)
+        dy = entry.get("y") - self_pos.get("y", 0)
+        dz = entry.get("z") - self_pos.get("z", 0)
+        return (dx * dx + dy * dy + dz * dz) ** 0.5
+    except Exception:
+        return None
+
+
+def entry_label(entry: dict, dist: float | None) -> str:
+    tag = entry.get("tag") or "OBJECT"
+    name = entry.get("name") or "Unknown"
+    status = entry.get("status") or "Unknown"
+    if str(status).lower() == "collected" or dist is None:
+        dist_str = "N/A"
+    else:
+        dist_str = f"{dist:.1f}m"
+    return f"{name} | {category_label(tag)} | {dist_str} | {status}"
+
+
+def _runs(rows) -> list[tuple[int, int]]:
+    """Sorted row numbers as (first, last) runs."""
+    out = []
+    for row in rows:
+        if out and row == out[-1][1] + 1:
+            out[-1] = (out[-1][0], row)
+        else:
+            out.append((row, row))
+    return out
+
+
+class WorldListModel(QAbstractListModel):
+    """One row per WorldModel entry: arrival order, or distance order in DISTANCE mode."""
+
+    selfMoved = Signal()
+
+    def __init__(self, world, columns=None, parent=None):
+        super().__init__(parent)
+        self._world = world
+        # BlackboxWorld.WorldColumns, synced by the owner before sync() here.
+        self._columns = columns
+        self._keys: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._sort_keys: dict[str, str] = {}
+        self._version = None
+        self.sort_mode = "CATEGORY"
+        self.resets = 0
+        self.signals = 0
+
+    # ----- Qt model -----
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._keys)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if row >= len(self._keys):
+            return None
+        key = self._keys[row]
+        entry = self._world.entries.get(key)
+        if entry is None:
+            return None
+        if role == WORLD_SORT_ROLE:
+            val = self._sort_keys.get(key)
+            if val is None:
+                val = self._sort_keys[key] = self._sort_key(entry)
+            return val
+        if role == Qt.DisplayRole:
+            return entry_label(entry, self._distance(key, entry))
+        if role == WORLD_TAG_ROLE:
+            return str(entry.get("tag") or "").upper()
+        if role == WORLD_ID_ROLE:
+            return entry.get("id") or ""
+        return None
+
+    # ----- lookups -----
+    def key_at(self, row: int) -> str | None:
+        return self._keys[row] if 0 <= row < len(self._keys) else None
+
+    def row_of(self, key: str) -> int:
+        return self._rows.get(key, -1)
+
+    def _distance(self, key: str, entry: dict) -> float | None:
+        if self._columns is not None and key in self._columns.slots:
+            return self._columns.distance(key)
+        return entry_distance(entry, self._world.self_pos)
+
+    # ----- sorting -----
+    def _distance_order(self) -> list[str] | None:
+        if self._columns is None:
+            return None
+        order = self._columns.order_by_distance()
+        return order if len(order) == len(self._keys) else None
+
+    def _sort_key(self, entry: dict) -> str:
+        # Strings so QSortFilterProxyModel compares them in C++ without calling back.
+        name = str(entry.get("name") or "").lower()
+        if self.sort_mode == "NAME":
+            return name
+        if self.sort_mode == "DISTANCE":
+            dist = entry_distance(entry, self._world.self_pos)
+            if dist is None:
+                return "~" + name
+            return f"{min(dist, 9.99e9):013.2f}|{name}"
+        return f"{category_order(entry.get('tag')):02d}|{name}"
+
+    def set_sort_mode(self, mode: str) -> bool:
+        mode = str(mode or "CATEGORY").upper()
+        if mode not in WORLD_SORT_MODES or mode == self.sort_mode:
+            return False
+        self.sort_mode = mode
+        self._sort_keys.clear()
+        if mode == "DISTANCE":
+            self._relayout()
+        return True
+
+    def orders_rows(self) -> bool:
+        return self.sort_mode == "DISTANCE"
+
+    def _relayout(self):
+        order = self._distance_order()
+        if order is None:
+            entries = self._world.entries
+            keys = self._sort_keys
+            for key in self._keys:
+                if key not in keys:
+                    keys[key] = self._sort_key(entries[key])
+            order = sorted(self._keys, key=keys.__getitem__)
+        if order == self._keys:
+            return
+        self.layoutAboutToBeChanged.emit()
+        old = self.persistentIndexList()
+        moved = [self._keys[idx.row()] for idx in old]
+        self._keys = order
+        self._rows = {key: i for i, key in enumerate(order)}
+        self.changePersistentIndexList(old, [self.index(self._rows[key]) for key in moved])
+        self.layoutChanged.emit()
+        self.signals += 1
+
+    # ----- updates -----
+    def reset(self):
+        self.beginResetModel()
+        self._keys = list(self._world.entries.keys())
+        self._rows = {key: i for i, key in enumerate(self._keys)}
+        self._sort_keys.clear()
+        if self.orders_rows():
+            entries = self._world.entries
+            order = self._distance_order()
+            if order is not None:
+                self._keys = order
+            else:
+                self._keys.sort(key=lambda k: self._sort_keys.setdefault(k, self._sort_key(entries[k])))
+            self._rows = {key: i for i, key in enumerate(self._keys)}
+        self._version = self._world.version
+        self.endResetModel()
+        self.resets += 1
+
+    def sync(self) -> bool:
+        """Applies the WorldModel's last update; False when nothing changed."""
+        world = self._world
+        if world.version == self._version:
+            return False
+        if self._version is None or world.version != self._version + 1:
+            # Missed an update (or clear()): the change sets no longer describe the gap.
+            self.reset()
+            return True
+        self._version = world.version
+        entries = world.entries
+        removed = sorted(self._rows[k] for k in world.removed if k in self._rows)
+        if len(removed) > WORLD_RESET_REMOVED:
+            self.reset()
+            return True
+
+        for first, last in reversed(_runs(removed)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            for key in self._keys[first:last + 1]:
+                self._rows.pop(key, None)
+                self._sort_keys.pop(key, None)
+            del self._keys[first:last + 1]
+            self.endRemoveRows()
+            self.signals += 1
+        if removed:
+            for i in range(removed[0], len(self._keys)):
+                self._rows[self._keys[i]] = i
+
+        added = [k for k in world.added if k in entries and k not in self._rows]
+        if added:
+            start = len(self._keys)
+            self.beginInsertRows(QModelIndex(), start, start + len(added) - 1)
+            for i, key in enumerate(added, start):
+                self._keys.append(key)
+                self._rows[key] = i
+            self.endInsertRows()
+            self.signals += 1
+
+        if len(self._keys) != len(entries):
+            self.reset()
+            return True
+
+        updated = []
+        for key in world.updated:
+            row = self._rows.get(key)
+            if row is not None:
+                self._sort_keys.pop(key, None)
+                updated.append(row)
+        for first, last in _runs(sorted(updated)):
+            self.dataChanged.emit(self.index(first), self.index(last))
+            self.signals += 1
+
+        if self.orders_rows():
+            if world.self_moved:
+                self._sort_keys.clear()
+            if world.self_moved or added or updated:
+                self._relayout()
+        if world.self_moved and self._keys:
+            # Every label changed; the proxy repaints its rows as one range.
+            self.selfMoved.emit()
+            self.signals += 1
+        return True
+
+
+class WorldListProxy(QSortFilterProxyModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.tag_filter = "ALL"
+        self.setSortRole(WORLD_SORT_ROLE)
+        self.setFilterRole(WORLD_TAG_ROLE)
+        self.setDynamicSortFilter(True)
+
+    def setSourceModel(self, model):
+        super().setSourceModel(model)
+        if isinstance(model, WorldListModel):
+            model.selfMoved.connect(self._on_self_moved)
+
+    def _on_self_moved(self):
+        # Source rows map all over the proxy, so a full source range would reach the
+        # view as one dataChanged per proxy run; the proxy's own range is one signal.
+        rows = self.rowCount()
+        if rows:
+            self.dataChanged.emit(self.index(0, 0), self.index(rows - 1, 0), [Qt.DisplayRole])
+
+    def set_tag_filter(self, tag: str):
+        tag = str(tag or "ALL").upper()
+        if tag == self.tag_filter:
+            return
+        self.tag_filter = tag
+        self.setFilterRegularExpression(QRegularExpression("" if tag == "ALL" else f"^{re.escape(tag)}$"))
+
+    def set_sort_mode(self, mode: str):
+        src = self.sourceModel()
+        if src is None or not src.set_sort_mode(mode):
+            return
+        # -1 keeps the source order, which the model maintains itself in distance mode.
+        self.sort(-1 if src.orders_rows() else 0)
+        self.invalidate()
+
+
+class WorldListView(QListView):
+    """List view that paints a hint while the (filtered) model is empty."""
+
+    def __init__(self, placeholder: str = "", parent=None):
+        super().__init__(parent)
+        self.placeholder = str(placeholder or "")
+        self.setUniformItemSizes(True)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        model = self.model()
+        if not self.placeholder or model is None or model.rowCount() > 0:
+            return
+        painter = QPainter(self.viewport())
+        painter.setPen(self.palette().placeholderText().color())
+        painter.drawText(self.viewport().rect().adjusted(4, 4, -4, -4),
+                         Qt.AlignLeft | Qt.AlignTop, self.placeholder)
+        painter.end()
@@ -2550,7 +2550,7 @@ function Commands.init(Util, Pointers, Teleport, Registry)
                 end
                 self_name = name
             else
-                list[#list + 1] = { name = name }
+                list[#list + 1] = { name = name, loc = get_actor_location(e.pawn) }
             end
         end
 
@@ -2591,7 +2591,13 @@ function Commands.init(Util, Pointers, Teleport, Registry)
             out[#out + 1] = "SELF:" .. tostring(self_name)
         end
         for _, e in ipairs(list) do
-            out[#out + 1] = "P:" .. tostring(e.name or "Player")
+            -- Names have ':' stripped, so an optional trailing ":x,y,z" is unambiguous.
+            local pos = ""
+            local x, y, z = e.loc and tonumber(e.loc.X), e.loc and tonumber(e.loc.Y), e.loc and tonumber(e.loc.Z)
+            if x and y and z then
+                pos = string.format(":%.1f,%.1f,%.1f", x, y, z)
+            end
+            out[#out + 1] = "P:" .. tostring(e.name or "Player") .. pos
         end
         if (not self_name or self_name == "") and #list == 1 then
             -- Single-player fallback: assume the only entry is self.
@@ -2603,15 +2609,32 @@ function Commands.init(Util, Pointers, Teleport, Registry)
         return true, payload
     end, "GUI: returns player list string", "Players")
 
-    reg("weapon_gui_state", function(args)
+    -- Last payload per (target, weapon object): the weapon topic re-reads the equipped
+    -- weapon every registry tick, and the class scan only has to run when it changed.
+    local weapon_state_key = nil
+    local weapon_state_text = nil
+
+    local function weapon_obj_key(obj)
+        if obj.GetAddress then
+            local ok, addr = pcall(obj.GetAddress, obj)
+            if ok and addr then return tostring(addr) end
+        end
+        return tostring(obj)
+    end
+
+    local function weapon_state_payload(args)
         local pawn, who = parse_target_args(args or {})
         local target_name = sanitize_state_token(who or "self")
         if not pawn then
-            return true, "WEAPONSTATE=TARGET:" .. target_name .. "#OK:0"
+            return "WEAPONSTATE=TARGET:" .. target_name .. "#OK:0"
         end
         local weapon = get_player_weapon(pawn)
         if not weapon then
-            return true, "WEAPONSTATE=TARGET:" .. target_name .. "#OK:0"
+            return "WEAPONSTATE=TARGET:" .. target_name .. "#OK:0"
+        end
+        local key = target_name .. "@" .. weapon_obj_key(weapon)
+        if key == weapon_state_key then
+            return weapon_state_text
         end
         local meta = weapon_meta_from_obj(weapon) or {}
         local name = meta.name or get_actor_name(weapon)
@@ -2624,7 +2647,13 @@ function Commands.init(Util, Pointers, Teleport, Registry)
             sanitize_state_token(code),
             sanitize_state_token(cls)
         )
-        return true, payload
+        weapon_state_key = key
+        weapon_state_text = payload
+        return payload
+    end
+
+    reg("weapon_gui_state", function(args)
+        return true, weapon_state_payload(args)
     end, "GUI: returns current weapon for target player", "Weapons")
 
     reg("world_registry_scan", function(args)
@@ -2657,6 +2686,15 @@ function Commands.init(Util, Pointers, Teleport, Registry)
         return true, "OK"
     end, "GUI: forces state snapshot emit", "Debug")
 
+    reg("bridge_proto", function(args)
+        local want = tonumber(args and args[1]) or 1
+        local level = 1
+        if R and R.set_protocol then
+            level = R.set_protocol(want)
+        end
+        return true, "PROTO=" .. tostring(level)
+    end, "GUI: negotiate bridge protocol (2 = delta world stream)", "Debug")
+
     reg("registry_clear", function(args)
         if R and R.clear then
             R.clear()
@@ -66,6 +66,8 @@ local BRIDGE_ACK_PATH = BRIDGE_DIR .. "bridge_ack.txt"
 local BRIDGE_NOTICE_PATH = BRIDGE_DIR .. "bridge_notice.txt"
 local BRIDGE_REGISTRY_PATH = BRIDGE_DIR .. "bridge_registry.txt"
 local BRIDGE_STATE_PATH = BRIDGE_DIR .. "bridge_state.txt"
+local BRIDGE_REGISTRY_BIN_PATH = BRIDGE_DIR .. "bridge_registry.bin"
+local BRIDGE_STATE_BIN_PATH = BRIDGE_DIR .. "bridge_state.bin"
 
 local OVERLAY_LAUNCH_GUARD_KEY = "_BLACKBOX_OVERLAY_LAUNCHED"
 local EXTERNAL_OVERLAY_EXE = BRIDGE_DIR .. "BlackboxOverlay.exe"
@@ -207,15 +209,140 @@ local function _sanitize_token(s)
     return s
 end
 
-local function _bridge_ack(id, ok, msg)
+-- Ack/notice/registry files are append-only journals: J|<epoch>|<seq>|<payload>.
+-- The overlay keeps a (epoch, seq) cursor so bursts are delivered exactly once.
+-- Past JOURNAL_MAX_BYTES the file moves to <path>.1 and a fresh one starts.
+local JOURNAL_EPOCH = tostring(os.time())
+local JOURNAL_MAX_BYTES = 256 * 1024
+local _journals = {}
+
+local function _journal_next(path)
+    local j = _journals[path]
+    if not j then
+        j = { seq = 0, bytes = 0 }
+        _journals[path] = j
+        os.remove(path .. ".1")
+        local f0 = io.open(path, "wb")
+        if f0 then f0:close() end
+    end
+    if j.bytes >= JOURNAL_MAX_BYTES then
+        os.remove(path .. ".1")
+        if os.rename(path, path .. ".1") then
+            j.bytes = 0
+        end
+    end
+    j.seq = j.seq + 1
+    return j
+end
+
+local function _journal_write(path, j, data)
+    local f = io.open(path, "ab")
+    if not f then return false end
+    f:write(data)
+    f:close()
+    j.bytes = j.bytes + #data
+    return true
+end
+
+local function _journal_append(path, payload)
+    local j = _journal_next(path)
+    local text = tostring(payload or ""):gsub("[\r\n]", " ")
+    return _journal_write(path, j, string.format("J|%s|%d|%s\n", JOURNAL_EPOCH, j.seq, text))
+end
+
+-- Binary journal frame: u32 len | u32 epoch | u32 seq | body (len counts epoch + seq + body).
+local function _journal_append_bin(path, body)
+    local j = _journal_next(path)
+    body = tostring(body or "")
+    local epoch = math.tointeger(tonumber(JOURNAL_EPOCH) or 0) or 0
+    return _journal_write(path, j, string.pack("<I4I4I4", #body + 8, epoch & 0xFFFFFFFF, j.seq) .. body)
+end
+
+-- Adaptive command poll: fast for a few seconds after a command, normal while the
+-- panel is open, slow when it is closed and nothing has arrived for a while.
+-- The loop ticks every BRIDGE_POLL_TICK_MS; _bridge_poll skips ticks until the
+-- current interval has passed.
+local BRIDGE_POLL_TICK_MS = 16
+local BRIDGE_POLL_FAST = 0.016
+local BRIDGE_POLL_OPEN = 0.10
+local BRIDGE_POLL_IDLE = 0.50
+local BRIDGE_POLL_HOT_S = 3.0
+local _bridge_last_poll = 0.0
+local _bridge_last_cmd = nil
+local _bridge_poll_interval = BRIDGE_POLL_OPEN
+local _bridge_cmd_wait = 0.0
+
+-- Optional loopback socket transport (luasocket). The overlay keeps one connection open;
+-- commands arrive as CMD lines and acks go back on the same connection.
+local BRIDGE_SOCKET_HOST = "127.0.0.1"
+local BRIDGE_SOCKET_PORT = 47815
+local BRIDGE_SOCKET_POLL_MS = 10
+local BRIDGE_SOCKET_MAX_LINES = 64
+
+local _bridge_socket_mod = nil
+local _bridge_server = nil
+local _bridge_client = nil
+local _bridge_client_buf = ""
+
+local function _try_require_socket()
+    local candidates = { "socket", "socket.core", "luasocket" }
+    for _, name in ipairs(candidates) do
+        local ok, mod = pcall(require, name)
+        if ok and type(mod) == "table" then
+            return mod
+        end
+    end
+    if type(_G.socket) == "table" then
+        return _G.socket
+    end
+    return nil
+end
+
+local function _bridge_socket_open()
+    if _bridge_server then return true end
+    _bridge_socket_mod = _bridge_socket_mod or _try_require_socket()
+    local sock = _bridge_socket_mod
+    if not sock or type(sock.bind) ~= "function" then
+        return false
+    end
+    local ok, server = pcall(sock.bind, BRIDGE_SOCKET_HOST, BRIDGE_SOCKET_PORT)
+    if not ok or not server then
+        return false
+    end
+    pcall(server.settimeout, server, 0)
+    _bridge_server = server
+    return true
+end
+
+local function _bridge_socket_drop()
+    if _bridge_client then
+        pcall(_bridge_client.close, _bridge_client)
+    end
+    _bridge_client = nil
+    _bridge_client_buf = ""
+end
+
+local function _bridge_socket_send(line)
+    if not _bridge_client then return false end
+    local ok, sent = pcall(_bridge_client.send, _bridge_client, line)
+    if not ok or not sent then
+        _bridge_socket_drop()
+        return false
+    end
+    return true
+end
+
+local function _bridge_ack(id, ok, msg, reply)
     id = tostring(id or "")
     if id == "" then return end
     local line = string.format("ACK|%s|%s|%s\n", id, ok and "1" or "0", _sanitize_token(msg or ""))
-    local f = io.open(BRIDGE_ACK_PATH, "w")
-    if f then
-        f:write(line)
-        f:close()
+    if reply and reply(line) then
+        return
+    end
+    if id == "0" and _bridge_socket_send(line) then
+        return
     end
+    _journal_append(BRIDGE_ACK_PATH, line:sub(1, -2))
 end
 
 local LAST_NOTICE_TEXT = ""
@@ -231,11 +358,7 @@ local function _bridge_notice(text)
     end
     LAST_NOTICE_TEXT = text
     LAST_NOTICE_TIME = now
-    local f = io.open(BRIDGE_NOTICE_PATH, "w")
-    if f then
-        f:write(text .. "\n")
-        f:close()
-    end
+    _journal_append(BRIDGE_NOTICE_PATH, text)
 end
 
 local function _bridge_parse_cmd(line)
@@ -271,102 +394,200 @@ end
 
 local _registry_tick
 
-local function _bridge_exec_cmd(line)
-    if not Commands or not Commands.run then
-        return
-    end
-    local id, name, arg = _bridge_parse_cmd(line)
+-- Batch frame: CMD|<id>|batch|<name>\31<arg>\31<name>\31<arg>... (BATCH_CMD in
+-- BlackboxBridge.py). The commands run in order in this tick and share one ack whose
+-- msg is <ok>\31<msg> pairs in the same order.
+local BRIDGE_BATCH_CMD = "batch"
+local BRIDGE_BATCH_SEP = "\31"
+
+local function _bridge_cmd_name(name)
     name = tostring(name or ""):lower()
-    name = (Util and Util.trim and Util.trim(name)) or name:gsub("^%s+", ""):gsub("%s+$", "")
-    if name == "" then return end
-    local args = {}
-    if Util and Util.split_ws then
-        args = Util.split_ws(arg)
-    else
-        for part in tostring(arg or ""):gmatch("%S+") do
-            args[#args + 1] = part
-        end
-    end
-    local ok, res = Commands.run(name, table.unpack(args))
-    _bridge_ack(id, ok, res or "")
-    if name == "listplayers_gui" and _emit_tp_notice then
-        _emit_tp_notice(true)
-    end
-    if name == "world_registry_scan" then
-        _registry_tick(true)
-    end
-    if name == "state_snapshot" or name == "registry_clear" or name == "registry_rebuild" then
-        _registry_tick(true)
+    return (Util and Util.trim and Util.trim(name)) or name:gsub("^%s+", ""):gsub("%s+$", "")
+end
+
+local function _bridge_batch_fields(arg)
+    local fields = {}
+    for field in (tostring(arg or "") .. BRIDGE_BATCH_SEP):gmatch("(.-)" .. BRIDGE_BATCH_SEP) do
+        fields[#fields + 1] = field
+    end
+    return fields
+end
+
+-- Topic subscriptions: CMD|<id>|subscribe|<topic>:<hz>[:<arg>] ... (TOPIC_RATES_HZ in
+-- BlackboxOverlay.py). The list replaces the previous one; an empty list drops them all,
+-- and so does closing the panel. A topic's GUI command only runs while it is subscribed,
+-- at most <hz> times a second (later changes wait for the tick), and its text is only
+-- published (notice + id-0 ack) when it differs from what the overlay last got.
+local BRIDGE_SUBSCRIBE_CMD = "subscribe"
+local TOPIC_COMMANDS = {
+    players = "listplayers_gui",
+    tp = "tp_gui_state",
+    puzzles = "puzzlestate",
+    contracts = "contract_gui_state",
+    weapon = "weapon_gui_state",
+}
+-- No game hook fires on these changes, so they are re-read on the registry tick.
+local TOPIC_POLLED = { weapon = true }
+local TOPIC_SUBS = {}
+local TOPIC_LAST_TEXT = {}
+-- Set by the first subscribe. Overlays that never send one (pre-subscription builds)
+-- keep the old behaviour: every change pushed, world emits never held.
+local TOPIC_SUBSCRIBED = false
+local TOPIC_LEGACY = {
+    players = { interval = 0, last = 0, pending = false, args = {} },
+    tp = { interval = 0, last = 0, pending = false, args = {} },
+    puzzles = { interval = 0.25, last = 0, pending = false, args = {} },
+    contracts = { interval = 0.25, last = 0, pending = false, args = {} },
+}
+
+local function _topic_subs()
+    return TOPIC_SUBSCRIBED and TOPIC_SUBS or TOPIC_LEGACY
+end
+
+local function _topic_now()
+    return (Util and Util.now_time and Util.now_time()) or os.clock()
+end
+
+local function _topic_decode(value)
+    return (tostring(value or ""):gsub("%%(%x%x)", function(hex)
+        return string.char(tonumber(hex, 16))
+    end))
+end
+
+local function _topic_due(topic, now)
+    local sub = _topic_subs()[topic]
+    if not sub then return false end
+    now = now or _topic_now()
+    if (now - sub.last) < sub.interval then
+        sub.pending = true
+        return false
     end
+    sub.last = now
+    sub.pending = false
+    return true
 end
 
-local LAST_PLAYERS_TEXT = ""
-local LAST_TP_TEXT = ""
+local function _publish(topic)
+    local cmd = TOPIC_COMMANDS[topic]
+    if not cmd or not Commands or not Commands.run then return end
+    if not _topic_due(topic) then return end
+    local sub = _topic_subs()[topic]
+    local ok, res = Commands.run(cmd, table.unpack(sub.args))
+    if ok and type(res) == "string" and res ~= "" and res ~= TOPIC_LAST_TEXT[topic] then
+        TOPIC_LAST_TEXT[topic] = res
+        _bridge_notice(res)
+        _bridge_ack("0", true, res)
+    end
+end
 
-local function _emit_tp_notice(force)
-    if not Commands or not Commands.run then return end
-    local ok, res = Commands.run("tp_gui_state")
-    if ok and type(res) == "string" and res:find("^TPSTATE=") then
-        if force or res ~= LAST_TP_TEXT then
-            LAST_TP_TEXT = res
-            _bridge_notice(res)
-            _bridge_ack("0", true, res)
+local function _publish_tick()
+    for topic, sub in pairs(_topic_subs()) do
+        if sub.pending or TOPIC_POLLED[topic] then
+            _publish(topic)
         end
     end
 end
 
-local function _emit_players_notice(force)
-    if not Commands or not Commands.run then return end
-    local ok, res = Commands.run("listplayers_gui")
-    if ok and type(res) == "string" and res:find("^PLAYERS=") then
-        local changed = res ~= LAST_PLAYERS_TEXT
-        if force or changed then
-            LAST_PLAYERS_TEXT = res
-            _bridge_notice(res)
+local function _topic_subscribe(arg)
+    local subs = {}
+    local names = {}
+    for spec in tostring(arg or ""):gmatch("%S+") do
+        local topic, hz, targ = spec:match("^([%w_]+):([%d%.]+):?(.*)$")
+        topic = topic and topic:lower()
+        hz = tonumber(hz)
+        if topic and hz and hz > 0 and (TOPIC_COMMANDS[topic] or topic == "world") then
+            local prev = TOPIC_SUBS[topic]
+            local args = {}
+            if targ and targ ~= "" then
+                args[1] = _topic_decode(targ)
+            end
+            subs[topic] = {
+                interval = 1.0 / hz,
+                last = prev and prev.last or 0,
+                -- New or re-targeted: publish once on the next tick if it changed meanwhile.
+                pending = not (prev and prev.args[1] == args[1]),
+                args = args,
+            }
+            names[#names + 1] = topic
         end
-        _emit_tp_notice(true)
     end
+    if subs.world and not TOPIC_SUBS.world and Registry and Registry.request_emit then
+        -- World changes were held while unsubscribed; start again from a keyframe.
+        Registry.request_emit(true)
+    end
+    TOPIC_SUBS = subs
+    TOPIC_SUBSCRIBED = true
+    table.sort(names)
+    return true, "SUBS=" .. table.concat(names, ",")
 end
 
-local LAST_PUZZLES_TIME = 0
-local LAST_PUZZLES_TEXT = ""
-local PUZZLES_COOLDOWN = 0.25
-
-local function _emit_puzzles_notice()
-    if not Commands or not Commands.run then return end
-    local now = (Util and Util.now_time and Util.now_time()) or os.clock()
-    if (now - LAST_PUZZLES_TIME) < PUZZLES_COOLDOWN then
-        return
+local function _bridge_run_cmd(name, arg)
+    if name == BRIDGE_SUBSCRIBE_CMD then
+        return _topic_subscribe(arg)
     end
-    LAST_PUZZLES_TIME = now
-    local ok, res = Commands.run("puzzlestate")
-    if ok and type(res) == "string" and res:find("^PUZZLES=") then
-        if res ~= LAST_PUZZLES_TEXT then
-            LAST_PUZZLES_TEXT = res
-            _bridge_notice(res)
-            _bridge_ack("0", true, res)
+    local args = {}
+    if Util and Util.split_ws then
+        args = Util.split_ws(arg)
+    else
+        for part in tostring(arg or ""):gmatch("%S+") do
+            args[#args + 1] = part
         end
     end
+    return Commands.run(name, table.unpack(args))
 end
 
-local LAST_CONTRACTS_TIME = 0
-local LAST_CONTRACTS_TEXT = ""
-local CONTRACTS_COOLDOWN = 0.25
+-- Follow-up pushes for commands whose answer changes other state; run after the ack.
+local function _bridge_after_cmd(name, res)
+    for topic, cmd in pairs(TOPIC_COMMANDS) do
+        if cmd == name and type(res) == "string" and res ~= "" then
+            -- The overlay has this answer now, so a publish only follows a real change.
+            TOPIC_LAST_TEXT[topic] = res
+        end
+    end
+    if name == "listplayers_gui" then
+        _publish("tp")
+    end
+    if name == "world_registry_scan" then
+        _registry_tick(true)
+    end
+    if name == "state_snapshot" or name == "registry_clear" or name == "registry_rebuild" or name == "bridge_proto" then
+        _registry_tick(true)
+    end
+end
 
-local function _emit_contracts_notice(force)
-    if not Commands or not Commands.run then return end
-    local now = (Util and Util.now_time and Util.now_time()) or os.clock()
-    if (not force) and (now - LAST_CONTRACTS_TIME) < CONTRACTS_COOLDOWN then
+local function _bridge_exec_cmd(line, reply)
+    if not Commands or not Commands.run then
         return
     end
-    local ok, res = Commands.run("contract_gui_state")
-    if ok and type(res) == "string" and res:find("^CONTRACTS=") then
-        if force or res ~= LAST_CONTRACTS_TEXT then
-            LAST_CONTRACTS_TEXT = res
-            LAST_CONTRACTS_TIME = now
-            _bridge_notice(res)
-            _bridge_ack("0", true, res)
+    local id, name, arg = _bridge_parse_cmd(line)
+    name = _bridge_cmd_name(name)
+    if name == "" then return end
+    if name ~= BRIDGE_BATCH_CMD then
+        local ok, res = _bridge_run_cmd(name, arg)
+        _bridge_ack(id, ok, res or "", reply)
+        _bridge_after_cmd(name, ok and res or nil)
+        return
+    end
+    local fields = _bridge_batch_fields(arg)
+    local names = {}
+    local answers = {}
+    local out = {}
+    local all_ok = true
+    for i = 1, #fields, 2 do
+        local sub = _bridge_cmd_name(fields[i])
+        local ok, res = false, ""
+        if sub ~= "" then
+            ok, res = _bridge_run_cmd(sub, fields[i + 1] or "")
+            names[#names + 1] = sub
+            answers[#names] = ok and res or false
         end
+        all_ok = all_ok and (ok and true or false)
+        out[#out + 1] = ok and "1" or "0"
+        out[#out + 1] = (_sanitize_token(res or ""):gsub(BRIDGE_BATCH_SEP, " "))
+    end
+    _bridge_ack(id, all_ok, table.concat(out, BRIDGE_BATCH_SEP), reply)
+    for i, sub in ipairs(names) do
+        _bridge_after_cmd(sub, answers[i] or nil)
     end
 end
 
@@ -383,11 +604,7 @@ local function _bridge_registry(text)
     end
     LAST_REGISTRY_TEXT = text
     LAST_REGISTRY_TIME = now
-    local f = io.open(BRIDGE_REGISTRY_PATH, "w")
-    if f then
-        f:write(text .. "\n")
-        f:close()
-    end
+    _journal_append(BRIDGE_REGISTRY_PATH, text)
 end
 
 local LAST_STATE_TEXT = ""
@@ -417,6 +634,10 @@ local function _set_panel_open(open, force_notice)
     end
     PANEL_OPEN = want
     _G.BlackboxRecode.PanelOpen = PANEL_OPEN
+    if not PANEL_OPEN then
+        -- Nobody is looking: stop producing topics until the overlay subscribes again.
+        TOPIC_SUBS = {}
+    end
     _bridge_notice("PANEL=" .. (PANEL_OPEN and "1" or "0"))
 end
 
@@ -429,7 +650,7 @@ local function _is_valid(obj)
     return true
 end
 
-local function _build_state_payload()
+local function _collect_state()
     local map_name = (Util and Util.get_current_map and Util.get_current_map())
         or (_G.get_current_map and _G.get_current_map())
         or (Teleport and Teleport.get_current_map and Teleport.get_current_map())
@@ -438,21 +659,34 @@ local function _build_state_payload()
         or (_G.get_local_pawn and _G.get_local_pawn())
         or (Teleport and Teleport.get_local_pawn and Teleport.get_local_pawn())
         or nil
-    local pawn_ok = _is_valid(pawn)
-    local world_ready = (map_name ~= "Unknown" and map_name ~= "")
-    local radar_active = (_G.BlackboxRecode and _G.BlackboxRecode.RadarActive) and true or false
-    local protocol_version = 1
-
     local counts = Registry and Registry.get_counts and Registry.get_counts() or {}
-    local now = (Util and Util.now_time and Util.now_time()) or os.clock()
+    return {
+        map = tostring(map_name),
+        world = (map_name ~= "Unknown" and map_name ~= ""),
+        pawn = _is_valid(pawn) and true or false,
+        radar = (_G.BlackboxRecode and _G.BlackboxRecode.RadarActive) and true or false,
+        panel = PANEL_OPEN and true or false,
+        proto = (Registry and Registry.PROTO_MAX) or 1,
+        proto_active = (Registry and Registry.get_protocol and Registry.get_protocol()) or 1,
+        counts = counts,
+        self_pos = Registry and Registry.get_self_pos and Registry.get_self_pos() or nil,
+        poll_ms = math.floor(_bridge_poll_interval * 1000 + 0.5),
+        cmd_wait_ms = math.floor(_bridge_cmd_wait * 1000 + 0.5),
+        now = (Util and Util.now_time and Util.now_time()) or os.clock(),
+    }
+end
 
+local function _build_state_payload(st)
+    st = st or _collect_state()
+    local counts = st.counts
     local parts = {
-        "MAP:" .. tostring(map_name),
-        "WORLD:" .. (world_ready and "1" or "0"),
-        "PAWN:" .. (pawn_ok and "1" or "0"),
-        "RADAR:" .. (radar_active and "1" or "0"),
-        "PANEL:" .. (PANEL_OPEN and "1" or "0"),
-        "PROTO:" .. tostring(protocol_version),
+        "MAP:" .. st.map,
+        "WORLD:" .. (st.world and "1" or "0"),
+        "PAWN:" .. (st.pawn and "1" or "0"),
+        "RADAR:" .. (st.radar and "1" or "0"),
+        "PANEL:" .. (st.panel and "1" or "0"),
+        "PROTO:" .. tostring(st.proto),
+        "PROTOACT:" .. tostring(st.proto_active),
         "REGTOTAL:" .. tostring(counts.total or 0),
         "MON:" .. tostring(counts.monsters or 0),
         "KEY:" .. tostring(counts.keycards or 0),
@@ -463,21 +697,118 @@ local function _build_state_payload()
         "PUZZLES:" .. tostring(counts.puzzles or 0),
         "EMIT:" .. string.format("%.3f", tonumber(counts.last_emit or 0)),
         "PRUNE:" .. string.format("%.3f", tonumber(counts.last_prune or 0)),
-        "STATEWRITE:" .. string.format("%.3f", now),
+        "STATEWRITE:" .. string.format("%.3f", st.now),
+        "POLLMS:" .. tostring(st.poll_ms),
+        "CMDWAIT:" .. tostring(st.cmd_wait_ms),
     }
     return "STATE=" .. table.concat(parts, "#")
 end
 
+-- Fixed-layout mirror of STATE in bridge_state.bin for the overlay to mmap.
+-- Header: c4 magic | u16 version | u16 size | u32 seq. seq is a seqlock: odd
+-- while the body is being written, even once it is consistent.
+local STATE_BLOCK_MAGIC = "BBST"
+local STATE_BLOCK_VERSION = 2
+local STATE_BLOCK_HEAD = "<c4I2I2I4"
+local STATE_BLOCK_BODY = "<BBBBBBxxI4I4I4I4I4I4I4I4dddBxxxfffc64I2I2"
+local STATE_BLOCK_SEQ_OFFSET = 8
+local STATE_BLOCK_HEAD_SIZE = string.packsize(STATE_BLOCK_HEAD)
+local STATE_BLOCK_SIZE = STATE_BLOCK_HEAD_SIZE + string.packsize(STATE_BLOCK_BODY)
+-- After a failed open or write, wait this long before trying the block again.
+local STATE_BLOCK_REOPEN_S = 1.0
+local _state_block = { file = nil, seq = 0, retry_at = 0 }
+
+local function _state_block_open()
+    local sb = _state_block
+    if sb.file then return sb.file end
+    if _topic_now() < sb.retry_at then return nil end
+    local f = io.open(BRIDGE_STATE_BIN_PATH, "r+b")
+    if f then
+        local size = f:seek("end")
+        local head = size == STATE_BLOCK_SIZE and f:seek("set", 0) and f:read(STATE_BLOCK_HEAD_SIZE)
+        local magic, version, _, seq
+        if head and #head == STATE_BLOCK_HEAD_SIZE then
+            magic, version, _, seq = string.unpack(STATE_BLOCK_HEAD, head)
+        end
+        if magic == STATE_BLOCK_MAGIC and version == STATE_BLOCK_VERSION then
+            -- Keep counting from the previous session so a mapped reader sees a change.
+            sb.seq = (seq + (seq % 2)) & 0xFFFFFFFF
+        else
+            f:close()
+            f = nil
+        end
+    end
+    if not f then
+        -- Fails while a reader still maps a block of another size; STATE text keeps working.
+        f = io.open(BRIDGE_STATE_BIN_PATH, "w+b")
+        if not f then
+            sb.retry_at = _topic_now() + STATE_BLOCK_REOPEN_S
+            return nil
+        end
+        sb.seq = 0
+        f:write(string.pack(STATE_BLOCK_HEAD, STATE_BLOCK_MAGIC, STATE_BLOCK_VERSION, STATE_BLOCK_SIZE, 0))
+        f:write(string.rep("\0", STATE_BLOCK_SIZE - STATE_BLOCK_HEAD_SIZE))
+        f:flush()
+    end
+    sb.file = f
+    return f
+end
+
+local function _state_block_body(st)
+    local counts = st.counts
+    local pos = st.self_pos
+    local function n(v) return math.tointeger(tonumber(v) or 0) or 0 end
+    return string.pack(STATE_BLOCK_BODY,
+        st.world and 1 or 0, st.pawn and 1 or 0, st.radar and 1 or 0, st.panel and 1 or 0,
+        n(st.proto), n(st.proto_active),
+        n(counts.total), n(counts.monsters), n(counts.keycards), n(counts.disks),
+        n(counts.blackbox), n(counts.weapons), n(counts.money), n(counts.puzzles),
+        tonumber(counts.last_emit or 0) or 0, tonumber(counts.last_prune or 0) or 0, st.now,
+        pos and 1 or 0,
+        pos and tonumber(pos.x) or 0, pos and tonumber(pos.y) or 0, pos and tonumber(pos.z) or 0,
+        (st.map:sub(1, 64) .. string.rep("\0", 64)):sub(1, 64),
+        math.min(n(st.poll_ms), 0xFFFF), math.min(n(st.cmd_wait_ms), 0xFFFF))
+end
+
+local function _state_block_write(st)
+    local f = _state_block_open()
+    if not f then return end
+    local sb = _state_block
+    local ok = pcall(function()
+        local body = _state_block_body(st)
+        sb.seq = (sb.seq + 1) & 0xFFFFFFFF
+        f:seek("set", STATE_BLOCK_SEQ_OFFSET)
+        f:write(string.pack("<I4", sb.seq))
+        f:flush()
+        f:seek("set", STATE_BLOCK_HEAD_SIZE)
+        f:write(body)
+        f:flush()
+        sb.seq = (sb.seq + 1) & 0xFFFFFFFF
+        f:seek("set", STATE_BLOCK_SEQ_OFFSET)
+        f:write(string.pack("<I4", sb.seq))
+        f:flush()
+    end)
+    if not ok then
+        pcall(function() f:close() end)
+        sb.file = nil
+        sb.retry_at = _topic_now() + STATE_BLOCK_REOPEN_S
+    end
+end
+
 _registry_tick = function(force_emit)
     if not Registry or not Registry.tick then return end
-    local payload = Registry.tick(force_emit)
-    if payload and payload:find("^WORLD=") then
+    -- Without a world subscription changes accumulate and go out as one delta later
+    -- (only for overlays that subscribe; older ones get every emit).
+    local hold = TOPIC_SUBSCRIBED and not force_emit and not _topic_due("world")
+    local payload, binary = Registry.tick(force_emit, hold)
+    if payload and binary then
+        _journal_append_bin(BRIDGE_REGISTRY_BIN_PATH, payload)
+    elseif payload and payload:find("^WORLD") then
         _bridge_registry(payload)
     end
-    local state_payload = _build_state_payload()
-    if state_payload then
-        _bridge_state(state_payload, force_emit)
-    end
+    local st = _collect_state()
+    _bridge_state(_build_state_payload(st), force_emit)
+    _state_block_write(st)
 end
 
 local function _registry_track(obj)
@@ -687,30 +1018,143 @@ local function _register_custom_hooks()
     end
 end
 
-local BRIDGE_POLL_INTERVAL = 0.10
-local _bridge_last_poll = 0.0
+local function _bridge_cadence(now)
+    if _bridge_last_cmd and (now - _bridge_last_cmd) < BRIDGE_POLL_HOT_S then
+        return BRIDGE_POLL_FAST
+    end
+    if PANEL_OPEN then
+        return BRIDGE_POLL_OPEN
+    end
+    return BRIDGE_POLL_IDLE
+end
+
+-- Read-only queries the overlay sends in the background (BACKGROUND_COMMANDS in
+-- BlackboxBridge.py). Everything else is a user action and runs first in a poll.
+local BRIDGE_BACKGROUND_CMDS = {
+    listplayers_gui = true,
+    tp_gui_state = true,
+    puzzlestate = true,
+    contract_gui_state = true,
+    weapon_gui_state = true,
+    subscribe = true,
+    world_registry_scan = true,
+    state_snapshot = true,
+    bridge_proto = true,
+}
+
+local function _bridge_is_background(line)
+    local _, name, arg = _bridge_parse_cmd(line)
+    name = _bridge_cmd_name(name)
+    if name == BRIDGE_BATCH_CMD then
+        -- A batch waits behind user actions only when everything in it is a query.
+        local fields = _bridge_batch_fields(arg)
+        local any = false
+        for i = 1, #fields, 2 do
+            local sub = _bridge_cmd_name(fields[i])
+            if sub ~= "" then
+                if BRIDGE_BACKGROUND_CMDS[sub] ~= true then
+                    return false
+                end
+                any = true
+            end
+        end
+        return any
+    end
+    return BRIDGE_BACKGROUND_CMDS[name] == true
+end
+
+local function _bridge_exec_batch(lines, reply)
+    local later = {}
+    for _, line in ipairs(lines) do
+        if _bridge_is_background(line) then
+            later[#later + 1] = line
+        else
+            _bridge_exec_cmd(line, reply)
+        end
+    end
+    for _, line in ipairs(later) do
+        _bridge_exec_cmd(line, reply)
+    end
+end
 
 local function _bridge_poll()
     local now = (Util and Util.now_time and Util.now_time()) or os.clock()
-    if (now - _bridge_last_poll) < BRIDGE_POLL_INTERVAL then
+    _bridge_poll_interval = _bridge_cadence(now)
+    local since = now - _bridge_last_poll
+    if since < _bridge_poll_interval then
         return
     end
     _bridge_last_poll = now
     local data = _bridge_read_all(BRIDGE_CMD_PATH)
     if data and data ~= "" then
+        -- Commands sat in the file at most since the previous read.
+        _bridge_cmd_wait = math.min(since, BRIDGE_POLL_IDLE)
+        _bridge_last_cmd = now
         _bridge_clear(BRIDGE_CMD_PATH)
+        local lines = {}
         for line in tostring(data):gmatch("[^\r\n]+") do
-            _bridge_exec_cmd(line)
+            lines[#lines + 1] = line
+        end
+        _bridge_exec_batch(lines)
+    end
+end
+
+local function _bridge_socket_poll()
+    if not _bridge_server then return end
+    if not _bridge_client then
+        local ok, client = pcall(_bridge_server.accept, _bridge_server)
+        if not ok or not client then return end
+        pcall(client.settimeout, client, 0)
+        pcall(client.setoption, client, "tcp-nodelay", true)
+        _bridge_client = client
+        _bridge_client_buf = ""
+    end
+    local lines = {}
+    local dropped = false
+    for _ = 1, BRIDGE_SOCKET_MAX_LINES do
+        local ok, data, err, partial = pcall(_bridge_client.receive, _bridge_client, "*l")
+        if not ok then
+            dropped = true
+            break
+        end
+        if data then
+            local line = _bridge_client_buf .. data
+            _bridge_client_buf = ""
+            if line ~= "" then
+                lines[#lines + 1] = line
+            end
+        else
+            if partial and partial ~= "" then
+                _bridge_client_buf = _bridge_client_buf .. partial
+            end
+            dropped = (err == "closed")
+            break
         end
     end
+    if #lines > 0 then
+        _bridge_last_cmd = (Util and Util.now_time and Util.now_time()) or os.clock()
+        _bridge_exec_batch(lines, _bridge_socket_send)
+    end
+    if dropped then
+        _bridge_socket_drop()
+    end
 end
 
 local function _start_bridge_loop()
     if _G.LoopAsync then
-        LoopAsync(100, function()
+        LoopAsync(BRIDGE_POLL_TICK_MS, function()
             _bridge_poll()
             return false
         end)
+        if _bridge_socket_open() then
+            LoopAsync(BRIDGE_SOCKET_POLL_MS, function()
+                _bridge_socket_poll()
+                return false
+            end)
+            if Util and Util.log then
+                Util.log("[BlackboxRecode] GUI bridge socket listening on port", BRIDGE_SOCKET_PORT)
+            end
+        end
         if Util and Util.log then
             Util.log("[BlackboxRecode] GUI bridge active (LoopAsync).")
         end
@@ -766,8 +1210,9 @@ local player_hooks = {
 for _, fn in ipairs(player_hooks) do
     _try_register_hook(fn, function()
         _hook_print("Players", fn)
-        _emit_players_notice(false)
-        _emit_tp_notice(true)
+        _publish("players")
+        _publish("tp")
+        _publish("weapon")
     end)
 end
 
@@ -803,7 +1248,7 @@ end
 
 local function _puzzle_bump(tag)
     _hook_print("Puzzles", tag)
-    _emit_puzzles_notice()
+    _publish("puzzles")
 end
 
 local CONTRACT_LIST_HOOKS = {
@@ -1302,7 +1747,7 @@ local function _maybe_emit_contracts_ready(count)
     end
     _last_contract_ready_count = count
     _last_contract_ready_time = now
-    _emit_contracts_notice(true)
+    _publish("contracts")
 end
 
 local function _dump_contract_list(hook_name, self_obj, args)
@@ -1699,6 +2144,7 @@ if _G.LoopAsync then
     LoopAsync(300, function()
         _registry_tick_throttled(false)
         _contract_hook_tick()
+        _publish_tick()
         return false
     end)
 else
@@ -1711,6 +2157,7 @@ else
         if _try_register_hook(fn, function()
             _registry_tick_throttled(false)
             _contract_hook_tick()
+            _publish_tick()
         end) then
             break
         end
@@ -1727,7 +2174,9 @@ local function _register_panel_toggle()
     local KEY_F1 = (Key and Key.F1) or 112
     RegisterKeyBind(KEY_F1, function()
         _set_panel_open(not PANEL_OPEN, true)
-        _bridge_state(_build_state_payload(), true)
+        local st = _collect_state()
+        _bridge_state(_build_state_payload(st), true)
+        _state_block_write(st)
     end)
 end
 
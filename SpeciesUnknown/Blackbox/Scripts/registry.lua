@@ -43,6 +43,16 @@ local REGISTRY = {
     scan_active = false,
     scan_seen = nil,
     ready_since = nil,
+    proto = 1,
+    sent_rows = {},
+    sent_self = "",
+    keyframe_id = 0,
+    delta_seq = 0,
+    last_keyframe = 0,
+    keyframe_requested = false,
+    bin_strings = {},
+    bin_nstrings = 0,
+    bin_new = {},
 }
 
 local EMIT_COOLDOWN = 0.25
@@ -56,6 +66,15 @@ local NAME_DELAY = 0.6
 local MAX_CLASSIFY_ATTEMPTS = 4
 local MAX_NAME_ATTEMPTS = 6
 local READY_SCAN_DELAY = 0.8
+-- PROTO 2: keyframes (WORLDK=) every KEYFRAME_INTERVAL, deltas (WORLDD=) in between.
+-- PROTO 3: the same stream as typed binary frames (layout in External/BlackboxCodec.py).
+local PROTO_MAX = 3
+local KEYFRAME_INTERVAL = 15.0
+local FRAME_KEYFRAME = 1
+local FRAME_DELTA = 2
+local ROW_HAS_POS = 1
+
+Registry.PROTO_MAX = PROTO_MAX
 
 local function now_time()
     return (U and U.now_time and U.now_time()) or os.clock()
@@ -881,6 +900,7 @@ function Registry.clear()
     REGISTRY.initial_scan_done = false
     REGISTRY.next_id = 1
     REGISTRY.dirty = true
+    REGISTRY.keyframe_requested = true
     return true
 end
 
@@ -941,29 +961,216 @@ local function update_self_position()
     return false
 end
 
-function Registry.build_payload()
-    local parts = {}
+local function build_self_text()
     local self_loc = REGISTRY.self_pos
-    if self_loc then
-        local sx = string.format("%.1f", tonumber(self_loc.x) or 0)
-        local sy = string.format("%.1f", tonumber(self_loc.y) or 0)
-        local sz = string.format("%.1f", tonumber(self_loc.z) or 0)
-        parts[#parts + 1] = table.concat({ "SELF", "", "Self", sx, sy, sz, "", "" }, ",")
+    if not self_loc then
+        return ""
+    end
+    return string.format("%.1f,%.1f,%.1f",
+        tonumber(self_loc.x) or 0, tonumber(self_loc.y) or 0, tonumber(self_loc.z) or 0)
+end
+
+local function build_entry_row(entry)
+    local tag = sanitize_token(entry.tag or "OBJECT")
+    local code = sanitize_token(entry.code or "")
+    local name = sanitize_token(entry.name or entry.class or "Unknown")
+    local x = (entry.x ~= nil) and string.format("%.1f", entry.x) or ""
+    local y = (entry.y ~= nil) and string.format("%.1f", entry.y) or ""
+    local z = (entry.z ~= nil) and string.format("%.1f", entry.z) or ""
+    local id = sanitize_token(entry.id or "")
+    local status = entry_status(entry)
+    return table.concat({ tag, code, name, x, y, z, id, status }, ",")
+end
+
+local function build_rows()
+    local parts = {}
+    local by_id = {}
+    local self_text = build_self_text()
+    if self_text ~= "" then
+        parts[#parts + 1] = "SELF,,Self," .. self_text .. ",,"
     end
     for _, entry in ipairs(Registry.list_entries()) do
-        local tag = sanitize_token(entry.tag or "OBJECT")
-        local code = sanitize_token(entry.code or "")
-        local name = sanitize_token(entry.name or entry.class or "Unknown")
-        local x = (entry.x ~= nil) and string.format("%.1f", entry.x) or ""
-        local y = (entry.y ~= nil) and string.format("%.1f", entry.y) or ""
-        local z = (entry.z ~= nil) and string.format("%.1f", entry.z) or ""
-        local id = sanitize_token(entry.id or "")
-        local status = entry_status(entry)
-        parts[#parts + 1] = table.concat({ tag, code, name, x, y, z, id, status }, ",")
+        local row = build_entry_row(entry)
+        parts[#parts + 1] = row
+        if entry.id ~= nil then
+            by_id[tostring(entry.id)] = row
+        end
     end
+    return parts, self_text, by_id
+end
+
+function Registry.build_payload()
+    local parts = build_rows()
     return "WORLD=" .. table.concat(parts, ";")
 end
 
+function Registry.set_protocol(level)
+    level = math.floor(tonumber(level) or 1)
+    if level < 1 then level = 1 end
+    if level > PROTO_MAX then level = PROTO_MAX end
+    REGISTRY.proto = level
+    REGISTRY.keyframe_requested = true
+    REGISTRY.emit_requested = true
+    return level
+end
+
+function Registry.get_protocol()
+    return REGISTRY.proto
+end
+
+function Registry.get_self_pos()
+    return REGISTRY.self_pos
+end
+
+local function begin_keyframe(now, sent, self_text)
+    REGISTRY.sent_rows = sent
+    REGISTRY.sent_self = self_text
+    REGISTRY.keyframe_id = REGISTRY.keyframe_id + 1
+    REGISTRY.delta_seq = 0
+    REGISTRY.last_keyframe = now
+    REGISTRY.keyframe_requested = false
+end
+
+local function build_keyframe(now)
+    local parts, self_text, sent = build_rows()
+    begin_keyframe(now, sent, self_text)
+    return "WORLDK=" .. tostring(REGISTRY.keyframe_id) .. "|" .. table.concat(parts, ";")
+end
+
+-- Rows (as built by row_fn) that were added/changed/removed since the last emit.
+local function diff_rows(row_fn)
+    local sent = REGISTRY.sent_rows
+    local seen = {}
+    local adds, upds, dels = {}, {}, {}
+    for _, reg in pairs(REGISTRY.by_tag) do
+        for _, entry in pairs(reg or {}) do
+            if entry and entry.id ~= nil then
+                local id = tostring(entry.id)
+                local row = row_fn(entry)
+                local prev = sent[id]
+                seen[id] = true
+                if prev == nil then
+                    adds[#adds + 1] = row
+                elseif prev ~= row then
+                    upds[#upds + 1] = row
+                end
+                sent[id] = row
+            end
+        end
+    end
+    for id in pairs(sent) do
+        if not seen[id] then
+            dels[#dels + 1] = id
+            sent[id] = nil
+        end
+    end
+    local self_text = build_self_text()
+    local self_moved = self_text ~= REGISTRY.sent_self
+    if self_moved then
+        REGISTRY.sent_self = self_text
+    end
+    return adds, upds, dels, self_moved, self_text
+end
+
+local function build_delta()
+    local adds, upds, dels, self_moved, self_text = diff_rows(build_entry_row)
+    if #adds == 0 and #upds == 0 and #dels == 0 and not self_moved then
+        return nil
+    end
+    REGISTRY.delta_seq = REGISTRY.delta_seq + 1
+    return string.format("WORLDD=%d|%d|%s|%s|%s|%s",
+        REGISTRY.keyframe_id, REGISTRY.delta_seq, self_moved and self_text or "",
+        table.concat(adds, ";"), table.concat(upds, ";"), table.concat(dels, ","))
+end
+
+local function bin_intern(s)
+    s = tostring(s or ""):sub(1, 65535)
+    local idx = REGISTRY.bin_strings[s]
+    if idx == nil then
+        idx = REGISTRY.bin_nstrings
+        REGISTRY.bin_nstrings = idx + 1
+        REGISTRY.bin_strings[s] = idx
+        REGISTRY.bin_new[#REGISTRY.bin_new + 1] = string.pack("<I2s2", idx, s)
+    end
+    return idx
+end
+
+local function bin_entry_row(entry)
+    local has_pos = entry.x ~= nil and entry.y ~= nil and entry.z ~= nil
+    local id = math.tointeger(tonumber(entry.id) or 0) or 0
+    return string.pack("<I4I2I2I2Bfffs2",
+        id & 0xFFFFFFFF,
+        bin_intern(entry.tag or "OBJECT"),
+        bin_intern(entry.code or ""),
+        bin_intern(entry_status(entry)),
+        has_pos and ROW_HAS_POS or 0,
+        has_pos and entry.x or 0.0,
+        has_pos and entry.y or 0.0,
+        has_pos and entry.z or 0.0,
+        tostring(entry.name or entry.class or "Unknown"):sub(1, 65535))
+end
+
+local function bin_frame(kind, with_self, adds, upds, dels)
+    local parts = { string.pack("<BI4I4", kind, REGISTRY.keyframe_id, REGISTRY.delta_seq) }
+    local self_loc = REGISTRY.self_pos
+    if with_self and self_loc then
+        parts[#parts + 1] = string.pack("<Bfff", 1,
+            tonumber(self_loc.x) or 0, tonumber(self_loc.y) or 0, tonumber(self_loc.z) or 0)
+    else
+        parts[#parts + 1] = string.pack("<B", 0)
+    end
+    local new = REGISTRY.bin_new
+    REGISTRY.bin_new = {}
+    parts[#parts + 1] = string.pack("<I2", #new)
+    for i = 1, #new do
+        parts[#parts + 1] = new[i]
+    end
+    for _, rows in ipairs({ adds, upds }) do
+        parts[#parts + 1] = string.pack("<I4", #rows)
+        for i = 1, #rows do
+            parts[#parts + 1] = rows[i]
+        end
+    end
+    parts[#parts + 1] = string.pack("<I4", #dels)
+    for i = 1, #dels do
+        parts[#parts + 1] = string.pack("<I4", (math.tointeger(tonumber(dels[i]) or 0) or 0) & 0xFFFFFFFF)
+    end
+    return table.concat(parts)
+end
+
+local function build_bin_keyframe(now)
+    REGISTRY.bin_strings = {}
+    REGISTRY.bin_nstrings = 0
+    REGISTRY.bin_new = {}
+    local rows = {}
+    local sent = {}
+    for _, entry in ipairs(Registry.list_entries()) do
+        local row = bin_entry_row(entry)
+        rows[#rows + 1] = row
+        if entry.id ~= nil then
+            sent[tostring(entry.id)] = row
+        end
+    end
+    begin_keyframe(now, sent, build_self_text())
+    return bin_frame(FRAME_KEYFRAME, true, rows, {}, {})
+end
+
+local function build_bin_delta()
+    local adds, upds, dels, self_moved = diff_rows(bin_entry_row)
+    if #adds == 0 and #upds == 0 and #dels == 0 and not self_moved then
+        return nil
+    end
+    REGISTRY.delta_seq = REGISTRY.delta_seq + 1
+    return bin_frame(FRAME_DELTA, self_moved, adds, upds, dels)
+end
+
+local function clear_emit_flags(now)
+    REGISTRY.last_emit = now
+    REGISTRY.dirty = false
+    REGISTRY.emit_requested = false
+    REGISTRY.force_emit = false
+end
+
 function Registry.consume_payload(force)
     local now = now_time()
     local wants_emit = REGISTRY.dirty or REGISTRY.emit_requested or force
@@ -973,23 +1180,29 @@ function Registry.consume_payload(force)
     if not force and (now - REGISTRY.last_emit) < EMIT_COOLDOWN then
         return nil
     end
+    if REGISTRY.proto >= 2 then
+        local binary = REGISTRY.proto >= 3
+        local payload
+        if force or REGISTRY.keyframe_requested or (now - REGISTRY.last_keyframe) >= KEYFRAME_INTERVAL then
+            payload = binary and build_bin_keyframe(now) or build_keyframe(now)
+        else
+            payload = binary and build_bin_delta() or build_delta()
+        end
+        clear_emit_flags(now)
+        return payload, binary
+    end
     local payload = Registry.build_payload()
     if not force and payload == REGISTRY.last_payload then
-        REGISTRY.dirty = false
-        REGISTRY.emit_requested = false
-        REGISTRY.force_emit = false
-        REGISTRY.last_emit = now
+        clear_emit_flags(now)
         return nil
     end
     REGISTRY.last_payload = payload
-    REGISTRY.last_emit = now
-    REGISTRY.dirty = false
-    REGISTRY.emit_requested = false
-    REGISTRY.force_emit = false
+    clear_emit_flags(now)
     return payload
 end
 
-function Registry.tick(force_emit)
+-- hold: keep tracking but emit nothing (dirty state stays for a later delta).
+function Registry.tick(force_emit, hold)
     local now = now_time()
     _update_ready_state(now)
     if not REGISTRY.initial_scan_done and not REGISTRY.scan_active then
@@ -1008,6 +1221,9 @@ function Registry.tick(force_emit)
         Registry.full_rescan()
     end
     Registry.prune(now)
+    if hold and not REGISTRY.force_emit then
+        return nil
+    end
     return Registry.consume_payload(force_emit or REGISTRY.force_emit)
 end
 
@@ -0,0 +1,94 @@
+"""Round-trip corpus for the binary world frames (BlackboxCodec, PROTO 3)."""
+
+import struct
+
+import pytest
+
+from BlackboxCodec import FRAME_DELTA, FRAME_KEYFRAME, CodecError, WorldFrameDecoder, WorldFrameEncoder
+from BlackboxWorld import WorldModel
+
+CORPUS = [
+    {"tag": "KEYCARD", "code": "KC", "name": "Plain", "x": 1.0, "y": 2.0, "z": 3.0, "id": "1", "status": "Uncollected"},
+    {"tag": "DATA", "code": "", "name": "Comma, semi; pipe| hash# colon:", "x": -0.05, "y": 0.0, "z": 1e6,
+     "id": "2", "status": "Collected"},
+    {"tag": "MONSTER", "code": "MN", "name": "Line\nbreak\r\n", "x": 123456.75, "y": -98765.5, "z": 0.25,
+     "id": "3", "status": "HP 50/100"},
+    {"tag": "WEAPON", "code": "RF", "name": "Ünïcödé ☃ 名前", "x": None, "y": None, "z": None,
+     "id": "4", "status": "Uncollected"},
+    {"tag": "MONEY", "code": "$", "name": "", "x": 0.0, "y": 0.0, "z": 0.0, "id": "4294967295", "status": ""},
+    {"tag": "PUZZLES", "code": "PZ", "name": "x" * 4000, "x": 1.5, "y": 2.5, "z": 3.5, "id": "6",
+     "status": "Uncollected"},
+]
+
+
+def _f32(v):
+    return None if v is None else struct.unpack("<f", struct.pack("<f", float(v)))[0]
+
+
+def _expected(entries) -> dict:
+    out = {}
+    for e in entries:
+        status = str(e.get("status") or "")
+        out[e["id"]] = {
+            "tag": str(e["tag"]).upper(),
+            "code": e["code"],
+            "name": e["name"] or "Unknown",
+            "x": _f32(e["x"]),
+            "y": _f32(e["y"]),
+            "z": _f32(e["z"]),
+            "id": e["id"],
+            "status": status.upper() if status else "UNKNOWN",
+        }
+    return out
+
+
+@pytest.fixture
+def entries():
+    return [dict(e) for e in CORPUS]
+
+
+def test_keyframe_round_trip(entries):
+    frame = WorldFrameDecoder().decode(WorldFrameEncoder().keyframe(entries, {"x": 1.0, "y": 2.0, "z": 3.0}))
+    assert frame["kind"] == FRAME_KEYFRAME
+    assert frame["self"] == {"x": 1.0, "y": 2.0, "z": 3.0}
+    model = WorldModel()
+    assert model.apply_frame(frame)
+    assert model.entries == _expected(entries)
+
+
+def test_delta_round_trip(entries):
+    enc, dec, model = WorldFrameEncoder(), WorldFrameDecoder(), WorldModel()
+    assert model.apply_frame(dec.decode(enc.keyframe(entries, None)))
+    entries[0]["x"] = 99.5
+    entries[1]["status"] = "Uncollected"
+    entries.pop(2)
+    entries.append({"tag": "NEWTAG", "code": "NT", "name": "added; later", "x": 7.0, "y": 8.0, "z": 9.0,
+                    "id": "77", "status": "Uncollected"})
+    frame = dec.decode(enc.delta(entries, {"x": 4.0, "y": 5.0, "z": 6.0}))
+    assert frame["kind"] == FRAME_DELTA
+    assert [e["id"] for e in frame["adds"]] == ["77"]
+    assert sorted(e["id"] for e in frame["upds"]) == ["1", "2"]
+    assert frame["dels"] == ["3"]
+    assert model.apply_frame(frame)
+    assert model.entries == _expected(entries)
+
+
+def test_unchanged_delta_is_empty(entries):
+    enc = WorldFrameEncoder()
+    enc.keyframe(entries, {"x": 4.0, "y": 5.0, "z": 6.0})
+    assert enc.delta(entries, {"x": 4.0, "y": 5.0, "z": 6.0}) is None
+
+
+def test_truncated_frames_raise(entries):
+    data = WorldFrameEncoder().keyframe(entries, None)
+    for n in range(len(data)):
+        with pytest.raises(CodecError):
+            WorldFrameDecoder().decode(data[:n])
+
+
+def test_delta_without_keyframe_raises(entries):
+    enc = WorldFrameEncoder()
+    enc.keyframe(entries, None)
+    entries[0]["x"] = 50.0
+    with pytest.raises(CodecError):
+        WorldFrameDecoder().decode(enc.delta(entries, None))
@@ -0,0 +1,98 @@
+"""sync_combo: minimal edits that keep the current selection."""
+
+import os
+
+import pytest
+
+from BlackboxCombo import (
+    combo_items,
+    sync_combo,
+)
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PySide6.QtWidgets")
+
+
+class _Combo(QtWidgets.QComboBox):
+    """Counts the edits sync_combo makes."""
+
+    def __init__(self):
+        super().__init__()
+        self.edits = []
+        self.changed = []
+        self.currentIndexChanged.connect(self.changed.append)
+
+    def insertItem(self, index, text, data=None):
+        self.edits.append(("insert", index, text))
+        super().insertItem(index, text, data)
+
+    def removeItem(self, index):
+        self.edits.append(("remove", index))
+        super().removeItem(index)
+
+    def setItemText(self, index, text):
+        self.edits.append(("text", index, text))
+        super().setItemText(index, text)
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def _combo(items, current=None) -> _Combo:
+    combo = _Combo()
+    for text, data in items:
+        combo.addItem(text, data)
+    if current is not None:
+        combo.setCurrentIndex(current)
+    combo.edits.clear()
+    combo.changed.clear()
+    return combo
+
+
+PLAYERS = [("Ann", "1"), ("Bob", "2"), ("Cid", "3")]
+
+
+def test_same_items_are_left_alone(app):
+    combo = _combo(PLAYERS, current=1)
+    assert not sync_combo(combo, PLAYERS)
+    assert combo.edits == []
+
+
+def test_insert_keeps_the_selection(app):
+    combo = _combo(PLAYERS, current=1)
+    assert sync_combo(combo, [("Ann", "1"), ("Abe", "9"), ("Bob", "2"), ("Cid", "3")])
+    assert combo.edits == [("insert", 1, "Abe")]
+    assert combo.currentData() == "2"
+    assert combo.changed == []
+
+
+def test_removal_elsewhere_keeps_the_selection(app):
+    combo = _combo(PLAYERS, current=2)
+    assert sync_combo(combo, [("Bob", "2"), ("Cid", "3")])
+    assert combo.edits == [("remove", 0)]
+    assert combo.currentData() == "3"
+
+
+def test_rename_only_sets_text(app):
+    combo = _combo(PLAYERS, current=1)
+    assert sync_combo(combo, [("Ann", "1"), ("Bobby", "2"), ("Cid", "3")])
+    assert combo.edits == [("text", 1, "Bobby")]
+    assert combo.currentText() == "Bobby"
+
+
+def test_losing_the_current_item_falls_back_to_the_first(app):
+    combo = _combo(PLAYERS, current=1)
+    assert sync_combo(combo, [("Ann", "1"), ("Cid", "3"), ("Dee", "4")])
+    assert combo_items(combo) == [("Ann", "1"), ("Cid", "3"), ("Dee", "4")]
+    assert combo.currentIndex() == 0
+
+
+def test_empty_combo_fills_and_empties(app):
+    combo = _combo([])
+    assert sync_combo(combo, PLAYERS)
+    assert combo_items(combo) == PLAYERS
+    assert combo.currentIndex() == 0
+    assert sync_combo(combo, [])
+    assert combo.count() == 0
@@ -0,0 +1,103 @@
+"""FrameCoalescer: merging, priority order, budget deferral and parked views."""
+
+import pytest
+
+from BlackboxFrame import FrameCoalescer
+
+
+class _Clock:
+    def __init__(self, now: float = 100.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _frame(clock, budget_s=0.008, cost_s=0.0):
+    """A coalescer whose views each take cost_s of the clock; renders are logged."""
+    frame = FrameCoalescer(30.0, budget_s, clock=clock)
+    log = []
+
+    def view(name):
+        def _render(*args):
+            clock.now += cost_s
+            log.append((name, args))
+        return _render
+
+    for name, prio in (("players", 0), ("tp", 1), ("world", 2)):
+        frame.register(name, view(name), prio, tabs=(name,))
+    return frame, log
+
+
+def test_marks_merge_and_payloads_drop():
+    frame, log = _frame(_Clock())
+    assert frame.mark("tp")
+    assert not frame.mark("tp")
+    assert (frame.merged, frame.dropped) == (1, 0)
+    assert frame.mark("players", "old")
+    assert not frame.mark("players", "new")
+    assert (frame.merged, frame.dropped) == (2, 1)
+    assert frame.flush() == 2
+    assert log == [("players", ("new",)), ("tp", ())]
+    assert frame.flush() == 0
+
+
+def test_priority_order_and_budget_deferral():
+    clock = _Clock()
+    frame, log = _frame(clock, budget_s=0.008, cost_s=0.005)
+    for name in ("world", "tp", "players"):
+        frame.mark(name)
+    assert frame.flush() == 2
+    assert [name for name, _ in log] == ["players", "tp"]
+    assert frame.deferred == 1
+    assert frame.pending()
+    assert frame.flush() == 1
+    assert [name for name, _ in log] == ["players", "tp", "world"]
+
+
+def test_at_least_one_view_runs_over_budget():
+    clock = _Clock()
+    frame, log = _frame(clock, budget_s=0.0, cost_s=0.050)
+    frame.mark("tp")
+    frame.mark("world")
+    assert frame.flush() == 1
+    assert log == [("tp", ())]
+    assert frame.deferred == 1
+
+
+def test_gated_views_park_until_their_tab_shows():
+    frame, log = _frame(_Clock())
+    shown = {"players"}
+    frame.set_gate(lambda tabs: not tabs or bool(shown.intersection(tabs)))
+    frame.mark("world", 1)
+    frame.mark("world", 2)
+    frame.mark("players")
+    assert frame.parked() == ["world"]
+    assert frame.flush() == 1
+    assert not frame.pending()
+    assert frame.due_in() is None
+    shown.add("world")
+    assert frame.flush() == 1
+    assert log == [("players", ()), ("world", (2,))]
+
+
+def test_due_in_follows_the_frame_interval():
+    clock = _Clock()
+    frame, _ = _frame(clock)
+    frame.mark("tp")
+    assert frame.due_in() == 0.0
+    frame.flush()
+    frame.mark("tp")
+    assert frame.due_in() == pytest.approx(1.0 / 30.0)
+    frame.set_rate(10.0, 0.004)
+    clock.now += 0.05
+    assert frame.due_in() == pytest.approx(0.05)
+
+
+def test_a_failing_view_is_counted_and_cleared():
+    frame, _ = _frame(_Clock())
+    frame.register("bad", lambda: 1 / 0, 0)
+    frame.mark("bad")
+    assert frame.flush() == 1
+    assert frame.errors == 1
+    assert not frame.pending()
@@ -0,0 +1,152 @@
+"""CommandFuture, CommandTask and the gather/race combinators."""
+
+import time
+import types
+
+import pytest
+
+from BlackboxBridge import (
+    CommandBridge,
+    CommandCancelled,
+    CommandFuture,
+    CommandTimeout,
+    gather,
+    race,
+    spawn,
+)
+
+
+@types.coroutine
+def _yield(fut):
+    # Hands fut to the task even when it is settled (await skips those).
+    return (yield fut)
+
+
+def test_then_chains_and_waits_on_returned_futures():
+    first = CommandFuture(1, "a")
+    second = CommandFuture(2, "b")
+    out = first.then(lambda res: second).then(lambda res: res[1].upper())
+    first.set_result((True, "x"))
+    assert not out.done()
+    second.set_result((True, "y"))
+    assert out.result() == "Y"
+
+
+def test_call_times_out_into_the_task(tmp_path):
+    bridge = CommandBridge(str(tmp_path / "bridge_cmd.txt"))
+
+    async def flow():
+        try:
+            await bridge.call("tp_gui_state", "", 1.0)
+        except CommandTimeout:
+            return "timed out"
+        return "answered"
+
+    task = spawn(flow())
+    assert not task.done()
+    assert bridge.expire(time.monotonic() + 2.0) == 1
+    assert task.result() == "timed out"
+    assert bridge.timeouts == 1
+
+
+def test_cancel_throws_into_the_coroutine():
+    waited = CommandFuture(1, "a")
+    seen = []
+
+    async def flow():
+        try:
+            await waited
+        except CommandCancelled:
+            seen.append("cancelled")
+            raise
+
+    task = spawn(flow())
+    assert task.cancel()
+    assert seen == ["cancelled"]
+    with pytest.raises(CommandCancelled):
+        task.result()
+    assert not task.cancel()
+    # The future it was waiting on settling later does not wake it again.
+    waited.set_result((True, ""))
+    assert seen == ["cancelled"]
+
+
+def test_gather_keeps_order_and_fails_on_the_first_error():
+    a, b = CommandFuture(1, "a"), CommandFuture(2, "b")
+    both = gather([a, b])
+    b.set_result((True, "b"))
+    a.set_result((True, "a"))
+    assert both.result() == [(True, "a"), (True, "b")]
+    assert gather([]).result() == []
+
+    c, d = CommandFuture(3, "c"), CommandFuture(4, "d")
+
+    async def flow():
+        try:
+            await gather([c, d])
+        except ValueError as exc:
+            return str(exc)
+
+    task = spawn(flow())
+    d.set_exception(ValueError("d failed"))
+    assert task.result() == "d failed"
+    c.set_result((True, "c"))
+    assert task.result() == "d failed"
+
+
+def test_race_settles_with_the_winner_and_cancels_the_losers():
+    slow = CommandFuture(1, "slow")
+    fast = CommandFuture(2, "fast")
+    cancelled = []
+
+    async def waiter(fut):
+        try:
+            return await fut
+        except CommandCancelled:
+            cancelled.append(fut.name)
+            raise
+
+    slow_task, fast_task = spawn(waiter(slow)), spawn(waiter(fast))
+    out = race([slow_task, fast_task])
+    fast.set_result((True, "fast"))
+    assert out.result() == (True, "fast")
+    assert cancelled == ["slow"]
+    with pytest.raises(CommandCancelled):
+        slow_task.result()
+    slow.set_result((True, "slow"))
+    assert out.result() == (True, "fast")
+
+
+def test_race_passes_a_failure_through():
+    a, b = CommandFuture(1, "a"), CommandFuture(2, "b")
+    out = race([a, b])
+    a.set_exception(CommandTimeout("a: no ack"))
+    b.set_result((True, "b"))
+    with pytest.raises(CommandTimeout):
+        out.result()
+
+
+def test_settled_futures_do_not_nest_steps():
+    settled = []
+    for i in range(5000):
+        fut = CommandFuture(i, "q")
+        fut.set_result((True, str(i)))
+        settled.append(fut)
+
+    async def flow():
+        total = 0
+        for fut in settled:
+            total += int((await _yield(fut))[1])
+        return total
+
+    assert spawn(flow()).result() == sum(range(5000))
+
+
+def test_awaiting_something_else_raises_in_the_coroutine():
+    async def flow():
+        try:
+            await _yield("not a future")
+        except TypeError:
+            return "refused"
+
+    assert spawn(flow()).result() == "refused"
@@ -0,0 +1,80 @@
+"""CpuGovernor: scale up over budget, hold in the dead band, ease back down."""
+
+import pytest
+
+from BlackboxGovernor import CpuGovernor
+
+
+class _Clocks:
+    """Wall and CPU clocks the test advances together."""
+
+    def __init__(self):
+        self.wall = 100.0
+        self.cpu = 5.0
+
+    def run(self, seconds: float, usage: float):
+        self.wall += seconds
+        self.cpu += seconds * usage
+
+
+def _governor(budget=0.02, max_scale=4.0):
+    clocks = _Clocks()
+    gov = CpuGovernor(budget, max_scale, clock=lambda: clocks.wall, cpu=lambda: clocks.cpu)
+    return gov, clocks
+
+
+def test_over_budget_scales_up_to_the_cap():
+    gov, clocks = _governor()
+    changed, scales = [], []
+    for _ in range(5):
+        clocks.run(1.0, 0.05)
+        changed.append(gov.sample())
+        scales.append(gov.scale)
+    assert scales == pytest.approx([1.5, 2.25, 3.375, 4.0, 4.0])
+    assert changed == [True, True, True, True, False]
+    assert gov.usage == pytest.approx(0.05)
+    assert gov.throttles == 4
+    assert gov.interval(0.5) == pytest.approx(2.0)
+
+
+def test_dead_band_holds_the_scale():
+    gov, clocks = _governor()
+    clocks.run(1.0, 0.05)
+    gov.sample()
+    # Between half the budget and the budget nothing moves.
+    clocks.run(1.0, 0.015)
+    assert not gov.sample()
+    assert gov.scale == pytest.approx(1.5)
+
+
+def test_under_half_budget_eases_back_and_snaps_to_one():
+    gov, clocks = _governor()
+    for _ in range(2):
+        clocks.run(1.0, 0.05)
+        gov.sample()
+    scales = []
+    for _ in range(4):
+        clocks.run(1.0, 0.001)
+        gov.sample()
+        scales.append(gov.scale)
+    # 2.25 -> 1.8 -> 1.44 -> 1.152 -> 0.92 snaps to 1.
+    assert scales == pytest.approx([1.8, 1.44, 1.152, 1.0])
+    assert gov.recoveries == 4
+    clocks.run(1.0, 0.001)
+    assert not gov.sample()
+
+
+def test_focus_holds_full_rate():
+    gov, clocks = _governor()
+    clocks.run(1.0, 0.05)
+    gov.sample()
+    clocks.run(1.0, 0.5)
+    assert gov.sample(focused=True)
+    assert gov.scale == 1.0
+    assert "focused" in gov.summary()
+
+
+def test_empty_window_is_ignored():
+    gov, clocks = _governor()
+    assert not gov.sample()
+    assert gov.samples == 0
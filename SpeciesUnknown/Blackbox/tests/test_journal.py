@@ -0,0 +1,115 @@
+"""Journal cursor: exactly-once delivery, Lua restarts and rotation gaps (BlackboxBridge)."""
+
+from BlackboxBridge import (
+    JOURNAL_ROTATED_SUFFIX,
+    BinaryJournalReader,
+    BinaryJournalWriter,
+    JournalReader,
+    JournalWriter,
+)
+
+PAYLOAD = "NOTICE|INFO|" + "x" * 80
+
+
+def _journal(tmp_path, epoch="100", max_bytes=1 << 20):
+    path = str(tmp_path / "bridge_notice.txt")
+    return path, JournalWriter(path, epoch=epoch, max_bytes=max_bytes)
+
+
+def test_burst_delivered_once_in_order(tmp_path):
+    path, writer = _journal(tmp_path)
+    reader = JournalReader(path)
+    got = []
+    for i in range(500):
+        writer.append(f"n{i}")
+        if i % 37 == 0:
+            got += reader.read_new()
+    got += reader.read_new()
+    assert got == [f"n{i}" for i in range(500)]
+    assert reader.read_new() == []
+    assert (reader.delivered, reader.recovered, reader.lost) == (500, 0, 0)
+
+
+def test_repeated_payloads_are_not_merged(tmp_path):
+    path, writer = _journal(tmp_path)
+    reader = JournalReader(path)
+    for _ in range(3):
+        writer.append("PANEL=1")
+    assert reader.read_new() == ["PANEL=1"] * 3
+
+
+def test_prime_skips_records_already_on_disk(tmp_path):
+    path, writer = _journal(tmp_path)
+    writer.append("old")
+    reader = JournalReader(path)
+    writer.append("new")
+    assert reader.read_new() == ["new"]
+    assert reader.delivered == 1
+
+
+def test_restart_takes_new_epoch_from_its_start(tmp_path):
+    path, writer = _journal(tmp_path, epoch="100")
+    reader = JournalReader(path)
+    for i in range(5):
+        writer.append(f"a{i}")
+    assert reader.read_new() == [f"a{i}" for i in range(5)]
+    # A restarted Lua side truncates the journal and counts from 1 under a new epoch.
+    restarted = JournalWriter(path, epoch="200")
+    restarted.append("b0")
+    restarted.append("b1")
+    assert reader.read_new() == ["b0", "b1"]
+    assert (reader.epoch, reader.seq, reader.lost) == ("200", 2, 0)
+
+
+def test_rotation_gap_filled_from_rotated_file(tmp_path):
+    path, writer = _journal(tmp_path, max_bytes=1024)
+    reader = JournalReader(path)
+    writer.append(PAYLOAD)
+    assert len(reader.read_new()) == 1
+    while writer.seq < 20:
+        writer.append(PAYLOAD + str(writer.seq + 1))
+    got = reader.read_new()
+    assert got == [PAYLOAD + str(seq) for seq in range(2, 21)]
+    assert reader.recovered > 0
+    assert reader.lost == 0
+
+
+def test_two_rotations_between_reads_count_lost(tmp_path):
+    path, writer = _journal(tmp_path, max_bytes=1024)
+    reader = JournalReader(path)
+    writer.append(PAYLOAD)
+    reader.read_new()
+    rotations = 0
+    while rotations < 2:
+        size = writer._bytes
+        writer.append(PAYLOAD)
+        rotations += writer._bytes < size
+    rotated_first = int(open(path + JOURNAL_ROTATED_SUFFIX).readline().split("|")[2])
+    got = reader.read_new()
+    # Everything from the first rotated file on is delivered; what was only in the
+    # overwritten one is counted as lost.
+    assert reader.lost == rotated_first - 2
+    assert reader.seq == writer.seq
+    assert len(got) == writer.seq - rotated_first + 1
+    assert reader.read_new() == []
+
+
+def test_legacy_lines_delivered_when_they_change(tmp_path):
+    path = tmp_path / "bridge_notice.txt"
+    path.write_text("")
+    reader = JournalReader(str(path))
+    path.write_text("PLAYERS=SELF:Host\n")
+    assert reader.read_new() == ["PLAYERS=SELF:Host"]
+    with open(path, "a") as f:
+        f.write("PLAYERS=SELF:Host\n")
+    assert reader.read_new() == []
+
+
+def test_binary_journal_frames_once(tmp_path):
+    path = str(tmp_path / "bridge_registry.bin")
+    writer = BinaryJournalWriter(path, epoch="7")
+    reader = BinaryJournalReader(path)
+    for i in range(50):
+        writer.append(bytes([i]) * (i + 1))
+    assert reader.read_new() == [bytes([i]) * (i + 1) for i in range(50)]
+    assert reader.read_new() == []
@@ -0,0 +1,198 @@
+"""CommandPipeline: window, timeouts, coalescing, priority pacing and batch frames."""
+
+import pytest
+
+from BlackboxBridge import (
+    BATCH_SEP,
+    PRIO_BULK,
+    PRIO_STATE,
+    CommandBridge,
+    CommandFuture,
+    CommandPipeline,
+    CommandTimeout,
+    format_batch_results,
+    parse_batch_arg,
+)
+
+
+class _Clock:
+    def __init__(self, now: float = 100.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Peer:
+    """Stand-in for CommandBridge.call; the test settles each future by hand."""
+
+    def __init__(self):
+        self.sent: list[tuple[str, str, CommandFuture]] = []
+
+    def call(self, name: str, arg: str = "", timeout_s: float = 0.0) -> CommandFuture:
+        fut = CommandFuture(len(self.sent) + 1, name)
+        self.sent.append((name, arg, fut))
+        return fut
+
+    def names(self) -> list[str]:
+        return [name for name, _, _ in self.sent]
+
+    def ack(self, i: int, msg: str = "ok", ok: bool = True):
+        self.sent[i][2].set_result((ok, msg))
+
+
+def _pipeline(peer, window=4, rates=None, bursts=None, clock=None, **queries):
+    pipe = CommandPipeline(peer.call, window, rates={} if rates is None else rates, bursts=bursts,
+                           clock=clock or _Clock())
+    for key, prio in queries.items():
+        pipe.register(key, f"{key}_cmd", None, 2.0, priority=prio)
+    return pipe
+
+
+def test_window_bounds_what_is_in_flight():
+    peer = _Peer()
+    pipe = _pipeline(peer, window=2, a=PRIO_STATE, b=PRIO_STATE, c=PRIO_STATE)
+    pipe.request_many(["a", "b", "c"])
+    assert peer.names() == ["a_cmd", "b_cmd"]
+    assert pipe.queue == ["c"]
+    peer.ack(0)
+    assert peer.names() == ["a_cmd", "b_cmd", "c_cmd"]
+    assert pipe.inflight_frames() == 2
+
+
+def test_requests_coalesce_and_a_key_is_never_in_flight_twice():
+    peer = _Peer()
+    pipe = _pipeline(peer, a=PRIO_STATE)
+    first = pipe.request("a")
+    again = pipe.request("a")
+    also = pipe.request("a")
+    assert again is also
+    assert again is not first
+    assert pipe.coalesced == 1
+    assert peer.names() == ["a_cmd"]
+    peer.ack(0, "one")
+    assert first.result() == (True, "one")
+    # The repeat goes out once the first answer is in.
+    assert peer.names() == ["a_cmd", "a_cmd"]
+    peer.ack(1, "two")
+    assert again.result() == (True, "two")
+
+
+def test_handler_runs_before_the_awaiting_caller():
+    peer = _Peer()
+    pipe = _pipeline(peer)
+    seen = []
+    pipe.register("a", "a_cmd", lambda ok, msg: seen.append(("handler", msg)), 2.0)
+    fut = pipe.request("a")
+    fut.add_done_callback(lambda f: seen.append(("caller", f.result()[1])))
+    peer.ack(0, "x")
+    assert seen == [("handler", "x"), ("caller", "x")]
+    assert pipe.completed == 1
+
+
+def test_timeout_fails_the_waiter_and_frees_the_slot():
+    peer = _Peer()
+    pipe = _pipeline(peer, window=1, a=PRIO_STATE, b=PRIO_STATE)
+    fut_a, fut_b = pipe.request_many(["a", "b"])
+    peer.sent[0][2].set_exception(CommandTimeout("a_cmd: no ack"))
+    with pytest.raises(CommandTimeout):
+        fut_a.result()
+    assert pipe.expired == 1
+    assert peer.names() == ["a_cmd", "b_cmd"]
+    assert not fut_b.done()
+
+
+def test_unknown_key_fails_at_once():
+    pipe = _pipeline(_Peer())
+    with pytest.raises(KeyError):
+        pipe.request("nope").result()
+
+
+def test_state_goes_before_bulk_and_bulk_leaves_a_slot():
+    peer = _Peer()
+    pipe = _pipeline(peer, window=2, bulk=PRIO_BULK, state=PRIO_STATE, other=PRIO_STATE)
+    pipe.request_many(["bulk", "state"])
+    # state first; bulk would take the last slot, so it waits.
+    assert peer.names() == ["state_cmd"]
+    pipe.request("other")
+    assert peer.names() == ["state_cmd", "other_cmd"]
+    peer.ack(0)
+    peer.ack(1)
+    assert peer.names() == ["state_cmd", "other_cmd", "bulk_cmd"]
+    assert pipe.issued_by_class == {PRIO_STATE: 2, PRIO_BULK: 1}
+
+
+def test_token_bucket_paces_a_class():
+    peer = _Peer()
+    clock = _Clock()
+    pipe = _pipeline(peer, rates={PRIO_STATE: 2.0}, bursts={PRIO_STATE: 2}, clock=clock,
+                     a=PRIO_STATE, b=PRIO_STATE, c=PRIO_STATE)
+    pipe.request_many(["a", "b", "c"])
+    assert peer.names() == ["a_cmd", "b_cmd"]
+    assert pipe.next_ready() == pytest.approx(clock.now + 0.5)
+    clock.now += 0.25
+    assert pipe.pump() == 0
+    clock.now += 0.25
+    assert pipe.pump() == 1
+    assert peer.names() == ["a_cmd", "b_cmd", "c_cmd"]
+
+
+def test_scanning_does_not_spend_or_refill_tokens():
+    peer = _Peer()
+    clock = _Clock()
+    pipe = _pipeline(peer, rates={PRIO_STATE: 1.0}, bursts={PRIO_STATE: 1}, clock=clock,
+                     a=PRIO_STATE, b=PRIO_STATE)
+    pipe.request_many(["a", "b"])
+    bucket = dict(pipe._buckets)
+    for _ in range(3):
+        clock.now += 0.2
+        pipe.next_ready()
+        pipe.pump()
+    assert pipe._buckets == bucket
+    assert pipe._tokens(PRIO_STATE, clock.now) == pytest.approx(0.6)
+    clock.now += 0.4
+    assert pipe.pump() == 1
+
+
+def test_unpaced_class_has_no_bucket():
+    peer = _Peer()
+    pipe = _pipeline(peer, rates={PRIO_BULK: 1.0}, a=PRIO_STATE)
+    pipe.request("a")
+    assert pipe._tokens(PRIO_STATE, 0.0) is None
+    assert pipe._buckets == {}
+
+
+def test_ready_keys_share_one_batch_frame(tmp_path):
+    cmd_path = tmp_path / "bridge_cmd.txt"
+    bridge = CommandBridge(str(cmd_path))
+    pipe = CommandPipeline(bridge.call, 4, rates={}, call_batch=bridge.call_batch, clock=_Clock())
+    handled = []
+    for key in ("players", "tp"):
+        pipe.register(key, f"{key}_state", lambda ok, msg, key=key: handled.append((key, msg)), 2.0,
+                      arg_fn=lambda key=key: f"{key}|arg")
+    futures = pipe.request_many(["players", "tp"])
+    (line,) = cmd_path.read_text(encoding="utf-8").splitlines()
+    _, cmd_id, name, arg = line.split("|", 3)
+    assert name == "batch"
+    assert arg == BATCH_SEP.join(["players_state", "players arg", "tp_state", "tp arg"])
+    assert parse_batch_arg(arg) == [("players_state", "players arg"), ("tp_state", "tp arg")]
+    assert (pipe.frames, pipe.batched, pipe.inflight_frames()) == (1, 1, 1)
+
+    bridge.resolve(cmd_id, True, format_batch_results([(True, "P"), (False, "no|tp")]))
+    assert handled == [("players", "P"), ("tp", "no tp")]
+    assert [f.result() for f in futures] == [(True, "P"), (False, "no tp")]
+
+
+def test_short_batch_answer_fails_every_waiter(tmp_path):
+    cmd_path = tmp_path / "bridge_cmd.txt"
+    bridge = CommandBridge(str(cmd_path))
+    pipe = CommandPipeline(bridge.call, 4, rates={}, call_batch=bridge.call_batch, clock=_Clock())
+    pipe.register("a", "a_cmd", None, 2.0)
+    pipe.register("b", "b_cmd", None, 2.0)
+    futures = pipe.request_many(["a", "b"])
+    cmd_id = cmd_path.read_text(encoding="utf-8").split("|")[1]
+    # A peer without batch support answers the frame as one unknown command.
+    bridge.resolve(cmd_id, False, "unknown command")
+    for fut in futures:
+        with pytest.raises(ValueError):
+            fut.result()
@@ -0,0 +1,67 @@
+"""RefreshPlanner: per-domain max age, invalidation and accounting."""
+
+from BlackboxRefresh import RefreshPlanner
+
+
+class _Clock:
+    def __init__(self, now: float = 100.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _planner(clock) -> RefreshPlanner:
+    return RefreshPlanner({"players": 5.0, "weapon": 30.0}, clock=clock)
+
+
+def test_never_seen_domains_are_planned():
+    planner = _planner(_Clock())
+    assert planner.plan(["players", "weapon"]) == ["players", "weapon"]
+    assert planner.age("players") is None
+
+
+def test_each_domain_keeps_its_own_max_age():
+    clock = _Clock()
+    planner = _planner(clock)
+    planner.fresh("players")
+    planner.fresh("weapon")
+    clock.now += 4.9
+    assert planner.plan(["players", "weapon"]) == []
+    clock.now += 0.1
+    assert planner.plan(["players", "weapon"]) == ["players"]
+    clock.now += 25.0
+    assert planner.plan(["weapon", "players"]) == ["weapon", "players"]
+    assert planner.skipped == {"players": 1, "weapon": 2}
+
+
+def test_invalidate_forces_a_query_until_fresh():
+    clock = _Clock()
+    planner = _planner(clock)
+    planner.fresh("weapon")
+    planner.invalidate("weapon")
+    assert planner.plan(["weapon"]) == ["weapon"]
+    assert planner.stale("weapon", max_age=1000.0)
+    planner.fresh("weapon")
+    assert planner.plan(["weapon"]) == []
+
+
+def test_explicit_max_age_overrides_the_budget():
+    clock = _Clock()
+    planner = _planner(clock)
+    planner.fresh("weapon")
+    clock.now += 2.0
+    assert not planner.stale("weapon")
+    assert planner.stale("weapon", max_age=1.0)
+
+
+def test_queries_and_pushes_are_counted():
+    clock = _Clock()
+    planner = _planner(clock)
+    planner.issued("players")
+    planner.fresh("players")
+    planner.fresh("players", pushed=True)
+    planner.invalidate("weapon")
+    clock.now += 1.5
+    assert (planner.queries["players"], planner.pushes["players"]) == (1, 1)
+    assert planner.summary() == "players 1.5s q1/p1/s0 | weapon --! q0/p0/s0"
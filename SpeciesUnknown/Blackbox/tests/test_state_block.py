@@ -0,0 +1,130 @@
+"""State block layout against the Lua writer, and the seqlock reader."""
+
+import re
+import struct
+from pathlib import Path
+
+import pytest
+
+import BlackboxBridge
+from BlackboxBridge import (
+    STATE_BLOCK_SIZE,
+    StateBlockReader,
+    StateBlockWriter,
+    pack_state_block,
+    unpack_state_block,
+)
+
+MAIN_LUA = Path(__file__).resolve().parent.parent / "Scripts" / "main.lua"
+STATE = {
+    "WORLD": "1", "PAWN": "0", "RADAR": "1", "PANEL": "1",
+    "PROTO": "3", "PROTOACT": "3", "REGTOTAL": "42", "MON": "2", "KEY": "1",
+    "DISK": "0", "BLACK": "1", "WEAPON": "4", "MONEY": "9", "PUZZLES": "5",
+    "EMIT": "12.500", "PRUNE": "11.250", "STATEWRITE": "13.000",
+    "MAP": "Facility", "POLLMS": "50", "CMDWAIT": "120",
+}
+SELF_POS = {"x": 1.5, "y": -2.0, "z": 300.25}
+
+
+def _lua_format(name: str) -> str:
+    text = MAIN_LUA.read_text(encoding="utf-8")
+    return re.search(rf'local {name} = "([^"]+)"', text).group(1)
+
+
+def _as_struct(fmt: str) -> str:
+    """Lua string.pack format to the struct module's spelling."""
+    fmt = re.sub(r"c(\d+)", r"\1s", fmt)
+    return fmt.replace("I2", "H").replace("I4", "I")
+
+
+def test_layout_matches_lua_writer():
+    assert _as_struct(_lua_format("STATE_BLOCK_HEAD")) == BlackboxBridge._STATE_HEAD.format
+    assert _as_struct(_lua_format("STATE_BLOCK_BODY")) == BlackboxBridge._STATE_BODY.format
+    lua_size = sum(struct.calcsize(_as_struct(_lua_format(n))) for n in ("STATE_BLOCK_HEAD", "STATE_BLOCK_BODY"))
+    assert lua_size == STATE_BLOCK_SIZE
+
+
+def test_lua_packed_body_unpacks():
+    lupa = pytest.importorskip("lupa")
+    lua = lupa.LuaRuntime(encoding=None)
+    if lua.eval("string.pack") is None:
+        pytest.skip("Lua runtime without string.pack")
+    pack = lua.eval(
+        b"function(fmt) return string.pack(fmt, 1, 0, 1, 1, 3, 3, 42, 2, 1, 0, 1, 4, 9, 5,"
+        b" 12.5, 11.25, 13.0, 1, 1.5, -2.0, 300.25,"
+        b" ('Facility' .. string.rep('\\0', 64)):sub(1, 64), 50, 120) end"
+    )
+    body = pack(_lua_format("STATE_BLOCK_BODY").encode())
+    assert body == pack_state_block(STATE, SELF_POS)
+
+
+def test_round_trip():
+    data, self_pos = unpack_state_block(pack_state_block(STATE, SELF_POS))
+    assert data == STATE
+    assert self_pos == SELF_POS
+    data, self_pos = unpack_state_block(pack_state_block({"MAP": "x"}))
+    assert self_pos is None
+    assert data["MAP"] == "x"
+
+
+def test_reader_sees_each_published_snapshot_once(tmp_path):
+    path = str(tmp_path / "bridge_state.bin")
+    writer = StateBlockWriter(path)
+    writer.write(STATE, SELF_POS)
+    reader = StateBlockReader(path)
+    assert reader.read() == STATE
+    assert reader.self_pos == SELF_POS
+    assert reader.read() is None
+    writer.write(dict(STATE, MONEY="10"))
+    assert reader.read()["MONEY"] == "10"
+    assert reader.snapshots == 2
+    reader.close()
+    writer.close()
+
+
+def test_odd_seq_is_retried_then_skipped(tmp_path):
+    path = str(tmp_path / "bridge_state.bin")
+    writer = StateBlockWriter(path)
+    writer.write(STATE)
+    reader = StateBlockReader(path, retries=3)
+    # Writer stopped mid-update: seq stays odd.
+    BlackboxBridge._STATE_SEQ.pack_into(writer._mm, BlackboxBridge._STATE_SEQ_OFFSET, writer.seq + 1)
+    assert reader.read() is None
+    assert (reader.torn, reader.snapshots) == (3, 0)
+    BlackboxBridge._STATE_SEQ.pack_into(writer._mm, BlackboxBridge._STATE_SEQ_OFFSET, writer.seq + 2)
+    assert reader.read() == STATE
+    reader.close()
+    writer.close()
+
+
+class _MovingSeq:
+    """_STATE_SEQ stand-in whose loads come from a script."""
+
+    def __init__(self, values):
+        self.values = list(values)
+
+    def unpack_from(self, buf, offset=0):
+        return (self.values.pop(0),)
+
+
+def test_seq_moving_mid_copy_is_retried(tmp_path, monkeypatch):
+    path = str(tmp_path / "bridge_state.bin")
+    writer = StateBlockWriter(path)
+    writer.write(STATE)
+    reader = StateBlockReader(path)
+    monkeypatch.setattr(BlackboxBridge, "_STATE_SEQ", _MovingSeq([2, 4, 4, 4]))
+    assert reader.read() == STATE
+    assert (reader.torn, reader.seq) == (1, 4)
+    reader.close()
+    writer.close()
+
+
+def test_writer_resumes_seq_from_existing_block(tmp_path):
+    path = str(tmp_path / "bridge_state.bin")
+    writer = StateBlockWriter(path)
+    writer.write(STATE)
+    writer.write(STATE)
+    writer.close()
+    again = StateBlockWriter(path)
+    assert again.write(STATE) == 6
+    again.close()
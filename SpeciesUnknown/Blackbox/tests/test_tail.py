@@ -0,0 +1,116 @@
+"""TailReader: stat-only skips, resets on truncation/rotation, partial lines and frames."""
+
+import os
+
+from BlackboxBridge import (
+    TAIL_HEAD_BYTES,
+    TailReader,
+    pack_frame,
+)
+
+
+def _touch(path, ns):
+    os.utime(path, ns=(ns, ns))
+
+
+def test_unchanged_file_costs_no_read(tmp_path):
+    path = tmp_path / "ack.txt"
+    path.write_text("a\nb\n")
+    tail = TailReader(str(path))
+    assert tail.read_lines() == ["a", "b"]
+    read = tail.bytes_read
+    assert tail.read_lines() is None
+    assert tail.bytes_read == read
+
+
+def test_only_appended_bytes_are_read(tmp_path):
+    path = tmp_path / "ack.txt"
+    path.write_text("a" * 1000 + "\n")
+    tail = TailReader(str(path))
+    tail.read_lines()
+    read = tail.bytes_read
+    with open(path, "a") as f:
+        f.write("b\n")
+    assert tail.read_lines() == ["b"]
+    # The appended bytes plus the head re-check, never the whole file.
+    assert tail.bytes_read - read == 2 + TAIL_HEAD_BYTES
+    assert tail.last_line == "b"
+
+
+def test_partial_line_waits_for_its_newline(tmp_path):
+    path = tmp_path / "ack.txt"
+    path.write_text("one\ntw")
+    tail = TailReader(str(path))
+    assert tail.read_lines() == ["one"]
+    with open(path, "a") as f:
+        f.write("o")
+    assert tail.read_lines() == []
+    with open(path, "a") as f:
+        f.write("\nthree\n")
+    assert tail.read_lines() == ["two", "three"]
+
+
+def test_truncation_restarts_from_zero(tmp_path):
+    path = tmp_path / "ack.txt"
+    path.write_text("first line\nsecond line\n")
+    tail = TailReader(str(path))
+    tail.read_lines()
+    path.write_text("new\n")
+    assert tail.read_lines() == ["new"]
+    assert tail.resets == 1
+
+
+def test_rotation_to_new_inode_restarts(tmp_path):
+    path = tmp_path / "ack.txt"
+    path.write_text("a\n")
+    tail = TailReader(str(path))
+    tail.read_lines()
+    fresh = tmp_path / "ack.new"
+    fresh.write_text("b\nc\nd\n")
+    os.replace(fresh, path)
+    assert tail.read_lines() == ["b", "c", "d"]
+    assert tail.resets == 1
+
+
+def test_rewritten_head_of_same_size_restarts(tmp_path):
+    path = tmp_path / "ack.txt"
+    path.write_text("aaaa\n")
+    tail = TailReader(str(path))
+    tail.read_lines()
+    mtime = os.stat(path).st_mtime_ns
+    with open(path, "r+") as f:
+        f.write("bbbb\ncc\n")
+    _touch(path, mtime + 1_000_000)
+    assert tail.read_lines() == ["bbbb", "cc"]
+    assert tail.resets == 1
+
+
+def test_partial_frame_waits_for_the_rest(tmp_path):
+    path = tmp_path / "registry.bin"
+    first, second = pack_frame(1, 1, b"abc"), pack_frame(1, 2, b"defgh")
+    path.write_bytes(first + second[:6])
+    tail = TailReader(str(path))
+    frames = tail.read_frames()
+    assert [(e, s, bytes(b)) for e, s, b in frames] == [("1", 1, b"abc")]
+    with open(path, "ab") as f:
+        f.write(second[6:])
+    frames = tail.read_frames()
+    assert [(e, s, bytes(b)) for e, s, b in frames] == [("1", 2, b"defgh")]
+    assert tail.read_frames() is None
+
+
+def test_snapshot_returns_last_line_once(tmp_path):
+    path = tmp_path / "state.txt"
+    path.write_text("STATE=A\n\n")
+    tail = TailReader(str(path))
+    assert tail.read_snapshot() == "STATE=A"
+    assert tail.read_snapshot() is None
+    path.write_text("STATE=B\n")
+    _touch(path, os.stat(path).st_mtime_ns + 1_000_000)
+    assert tail.read_snapshot() == "STATE=B"
+
+
+def test_missing_file_reads_as_unchanged(tmp_path):
+    tail = TailReader(str(tmp_path / "missing.txt"))
+    assert tail.read_lines() is None
+    assert tail.read_frames() is None
@@ -0,0 +1,91 @@
+"""TimerWheel: deadline order, keyed merging, cancellation."""
+
+import pytest
+
+from BlackboxTimers import TimerWheel
+
+
+class _Clock:
+    def __init__(self, now: float = 100.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_calls_run_in_deadline_order_once_due():
+    clock = _Clock()
+    wheel = TimerWheel(clock)
+    ran = []
+    wheel.call_later(0.3, lambda: ran.append("c"))
+    wheel.call_later(0.1, lambda: ran.append("a"))
+    wheel.call_later(0.1, lambda: ran.append("b"))
+    assert wheel.due_in() == pytest.approx(0.1)
+    assert wheel.run_due() == 0
+    clock.now += 0.2
+    assert wheel.run_due() == 2
+    assert ran == ["a", "b"]
+    assert wheel.pending() == 1
+    assert wheel.due_in() == pytest.approx(0.1)
+    clock.now += 0.1
+    wheel.run_due()
+    assert ran == ["a", "b", "c"]
+    assert wheel.due_in() is None
+
+
+def test_keyed_call_joins_the_pending_one():
+    clock = _Clock()
+    wheel = TimerWheel(clock)
+    ran = []
+    first = wheel.call_later(0.5, lambda: ran.append(1), key="sync")
+    again = wheel.call_later(1.0, lambda: ran.append(2), key="sync")
+    assert again is first
+    assert (wheel.merged, wheel.scheduled, wheel.pending()) == (1, 1, 1)
+    clock.now += 1.0
+    wheel.run_due()
+    assert ran == [1]
+    # Once it ran, the key schedules afresh.
+    wheel.call_later(0.5, lambda: ran.append(3), key="sync")
+    assert wheel.scheduled == 2
+
+
+def test_earlier_keyed_call_moves_the_deadline_up():
+    clock = _Clock()
+    wheel = TimerWheel(clock)
+    ran = []
+    wheel.call_later(1.0, lambda: ran.append("late"), key="k")
+    wheel.call_later(0.2, lambda: ran.append("early"), key="k")
+    assert wheel.pending() == 1
+    assert wheel.due_in() == pytest.approx(0.2)
+    clock.now += 2.0
+    assert wheel.run_due() == 1
+    assert ran == ["early"]
+    assert wheel.merged == 1
+
+
+def test_cancel_skips_the_call_and_frees_its_key():
+    clock = _Clock()
+    wheel = TimerWheel(clock)
+    ran = []
+    handle = wheel.call_later(0.1, lambda: ran.append("x"), key="k")
+    wheel.call_later(0.5, lambda: ran.append("y"))
+    assert handle.cancel()
+    assert not handle.cancel()
+    assert wheel.pending() == 1
+    assert wheel.due_in() == pytest.approx(0.5)
+    assert wheel.call_later(0.1, lambda: ran.append("z"), key="k") is not handle
+    clock.now += 1.0
+    wheel.run_due()
+    assert ran == ["z", "y"]
+    assert (wheel.cancelled, wheel.ran) == (1, 2)
+
+
+def test_a_failing_call_does_not_stop_the_rest():
+    clock = _Clock()
+    wheel = TimerWheel(clock)
+    ran = []
+    wheel.call_later(0.0, lambda: 1 / 0)
+    wheel.call_later(0.0, lambda: ran.append("ok"))
+    assert wheel.run_due() == 2
+    assert ran == ["ok"]
+    assert wheel.errors == 1
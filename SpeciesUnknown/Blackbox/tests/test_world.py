@@ -0,0 +1,109 @@
+"""WorldModel delta acceptance and WorldShadow net-patch folding."""
+
+from BlackboxWorld import (
+    WorldModel,
+    WorldShadow,
+)
+
+ROW_A = "ITEM,A1,Alpha,1,2,3,a,OK"
+ROW_B = "ITEM,B1,Beta,4,5,6,b,OK"
+ROW_C = "ITEM,C1,Gamma,7,8,9,c,OK"
+
+
+def _seeded() -> WorldModel:
+    world = WorldModel()
+    assert world.apply_line(f"WORLDK=5|SELF,,Self,0,0,0,,;{ROW_A};{ROW_B}")
+    return world
+
+
+def test_keyframe_replaces_and_resets_seq():
+    world = _seeded()
+    assert set(world.entries) == {"a", "b"}
+    assert world.self_pos == {"x": 0.0, "y": 0.0, "z": 0.0}
+    assert (world.keyframe_id, world.seq, world.keyframes) == (5, 0, 1)
+
+
+def test_delta_patches_in_place():
+    world = _seeded()
+    entry_a = world.entries["a"]
+    assert world.apply_line(f"WORLDD=5|1|1,1,1|{ROW_C}|ITEM,A1,Alpha,9,9,9,a,OK|b")
+    assert world.entries["a"] is entry_a
+    assert entry_a["x"] == 9.0
+    assert (world.added, world.updated, world.removed) == ({"c"}, {"a"}, {"b"})
+    assert world.self_moved
+    assert (world.seq, world.deltas, world.resyncs) == (1, 1, 0)
+
+
+def test_delta_before_any_keyframe_is_refused():
+    world = WorldModel()
+    assert world.apply_line(f"WORLDD=1|1||{ROW_A}||") is False
+    assert world.entries == {}
+    assert world.resyncs == 1
+
+
+def test_delta_for_another_keyframe_is_refused():
+    world = _seeded()
+    version = world.version
+    assert world.apply_line(f"WORLDD=4|1||{ROW_C}||") is False
+    assert "c" not in world.entries
+    assert world.version == version
+    assert world.resyncs == 1
+
+
+def test_seq_gap_is_refused_until_the_next_keyframe():
+    world = _seeded()
+    assert world.apply_line(f"WORLDD=5|1||{ROW_C}||")
+    assert world.apply_line("WORLDD=5|3||||a") is False
+    assert "a" in world.entries
+    assert world.resyncs == 1
+    assert world.apply_line(f"WORLDK=6|{ROW_B}")
+    assert world.apply_line("WORLDD=6|1||||b")
+    assert world.entries == {}
+
+
+def test_non_world_lines_are_ignored():
+    assert WorldModel().apply_line("STATE=X") is None
+
+
+def test_shadow_folds_a_burst_into_one_patch():
+    shadow = WorldShadow()
+    shadow.apply_line(f"WORLDK=5|{ROW_A};{ROW_B}")
+    gui = WorldModel()
+    gui.apply_patch(shadow.take_patch())
+    assert set(gui.entries) == {"a", "b"}
+
+    # c is added and deleted within the burst, a changes twice, b goes away.
+    assert shadow.apply_line(f"WORLDD=5|1||{ROW_C}|ITEM,A1,Alpha,5,5,5,a,OK|")
+    assert shadow.apply_line("WORLDD=5|2|||ITEM,A1,Alpha,6,6,6,a,OK|c,b")
+    patch = shadow.take_patch()
+    assert patch["applied"] == 2
+    assert not patch["resync"]
+    assert set(patch["upserts"]) == {"a"}
+    assert patch["upserts"]["a"]["x"] == 6.0
+    assert patch["dels"] == ["b"]
+    assert (patch["kf"], patch["seq"], patch["deltas"]) == (5, 2, 2)
+
+    entry_a = gui.entries["a"]
+    gui.apply_patch(patch)
+    assert gui.entries["a"] is entry_a
+    assert entry_a["x"] == 6.0
+    assert set(gui.entries) == {"a"}
+    assert (gui.added, gui.updated, gui.removed) == (set(), {"a"}, {"b"})
+
+
+def test_shadow_patch_entries_are_copies():
+    shadow = WorldShadow()
+    shadow.apply_line(f"WORLDK=1|{ROW_A}")
+    patch = shadow.take_patch()
+    assert patch["upserts"]["a"] is not shadow.model.entries["a"]
+
+
+def test_shadow_reports_resync_and_idles_when_empty():
+    shadow = WorldShadow()
+    assert shadow.take_patch() is None
+    assert shadow.apply_line("WORLDD=1|1||||") is False
+    patch = shadow.take_patch()
+    assert patch["resync"]
+    assert patch["applied"] == 0
+    assert (patch["upserts"], patch["dels"]) == ({}, [])
+    assert shadow.take_patch() is None